@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Find duplicate bundle resources in the Xcode project.
+Indexes every file in each target's Copy Bundle Resources phase and checks
+it against the other entries of the phase and the resources the target's
+CocoaPods [CP] Copy Pods Resources script installs. With --fix, duplicate
+build files are removed from the project in one edit.
+"""
+
+import os
+import re
+import glob
+import hashlib
+import argparse
+from collections import defaultdict
+
+import pbxproj
+
+PROJECT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'ios', 'SolidiMobileApp4.xcodeproj', 'project.pbxproj')
+
+# Name a resource gets in the app bundle, by source extension
+COMPILED_NAMES = {
+    '.xcassets': lambda name: 'Assets.car',
+    '.storyboard': lambda name: name[:-len('.storyboard')] + '.storyboardc',
+    '.xib': lambda name: name[:-len('.xib')] + '.nib',
+    '.xcdatamodeld': lambda name: name[:-len('.xcdatamodeld')] + '.momd',
+}
+
+# install_resource lines of a Pods-<target>-resources.sh script
+INSTALL_RESOURCE = re.compile(r'^\s*install_resource\s+"([^"]+)"', re.MULTILINE)
+
+def bundle_name(path):
+    """File name a resource ends up with in the bundle"""
+    name = os.path.basename(path.rstrip('/'))
+    compiled = COMPILED_NAMES.get(os.path.splitext(name)[1])
+    return compiled(name) if compiled else name
+
+def content_hash(path):
+    """SHA-1 of a file (or of every file below a directory), or None if missing"""
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    if os.path.isdir(path):
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(file_path, path).encode('utf-8') + b'\0')
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def expand(path, variables):
+    """Substitute ${VAR} and $(VAR) build settings"""
+    return re.sub(r'\$[{(](\w+)[)}]', lambda m: variables.get(m.group(1), m.group(0)), path)
+
+def file_paths(project, source_root):
+    """{file reference or variant group ID: absolute path, or None if not a repository file}"""
+    parents = {}
+    for group_id, group in pbxproj.objects_of(project, 'PBXGroup') + pbxproj.objects_of(project, 'PBXVariantGroup'):
+        for child in group.get('children', []):
+            parents[child] = group_id
+
+    resolved = {}
+
+    def resolve(object_id):
+        if object_id in resolved:
+            return resolved[object_id]
+        obj = project['objects'].get(object_id, {})
+        path = obj.get('path', '')
+        tree = obj.get('sourceTree', '<group>')
+        if tree == '<absolute>':
+            result = path
+        elif tree == 'SOURCE_ROOT':
+            result = os.path.join(source_root, path)
+        elif tree == '<group>':
+            parent = parents.get(object_id)
+            base = resolve(parent) if parent else source_root
+            result = os.path.join(base, path) if base is not None else None
+        else:
+            result = None  # built products, SDK files and custom source trees
+        resolved[object_id] = os.path.normpath(result) if result else result
+        return resolved[object_id]
+
+    references = pbxproj.objects_of(project, 'PBXFileReference') + pbxproj.objects_of(project, 'PBXVariantGroup')
+    return {ref_id: resolve(ref_id) for ref_id, _ in references}
+
+def pod_resources(project, target, variables):
+    """
+    [(bundle name, source path)] the target's [CP] Copy Pods Resources
+    phases install, from the CocoaPods input/output file lists (every
+    configuration) or, failing that, the install_resource lines of the
+    resources script. Empty if Pods are not installed.
+    """
+    resources = []
+    for phase_id in target.get('buildPhases', []):
+        phase = project['objects'].get(phase_id, {})
+        if phase.get('isa') != 'PBXShellScriptBuildPhase' or 'Copy Pods Resources' not in phase.get('name', ''):
+            continue
+        sources = []
+        for list_path in phase.get('inputFileListPaths', []):
+            for path in sorted(glob.glob(expand(list_path, dict(variables, CONFIGURATION='*')))):
+                with open(path) as f:
+                    sources.extend(line.strip() for line in f if line.strip())
+        if not sources:
+            for script in re.findall(r'"([^"]+-resources\.sh)"', phase.get('shellScript', '')):
+                script = expand(script, variables)
+                if os.path.exists(script):
+                    with open(script) as f:
+                        sources.extend(INSTALL_RESOURCE.findall(f.read()))
+        for source in sources:
+            if source.endswith('-resources.sh'):
+                continue
+            path = os.path.normpath(expand(source, variables))
+            resources.append((bundle_name(path), path))
+    return sorted(set(resources))
+
+def find_duplicates(project, source_root):
+    """
+    Duplicate resources per target, as a list of dicts:
+      kind         'listed twice' (same build file twice in the phase),
+                   'same file' (two build files, same file or content),
+                   'same bundle name' (two sources, one name in the bundle),
+                   'copied by Pods' (the Pods resources script installs it too)
+      target       target name
+      build_files  the redundant build file IDs, safe to remove
+      phase        for 'listed twice', the phase to drop the repeat from
+      name, paths  the bundle name and the source paths involved
+    plus {path: [target names]} of resource files shared across targets.
+    """
+    paths = file_paths(project, source_root)
+    variables = {'SRCROOT': source_root, 'PROJECT_DIR': source_root, 'PODS_ROOT': os.path.join(source_root, 'Pods')}
+    hashes = {}
+    duplicates = []
+    shared = defaultdict(set)
+
+    def key_of(path):
+        if path not in hashes:
+            hashes[path] = content_hash(path)
+        return hashes[path] or path
+
+    for target_id, target in pbxproj.objects_of(project, 'PBXNativeTarget'):
+        name = target.get('name', target_id)
+        by_name = {}
+        by_key = {}
+        seen = set()
+        for phase_id in target.get('buildPhases', []):
+            phase = project['objects'].get(phase_id, {})
+            if phase.get('isa') != 'PBXResourcesBuildPhase':
+                continue
+            for build_file in phase.get('files', []):
+                file_ref = project['objects'].get(build_file, {}).get('fileRef')
+                path = paths.get(file_ref) or project['comments'].get(file_ref) or file_ref
+                if build_file in seen:
+                    duplicates.append({'kind': 'listed twice', 'target': name, 'build_files': [], 'phase': phase_id,
+                                       'repeat': build_file, 'name': bundle_name(path), 'paths': [path]})
+                    continue
+                seen.add(build_file)
+                shared[path].add(name)
+                key = key_of(path)
+                if key in by_key:
+                    duplicates.append({'kind': 'same file', 'target': name, 'build_files': [build_file],
+                                       'name': bundle_name(path), 'paths': [by_key[key][1], path]})
+                    continue
+                by_key[key] = (build_file, path)
+                if bundle_name(path) in by_name:
+                    duplicates.append({'kind': 'same bundle name', 'target': name, 'build_files': [],
+                                       'name': bundle_name(path), 'paths': [by_name[bundle_name(path)][1], path]})
+                    continue
+                by_name[bundle_name(path)] = (build_file, path)
+
+        for pod_name, pod_path in pod_resources(project, target, variables):
+            if pod_name in by_name:
+                build_file, path = by_name.pop(pod_name)
+                duplicates.append({'kind': 'copied by Pods', 'target': name, 'build_files': [build_file],
+                                   'name': pod_name, 'paths': [path, pod_path]})
+
+    shared = {path: sorted(targets) for path, targets in shared.items() if len(targets) > 1}
+    return duplicates, shared
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Find resources the iOS app bundle copies more than once.')
+    parser.add_argument('--project', default=PROJECT_FILE, help='project.pbxproj to check')
+    parser.add_argument('--fix', action='store_true',
+                        help='Remove the redundant build files (same-name clashes between different files are only reported)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    source_root = os.path.dirname(os.path.dirname(os.path.abspath(args.project)))
+    print(f"Reading {args.project}...")
+    project = pbxproj.load(args.project)
+    duplicates, shared = find_duplicates(project, source_root)
+    if not os.path.isdir(os.path.join(source_root, 'Pods')):
+        print("⚠️  ios/Pods not found (run pod install); Pods resources not checked")
+
+    if not duplicates:
+        print("✅ No duplicate bundle resources")
+    for duplicate in duplicates:
+        print(f"\n🔁 {duplicate['target']}: {duplicate['name']} ({duplicate['kind']})")
+        for path in duplicate['paths']:
+            print(f"   {os.path.relpath(path, source_root) if os.path.isabs(path) else path}")
+    if shared:
+        print(f"\nℹ️  {len(shared)} resource(s) copied into more than one target (one copy per bundle):")
+        for path, targets in sorted(shared.items()):
+            print(f"   {os.path.relpath(path, source_root) if os.path.isabs(path) else path}: {', '.join(targets)}")
+
+    removable = {build_file for duplicate in duplicates for build_file in duplicate['build_files']}
+    repeats = {(duplicate['phase'], duplicate['repeat']) for duplicate in duplicates if 'repeat' in duplicate}
+    if not (removable or repeats):
+        return
+    if not args.fix:
+        print(f"\n{len(removable)} redundant build file(s), {len(repeats)} repeated entr(ies); run with --fix to remove them")
+        return
+    for build_file in removable:
+        pbxproj.remove_object(project, build_file)
+    for phase_id, build_file in repeats:
+        pbxproj.remove_reference(project, phase_id, 'files', build_file, keep=1)
+    print(f"\nWriting updated project file ({len(removable)} build file(s), {len(repeats)} repeated entr(ies) removed)...")
+    pbxproj.save(project, args.project)
+    print("✅ Done! Duplicate resources removed.")
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,11 @@ This script removes font files from the Copy Bundle Resources build phase
 since they're already being copied by CocoaPods.
 """
 
-import re
+import os
 import sys
 
+import pbxproj
+
 project_file = '/Users/henry/Solidi/SolidiMobileApp4/ios/SolidiMobileApp4.xcodeproj/project.pbxproj'
 
 # Font files that are duplicated
@@ -28,26 +30,38 @@ font_files = [
 ]
 
 print(f"Reading {project_file}...")
-with open(project_file, 'r') as f:
-    content = f.read()
+project = pbxproj.load(project_file)
 
-# Find and remove the PBXBuildFile entries for fonts
-for font in font_files:
-    # Remove lines like: 4A58A6D1F0494012B7867F90 /* AntDesign.ttf in Resources */ = {isa = PBXBuildFile; fileRef = CB3F95F8BAA046E8A5D1503C /* AntDesign.ttf */; };
-    pattern = rf'\t\t[A-F0-9]+ /\* {re.escape(font)} in Resources \*/ = {{isa = PBXBuildFile; fileRef = [A-F0-9]+ /\* {re.escape(font)} \*/; }};\n'
-    content = re.sub(pattern, '', content)
-    print(f"Removed PBXBuildFile for {font}")
+def file_name(file_ref):
+    """Name of a PBXFileReference, as shown in Xcode"""
+    ref = project['objects'].get(file_ref, {})
+    return ref.get('name') or os.path.basename(ref.get('path', '')) or project['comments'].get(file_ref)
+
+# Build files in any Copy Bundle Resources phase, by the name of the file they copy
+resources = {}
+for phase_id, phase in pbxproj.objects_of(project, 'PBXResourcesBuildPhase'):
+    for build_file in phase.get('files', []):
+        file_ref = project['objects'].get(build_file, {}).get('fileRef')
+        if file_ref:
+            resources.setdefault(file_name(file_ref), []).append(build_file)
 
-# Find and remove font references from Resources build phase
+# Remove each font's PBXBuildFile entries; remove_object also drops them from the Resources build phase
+removed = 0
 for font in font_files:
-    # Remove lines like: 4A58A6D1F0494012B7867F90 /* AntDesign.ttf in Resources */,
-    pattern = rf'\t\t\t\t[A-F0-9]+ /\* {re.escape(font)} in Resources \*/,\n'
-    content = re.sub(pattern, '', content)
-    print(f"Removed from Resources phase: {font}")
-
-print(f"\nWriting updated project file...")
-with open(project_file, 'w') as f:
-    f.write(content)
+    for build_file in resources.get(font, []):
+        pbxproj.remove_object(project, build_file)
+        removed += 1
+    if font in resources:
+        print(f"Removed PBXBuildFile and Resources phase entry for {font}")
+    else:
+        print(f"Not in Copy Bundle Resources: {font}")
+
+if not removed:
+    print("\n✅ Nothing to do, no font duplicates in Copy Bundle Resources.")
+    sys.exit(0)
+
+print(f"\nWriting updated project file ({removed} build file(s) removed)...")
+pbxproj.save(project, project_file)
 
 print("✅ Done! Font file duplicates removed.")
 print("Now try building again in Xcode.")
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Parser and editor for Xcode project.pbxproj files.
+Loads the file once into an ID-indexed object graph and records where
+every object and list entry sits in the text. Removals and additions are
+queued in O(1) each and applied in a single pass on save, so everything
+not edited keeps its exact original formatting.
+"""
+
+import os
+import re
+import hashlib
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>/\*.*?\*/|//[^\n]*)
+  | (?P<quoted>"(?:[^"\\]|\\.)*")
+  | (?P<word>(?:[^\s{}()=;,"/]|/(?![*/]))+)
+  | (?P<punct>[{}()=;,])
+''', re.VERBOSE | re.DOTALL)
+
+SECTION_MARKER = re.compile(r'/\* (Begin|End) (\w+) section \*/')
+OBJECT_ID = re.compile(r'[0-9A-F]{24}')
+UNQUOTED = re.compile(r'[A-Za-z0-9_$/:.]+')
+
+# Xcode writes these object types on one line
+SINGLE_LINE_ISAS = {'PBXBuildFile', 'PBXFileReference'}
+
+ESCAPES = {'n': '\n', 't': '\t', '"': '"', '\\': '\\'}
+
+class ParseError(Exception):
+    pass
+
+def _tokenize(text):
+    """
+    Significant tokens as [kind, value, start, end, comment]: the comment is
+    the /* ... */ annotation right after the token, as Xcode writes after IDs.
+    Also returns the section markers as [(kind, isa, start of line)].
+    """
+    tokens = []
+    markers = []
+    pos = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        if match.start() != pos:
+            raise ParseError(f"Unexpected character at offset {pos}: {text[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        if kind == 'comment':
+            marker = SECTION_MARKER.fullmatch(match.group())
+            if marker:
+                markers.append((marker.group(1), marker.group(2), match.start()))
+            elif tokens and tokens[-1][0] in ('quoted', 'word') and tokens[-1][4] is None:
+                tokens[-1][4] = match.group()[2:-2].strip()
+            continue
+        value = match.group()
+        if kind == 'quoted':
+            value = re.sub(r'\\(.)', lambda m: ESCAPES.get(m.group(1), m.group(1)), value[1:-1])
+        tokens.append([kind, value, match.start(), match.end(), None])
+    if pos != len(text):
+        raise ParseError(f"Unexpected character at offset {pos}")
+    return tokens, markers
+
+def _line_span(text, start, end):
+    """Widen [start, end) to whole lines if nothing else shares them"""
+    line_start = text.rfind('\n', 0, start) + 1
+    if text[line_start:start].strip(' \t') == '':
+        start = line_start
+    after = end
+    while after < len(text) and text[after] in ' \t':
+        after += 1
+    if after < len(text) and text[after] == '\n':
+        end = after + 1
+    elif start == line_start:
+        end = after
+    return start, end
+
+def _parse_tokens(text, tokens, project):
+    """Recursive descent over the tokens, filling in the project dict; returns the root"""
+    pos = 0
+
+    def peek():
+        if pos >= len(tokens):
+            raise ParseError("Unexpected end of file")
+        return tokens[pos]
+
+    def take(value=None):
+        nonlocal pos
+        token = peek()
+        if value is not None and token[1] != value:
+            raise ParseError(f"Expected {value!r} at offset {token[2]}, found {token[1]!r}")
+        pos += 1
+        return token
+
+    def parse_value(owner=None, key=None):
+        token = peek()
+        if token[0] == 'punct' and token[1] == '{':
+            return parse_dict(owner, key)
+        if token[0] == 'punct' and token[1] == '(':
+            return parse_array(owner, key)
+        take()
+        if OBJECT_ID.fullmatch(token[1]):
+            if token[4] is not None:
+                project['comments'].setdefault(token[1], token[4])
+            if owner is not None:
+                project['references'][token[1]].add((owner, key))
+        return token[1]
+
+    def parse_dict(owner=None, key=None, objects=False):
+        take('{')
+        result = {}
+        while peek()[1] != '}':
+            key_token = take()
+            take('=')
+            if objects:
+                object_id = key_token[1]
+                project['comments'][object_id] = key_token[4]
+                result[object_id] = parse_value(object_id, '')
+                project['spans'][object_id] = _line_span(text, key_token[2], take(';')[3])
+                project['by_isa'][result[object_id].get('isa')].append(object_id)
+                continue
+            if owner is None and key_token[1] == 'objects':
+                result['objects'] = parse_dict(objects=True)
+                project['objects_end'] = tokens[pos - 1][2]
+            else:
+                result[key_token[1]] = parse_value(owner, f"{key}.{key_token[1]}" if key else key_token[1])
+            take(';')
+        take('}')
+        return result
+
+    def parse_array(owner, key):
+        take('(')
+        items = []
+        spans = defaultdict(list)
+        while peek()[1] != ')':
+            first = peek()
+            items.append(parse_value(owner, key))
+            end = tokens[pos - 1][3]
+            if peek()[1] == ',':
+                end = take(',')[3]
+            if isinstance(items[-1], str):
+                spans[items[-1]].append(_line_span(text, first[2], end))
+        close = take(')')[2]
+        if owner is not None:
+            line_start = text.rfind('\n', 0, close) + 1
+            multiline = text[line_start:close].strip(' \t') == ''
+            project['lists'][(owner, key)] = {
+                'items': items,
+                'spans': spans,  # value -> text spans of its entries
+                'multiline': multiline,
+                'insert_at': line_start if multiline else close,
+                'indent': text[line_start:close] if multiline else '',
+            }
+        return items
+
+    return parse_dict()
+
+def parse(text):
+    """
+    Parse project.pbxproj text into a project dict:
+      root       the whole plist as dicts, lists and strings
+      objects    {object ID: object dict} (the same dicts as in root)
+      by_isa     {isa: [object IDs]} in file order
+      comments   {object ID: its /* ... */ annotation}
+      references {object ID: {(owner ID, key path)}} of every mention
+    plus the text positions the edit functions use.
+    """
+    tokens, markers = _tokenize(text)
+    project = {
+        'text': text,
+        'comments': {},
+        'references': defaultdict(set),
+        'spans': {},
+        'lists': {},
+        'by_isa': defaultdict(list),
+        'sections': {},
+        'removed': {},   # start -> end of text to drop
+        'inserted': defaultdict(list),  # position -> texts (or new object IDs) to add
+        'new_sections': defaultdict(list),
+    }
+    project['root'] = _parse_tokens(text, tokens, project)
+    project['objects'] = project['root'].get('objects', {})
+
+    begins = {}
+    for kind, isa, start in markers:
+        if kind == 'Begin':
+            begins[isa] = start
+        elif isa in begins:
+            project['sections'][isa] = (begins[isa], start)
+    return project
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse(f.read())
+
+def objects_of(project, isa):
+    """[(object ID, object)] of one isa, in file order (new objects last)"""
+    return [(object_id, project['objects'][object_id]) for object_id in project['by_isa'].get(isa, ())
+            if object_id in project['objects']]
+
+def new_id(project, seed=''):
+    """An unused 24-digit object ID, derived from seed"""
+    counter = 0
+    while True:
+        object_id = hashlib.md5(f"{seed}:{counter}".encode('utf-8')).hexdigest()[:24].upper()
+        if object_id not in project['objects']:
+            return object_id
+        counter += 1
+
+def remove_reference(project, owner, key, value, keep=0):
+    """
+    Remove value from the list at key path `key` of object owner, keeping
+    its first `keep` entries (keep=1 drops only repeats).
+    """
+    entry = project['lists'].get((owner, key))
+    if entry is None:
+        # A list added in this session is rendered from the object itself
+        items = _lookup(project['objects'].get(owner, {}), key)
+        if isinstance(items, list):
+            _drop_repeats(items, value, keep)
+        return
+    _drop_repeats(entry['items'], value, keep)
+    spans = entry['spans'].get(value, [])
+    for start, end in spans[keep:]:
+        project['removed'][start] = end
+    del spans[keep:]
+
+def _drop_repeats(items, value, keep):
+    seen = 0
+    result = []
+    for item in items:
+        if item == value:
+            seen += 1
+            if seen > keep:
+                continue
+        result.append(item)
+    items[:] = result
+
+def remove_object(project, object_id):
+    """
+    Remove an object and every list entry referring to it. Returns the
+    (owner ID, key) pairs that still refer to it through a single value.
+    """
+    obj = project['objects'].pop(object_id, None)
+    if obj is None:
+        return []
+    if object_id in project['spans']:
+        start, end = project['spans'].pop(object_id)
+        project['removed'][start] = end
+
+    dangling = []
+    for owner, key in project['references'].pop(object_id, ()):
+        if owner not in project['objects']:
+            continue
+        if (owner, key) in project['lists']:
+            remove_reference(project, owner, key, object_id)
+        else:
+            dangling.append((owner, key))
+    return dangling
+
+def add_object(project, obj, comment=None, object_id=None):
+    """Add an object (a dict with 'isa') to its section; returns its ID"""
+    if object_id is None:
+        object_id = new_id(project, f"{obj['isa']}:{comment}:{len(project['objects'])}")
+    project['objects'][object_id] = obj
+    project['comments'][object_id] = comment
+    project['by_isa'][obj['isa']].append(object_id)
+    _index_references(project, object_id, obj, '')
+
+    isa = obj['isa']
+    if isa in project['sections']:
+        project['inserted'][project['sections'][isa][1]].append(object_id)
+    else:
+        project['new_sections'][isa].append(object_id)
+    return object_id
+
+def add_reference(project, owner, key, value, comment=None):
+    """Append value (usually an object ID) to the list at key path `key` of object owner"""
+    if comment is not None:
+        project['comments'].setdefault(value, comment)
+    if OBJECT_ID.fullmatch(value):
+        project['references'][value].add((owner, key))
+    entry = project['lists'].get((owner, key))
+    if entry is None:
+        _lookup(project['objects'][owner], key).append(value)
+        return
+    entry['items'].append(value)
+    project['inserted'][entry['insert_at']].append(('reference', value, entry))
+
+def _lookup(obj, key):
+    for part in key.split('.'):
+        obj = obj.get(part) if isinstance(obj, dict) else None
+    return obj
+
+def _index_references(project, owner, value, key):
+    if isinstance(value, dict):
+        for name, item in value.items():
+            _index_references(project, owner, item, f"{key}.{name}" if key else name)
+    elif isinstance(value, list):
+        for item in value:
+            _index_references(project, owner, item, key)
+    elif OBJECT_ID.fullmatch(value):
+        project['references'][value].add((owner, key))
+
+def format_string(project, value):
+    """A value as Xcode writes it: quoted if needed, IDs annotated"""
+    if UNQUOTED.fullmatch(value) and '//' not in value and '___' not in value:
+        text = value
+    else:
+        text = '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t') + '"'
+    comment = project['comments'].get(value) if OBJECT_ID.fullmatch(value) else None
+    return f"{text} /* {comment} */" if comment else text
+
+def format_value(project, value, indent, single_line):
+    if isinstance(value, dict):
+        return format_dict(project, value, indent, single_line)
+    if isinstance(value, list):
+        if single_line:
+            return '(' + ''.join(f"{format_value(project, item, indent, True)}, " for item in value) + ')'
+        inner = indent + '\t'
+        return '(\n' + ''.join(f"{inner}{format_value(project, item, inner, False)},\n" for item in value) + f"{indent})"
+    return format_string(project, value)
+
+def format_dict(project, obj, indent, single_line):
+    keys = sorted(obj, key=lambda k: (k != 'isa', k))
+    if single_line:
+        return '{' + ''.join(f"{format_string(project, k)} = {format_value(project, obj[k], indent, True)}; " for k in keys) + '}'
+    inner = indent + '\t'
+    return '{\n' + ''.join(f"{inner}{format_string(project, k)} = {format_value(project, obj[k], inner, False)};\n"
+                           for k in keys) + f"{indent}}}"
+
+def format_object(project, object_id):
+    obj = project['objects'][object_id]
+    body = format_dict(project, obj, '\t\t', obj['isa'] in SINGLE_LINE_ISAS)
+    return f"\t\t{format_string(project, object_id)} = {body};\n"
+
+def _render_insert(project, item):
+    if isinstance(item, str):
+        return format_object(project, item) if item in project['objects'] else ''
+    _, value, entry = item
+    if value not in entry['items']:
+        return ''
+    if entry['multiline']:
+        return f"{entry['indent']}\t{format_string(project, value)},\n"
+    return f"{format_string(project, value)}, "
+
+def serialize(project):
+    """The edited project text, built in one pass over the original"""
+    text = project['text']
+    inserted = defaultdict(list, {pos: list(items) for pos, items in project['inserted'].items()})
+
+    # Sections left empty are dropped, as Xcode does
+    removed = dict(project['removed'])
+    sections = []
+    for isa, (begin, end) in sorted(project['sections'].items(), key=lambda item: item[1][0]):
+        if any(object_id in project['objects'] for object_id in project['by_isa'][isa]):
+            sections.append((isa, begin, end))
+            continue
+        end = text.index('\n', end) + 1
+        if text.startswith('\n', end):
+            end += 1
+        elif text[begin - 2:begin] == '\n\n':
+            begin -= 1  # the last section takes the blank line before it
+        removed[begin] = end
+
+    # New sections go before the first kept section that sorts after them
+    for isa, object_ids in sorted(project['new_sections'].items()):
+        if not any(object_id in project['objects'] for object_id in object_ids):
+            continue
+        following = [begin for name, begin, end in sections if name > isa]
+        if following:
+            position, prefix, suffix = following[0], '', '\n'
+        elif sections:
+            position = text.index('\n', sections[-1][2]) + 1
+            prefix, suffix = '\n', ''
+        else:
+            position, prefix, suffix = text.rfind('\n', 0, project['objects_end']) + 1, '', ''
+        inserted[position].append(prefix + f"/* Begin {isa} section */\n")
+        inserted[position].extend(object_ids)
+        inserted[position].append(f"/* End {isa} section */\n" + suffix)
+
+    positions = sorted(set(removed) | set(inserted))
+    pieces = []
+    cursor = 0
+    for position in positions:
+        if position < cursor:
+            continue  # inside a span already removed
+        pieces.append(text[cursor:position])
+        cursor = position
+        for item in inserted.get(position, ()):
+            pieces.append(item if isinstance(item, str) and not OBJECT_ID.fullmatch(item)
+                          else _render_insert(project, item))
+        if position in removed:
+            cursor = max(cursor, removed[position])
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+def save(project, path):
+    """Write the edited project atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(serialize(project))
+    os.replace(tmp_path, path)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Cross-revision API surface diff for the Solidi Mobile App.
+Compares the API endpoint inventory between git revisions, across the last
+N commits or between consecutive release tags, reading blobs through one
+long-lived `git cat-file --batch` process instead of checking out trees.
+"""
+
+import os
+import json
+import argparse
+from collections import defaultdict
+
+import profiling
+from git_objects import git, start_cat_file, read_object, stop_cat_file, parse_tree
+from extract_all_apis import extract_apis_from_content
+from generate_api_docs import extract_api_calls_from_content, API_METHOD_NAMES, SRC_DIR, SOURCE_EXTENSIONS, SKIP_DIRS
+
+# Per-blob results, keyed by extractor and blob SHA; a blob's content never
+# changes, so entries stay valid forever. Bump CACHE_VERSION if the
+# extractors' output changes.
+CACHE_FILE = '.api_history_cache.json'
+CACHE_VERSION = 2
+
+# A blob without one of these names cannot contain a privateMethod/publicMethod call
+API_CALL_MARKERS = tuple(name.encode('utf-8') for name in API_METHOD_NAMES)
+
+# Git tree entry modes
+TREE_MODE = b'40000'
+BLOB_MODES = (b'100644', b'100755')
+
+def _extract_context(content, path):
+    """Endpoints via the structural scanner (extract_all_apis.py)"""
+    return [[api['type'].upper(), api['route'], api['method'], api['function'], api['line']]
+            for api in extract_apis_from_content(content)]
+
+def _extract_calls(content, path):
+    """Endpoints via the single-pass call regex (generate_api_docs.py)"""
+    return [[api['type'], api['route'], None, None, api['line']]
+            for api in extract_api_calls_from_content(content, path)]
+
+EXTRACTORS = {
+    'context': _extract_context,
+    'calls': _extract_calls,
+}
+
+def source_blobs(cat_file, tree_sha, tree_cache):
+    """
+    [(relative path, blob sha)] for every source file below a tree.
+
+    Memoized per tree SHA, so a subtree shared by many commits is only
+    read once; walking a commit costs one read per changed directory.
+    """
+    if tree_sha in tree_cache:
+        return tree_cache[tree_sha]
+
+    obj = read_object(cat_file, tree_sha)
+    files = []
+    for mode, name, sha in parse_tree(obj[2]):
+        if mode == TREE_MODE:
+            if name in SKIP_DIRS:
+                continue
+            files.extend((f"{name}/{path}", blob) for path, blob in source_blobs(cat_file, sha, tree_cache))
+        elif mode in BLOB_MODES and name.endswith(SOURCE_EXTENSIONS):
+            files.append((name, sha))
+    tree_cache[tree_sha] = files
+    return files
+
+def load_cache(repo):
+    try:
+        with open(os.path.join(repo, CACHE_FILE)) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache['blobs'] if cache.get('version') == CACHE_VERSION else {}
+
+def save_cache(repo, blobs):
+    path = os.path.join(repo, CACHE_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'blobs': blobs}, f)
+    os.replace(tmp_path, path)
+
+def blob_endpoints(cat_file, path, sha, extractor, blob_cache, stats):
+    """Endpoints in one blob, parsed only the first time its SHA is seen"""
+    key = f"{extractor}:{sha}"
+    if key in blob_cache:
+        stats['cached'] += 1
+        return blob_cache[key]
+
+    with profiling.timed_file(path) as record:
+        data = read_object(cat_file, sha)[2]
+        record['bytes'] = len(data)
+        if any(marker in data for marker in API_CALL_MARKERS):
+            with profiling.phase('extract'):
+                endpoints = EXTRACTORS[extractor](data.decode('utf-8', 'ignore'), path)
+        else:
+            endpoints = []
+    stats['parsed'] += 1
+    blob_cache[key] = endpoints
+    return endpoints
+
+def revision_inventory(context, revision):
+    """
+    API inventory of one revision under the scanned path:
+    {(type, route): [(file, line, method, function)]}.
+    """
+    root = read_object(context['cat_file'], f"{revision}:{context['path']}")
+    inventory = defaultdict(list)
+    if root is None or root[1] != 'tree':
+        return inventory
+
+    with profiling.phase('tree walk'):
+        files = source_blobs(context['cat_file'], root[0], context['trees'])
+    for path, sha in files:
+        file = f"{context['path']}/{path}"
+        for api_type, route, method, function, line in blob_endpoints(
+                context['cat_file'], file, sha, context['extractor'], context['blobs'], context['stats']):
+            inventory[(api_type, route)].append((file, line, method, function))
+    return inventory
+
+def diff_inventories(old, new):
+    """Endpoints (type, route) added and removed between two inventories"""
+    return {
+        'added': sorted(key for key in new if key not in old),
+        'removed': sorted(key for key in old if key not in new),
+    }
+
+def resolve_revisions(repo, args):
+    """[(commit sha, label)] in the order they should be compared"""
+    if args.tags is not None:
+        tags = git(repo, 'for-each-ref', '--sort=creatordate', '--format=%(refname:short)',
+                   f"refs/tags/{args.tags}").split()
+        if args.last:
+            tags = tags[-(args.last + 1):]
+        return [(git(repo, 'rev-parse', f"{tag}^{{commit}}").strip(), tag) for tag in tags]
+
+    if args.last:
+        revision = args.revisions[0] if args.revisions else 'HEAD'
+        lines = git(repo, 'log', '--first-parent', f"-n{args.last + 1}",
+                    '--format=%H%x00%h %s', revision).splitlines()
+        return [tuple(line.split('\0', 1)) for line in reversed(lines)]
+
+    return [(git(repo, 'rev-parse', f"{revision}^{{commit}}").strip(), revision)
+            for revision in args.revisions]
+
+def _describe(key, locations):
+    api_type, route = key
+    return {
+        'type': api_type,
+        'route': route,
+        'locations': [f"{file}:{line}" for file, line, method, function in sorted(locations)],
+        'functions': sorted({function for file, line, method, function in locations if function}),
+    }
+
+def compare_revisions(repo, revisions, path=SRC_DIR, extractor='context', use_cache=True):
+    """
+    Inventory every revision and diff each one against the previous.
+    Returns (list of diff dicts, stats).
+    """
+    with profiling.phase('cache load'):
+        blobs = load_cache(repo) if use_cache else {}
+    cached_keys = len(blobs)
+    context = {
+        'cat_file': start_cat_file(repo),
+        'path': path.strip('/'),
+        'extractor': extractor,
+        'trees': {},
+        'blobs': blobs,
+        'stats': {'parsed': 0, 'cached': 0},
+    }
+
+    diffs = []
+    try:
+        previous = None
+        for sha, label in revisions:
+            inventory = revision_inventory(context, sha)
+            if previous is not None:
+                old_sha, old_label, old_inventory = previous
+                changes = diff_inventories(old_inventory, inventory)
+                diffs.append({
+                    'from': old_label,
+                    'to': label,
+                    'from_sha': old_sha,
+                    'to_sha': sha,
+                    'endpoints': len(inventory),
+                    'added': [_describe(key, inventory[key]) for key in changes['added']],
+                    'removed': [_describe(key, old_inventory[key]) for key in changes['removed']],
+                })
+            previous = (sha, label, inventory)
+    finally:
+        stop_cat_file(context['cat_file'])
+
+    if use_cache and len(blobs) != cached_keys:
+        with profiling.phase('cache save'):
+            save_cache(repo, blobs)
+    return diffs, context['stats']
+
+def print_diffs(diffs, show_unchanged=False):
+    for diff in diffs:
+        if not (diff['added'] or diff['removed'] or show_unchanged):
+            continue
+        print("\n" + "=" * 80)
+        print(f"{diff['from']} → {diff['to']}  ({diff['from_sha'][:7]} → {diff['to_sha'][:7]}, {diff['endpoints']} endpoints)")
+        print("=" * 80)
+        if not (diff['added'] or diff['removed']):
+            print("   No API changes")
+        for api in diff['added']:
+            print(f"   ➕ {api['type']:<7} /api2/v1/{api['route']}  ({', '.join(api['locations'])})")
+        for api in diff['removed']:
+            print(f"   ➖ {api['type']:<7} /api2/v1/{api['route']}  (was {', '.join(api['locations'])})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Show API endpoints added and removed between git revisions.',
+        epilog='Examples: api_history.py v1.2 v1.3 | api_history.py --last 200 | api_history.py --tags "v*"')
+    parser.add_argument('revisions', nargs='*',
+                        help='Revisions to compare in order (with --last: the revision to walk back from)')
+    parser.add_argument('--last', type=int, metavar='N',
+                        help='Compare each of the last N first-parent commits with its parent (with --tags: the last N releases)')
+    parser.add_argument('--tags', nargs='?', const='*', metavar='GLOB',
+                        help='Compare consecutive tags matching GLOB, oldest first (default: all tags)')
+    parser.add_argument('--path', default=SRC_DIR, help=f'Directory to inventory (default: {SRC_DIR})')
+    parser.add_argument('--extractor', choices=sorted(EXTRACTORS), default='context',
+                        help='context: structural scanner from extract_all_apis.py; calls: call regex from generate_api_docs.py')
+    parser.add_argument('--repo', default='.', help='Git repository (default: current directory)')
+    parser.add_argument('--no-cache', action='store_true', help=f'Ignore and do not update {CACHE_FILE}')
+    parser.add_argument('--show-unchanged', action='store_true', help='Also list comparisons without API changes')
+    parser.add_argument('--json', metavar='FILE', help='Also write the diffs as JSON to FILE')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    if args.tags is None and not args.last and len(args.revisions) < 2:
+        parser.error('give two or more revisions, --last N or --tags')
+    return args
+
+def main():
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
+    repo = os.path.abspath(args.repo)
+    with profiling.phase('resolve revisions'):
+        revisions = resolve_revisions(repo, args)
+    if len(revisions) < 2:
+        print(f"❌ Need at least two revisions to compare, found {len(revisions)}")
+        return
+
+    print(f"🔍 Comparing API endpoints across {len(revisions)} revisions under {args.path}/...")
+    diffs, stats = compare_revisions(repo, revisions, args.path, args.extractor, not args.no_cache)
+    print_diffs(diffs, args.show_unchanged)
+
+    changed = sum(1 for diff in diffs if diff['added'] or diff['removed'])
+    print("\n" + "=" * 80)
+    print(f"📊 {len(diffs)} comparisons, {changed} with API changes")
+    print(f"   ➕ {sum(len(diff['added']) for diff in diffs)} endpoints added, "
+          f"➖ {sum(len(diff['removed']) for diff in diffs)} removed")
+    print(f"   🧩 {stats['parsed']} blobs parsed, {stats['cached']} reused from cache")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(diffs, f, indent=2)
+        print(f"📄 JSON written to {args.json}")
+
+if __name__ == '__main__':
+    main()
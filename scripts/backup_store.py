@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for move_to_backup.py.
+File contents are kept once per SHA-256, zlib-compressed and appended to
+pack files (backup/store/pack-NNNN.pack) with a JSON lines index beside
+each pack. Backing up a file the store already holds costs no bytes.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+# Start a new pack once the current one reaches this size
+PACK_MAX_BYTES = 64 << 20
+
+COMPRESS_LEVEL = 6
+
+def hash_file(path):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _pack_name(number):
+    return f'pack-{number:04d}'
+
+def _load_index(index_path):
+    """
+    (entries, bytes) of one pack index: the complete lines, and where
+    they end. A torn last line (crash mid-write) is not counted.
+    """
+    entries = []
+    end = 0
+    with open(index_path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            end += len(line)
+    return entries, end
+
+def open_store(root):
+    """
+    Open (creating if needed) the store at root. Returns a dict with the
+    index ({sha256: {pack, offset, length, size}}) and the pack new blobs
+    are appended to. Bytes after the last indexed blob of that pack (a
+    crash between writing a blob and indexing it) and a torn last index
+    line are truncated.
+    """
+    os.makedirs(root, exist_ok=True)
+    index = {}
+    index_ends = {}
+    numbers = sorted(int(name[5:-4]) for name in os.listdir(root)
+                     if name.startswith('pack-') and name.endswith('.idx'))
+    for number in numbers:
+        entries, index_ends[number] = _load_index(os.path.join(root, _pack_name(number) + '.idx'))
+        for entry in entries:
+            index[entry['sha256']] = dict(entry, pack=_pack_name(number))
+
+    number = numbers[-1] if numbers else 0
+    store = {'root': root, 'index': index, 'pack': None, 'idx': None, 'number': number}
+    _open_pack(store, index_ends.get(number, 0))
+    return store
+
+def _open_pack(store, index_end=0):
+    """
+    Open the current pack and its index for appending, after the end of
+    the last indexed blob and of the last complete index line.
+    """
+    name = _pack_name(store['number'])
+    pack_path = os.path.join(store['root'], name + '.pack')
+    index_path = os.path.join(store['root'], name + '.idx')
+    end = max((e['offset'] + e['length'] for e in store['index'].values() if e['pack'] == name), default=0)
+    store['pack'] = open(pack_path, 'ab')
+    store['pack'].truncate(end)
+    store['pack'].seek(end)
+    store['idx'] = open(index_path, 'a')
+    store['idx'].truncate(index_end)
+
+def _rotate(store):
+    sync_store(store)
+    store['pack'].close()
+    store['idx'].close()
+    store['number'] += 1
+    _open_pack(store)
+
+def store_file(store, path):
+    """
+    Add a file's content to the store unless it is already there.
+    The file is hashed while it is compressed, so the content stored is
+    the content indexed even if the file changed since an earlier hash.
+    Returns (sha256, size).
+    """
+    if store['pack'].tell() >= PACK_MAX_BYTES:
+        _rotate(store)
+    pack = store['pack']
+    offset = pack.tell()
+    digest = hashlib.sha256()
+    compressor = zlib.compressobj(COMPRESS_LEVEL)
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+            pack.write(compressor.compress(chunk))
+    pack.write(compressor.flush())
+    sha = digest.hexdigest()
+
+    if sha in store['index']:
+        # Same content stored meanwhile; drop this copy
+        pack.truncate(offset)
+        pack.seek(offset)
+        return sha, size
+    entry = {'sha256': sha, 'offset': offset, 'length': pack.tell() - offset, 'size': size}
+    store['idx'].write(json.dumps(entry) + '\n')
+    store['index'][sha] = dict(entry, pack=_pack_name(store['number']))
+    return sha, size
+
+def sync_store(store):
+    """Make every blob stored so far durable: pack data first, then its index"""
+    for f in (store['pack'], store['idx']):
+        f.flush()
+        os.fsync(f.fileno())
+
+def close_store(store):
+    sync_store(store)
+    store['pack'].close()
+    store['idx'].close()
+
+def restore_blob(store, sha, dest):
+    """Decompress a blob to dest via a .partial file, so dest only ever exists complete"""
+    entry = store['index'][sha]
+    partial = dest + '.partial'
+    decompressor = zlib.decompressobj()
+    digest = hashlib.sha256()
+    remaining = entry['length']
+    with open(os.path.join(store['root'], entry['pack'] + '.pack'), 'rb') as pack, open(partial, 'wb') as out:
+        pack.seek(entry['offset'])
+        while remaining:
+            chunk = decompressor.decompress(pack.read(min(CHUNK_SIZE, remaining)))
+            remaining -= min(CHUNK_SIZE, remaining)
+            digest.update(chunk)
+            out.write(chunk)
+        chunk = decompressor.flush()
+        digest.update(chunk)
+        out.write(chunk)
+        out.flush()
+        os.fsync(out.fileno())
+    if digest.hexdigest() != sha:
+        os.remove(partial)
+        raise ValueError(f"store blob {sha} is corrupt")
+    os.replace(partial, dest)
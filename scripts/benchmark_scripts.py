@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the Python analyzers in scripts/.
+Generates a synthetic React Native source tree of configurable size and
+shape, then times each analyzer end to end and per phase, and reports
+throughput and peak memory as JSON.
+"""
+
+import io
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from time import perf_counter
+
+import find_unused_files
+import extract_all_apis
+import generate_api_docs
+import find_obviously_unused
+
+APP_STATE_PATH = 'src/application/data/AppState.js'
+SCREENS_DIR = 'src/application/SolidiMobileApp/components/MainPanel/components'
+
+ROUTES = ['balance', 'order', 'withdraw', 'deposit_details', 'user', 'ticker', 'market',
+          'fee', 'addressBook', 'identity_verification_details', 'credentials', 'sell', 'buy']
+
+def _write(root, rel_path, content):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return rel_path
+
+def _import_specifier(from_file, to_file):
+    """Relative import specifier without extension, as written in the app"""
+    spec = os.path.relpath(os.path.splitext(to_file)[0], os.path.dirname(from_file))
+    return spec if spec.startswith('.') else './' + spec
+
+def _api_call(i, method):
+    route = ROUTES[i % len(ROUTES)]
+    if i % 3 == 0:
+        route_literal = f'`{route}/${{asset}}`'
+    else:
+        route_literal = f"'{route}_{i}'"
+    return (f"    this.load{method.capitalize()}{i} = async (asset) => {{\n"
+            f"      // Call {i}: nested options exercise brace matching\n"
+            f"      let data = await this.state.{method}({{\n"
+            f"        functionName: 'load{i}',\n"
+            f"        httpMethod: 'POST',\n"
+            f"        apiRoute: {route_literal},\n"
+            f"        params: {{ asset, options: {{ limit: {i}, filter: {{ side: 'buy' }} }} }},\n"
+            f"      }});\n"
+            f"      if (data == 'DisplayedError') return;\n"
+            f"      return data;\n"
+            f"    }}\n\n")
+
+def generate_synthetic_project(root, files=500, fanout=4, api_calls=2000, seed=0):
+    """
+    Write a synthetic project under root and return a summary of its shape.
+
+    Produces the app entry points, an AppState.js with `api_calls`
+    privateMethod/publicMethod calls, `files` screen and module files that
+    each import up to `fanout` others, plus example/test/backup files for
+    find_obviously_unused.
+    """
+    rng = random.Random(seed)
+    written = []
+
+    # Modules: screens under MainPanel, shared components and utilities
+    modules = []
+    for i in range(files):
+        kind = i % 4
+        if kind == 0:
+            modules.append(f'{SCREENS_DIR}/Screen{i}/Screen{i}.js')
+        elif kind == 1:
+            modules.append(f'src/components/shared/Widget{i}.js')
+        elif kind == 2:
+            modules.append(f'src/util/helper{i}.js')
+        else:
+            modules.append(f'src/components/atomic/Atom{i}/index.js')
+
+    for i, module in enumerate(modules):
+        # Import only later modules so the graph is a DAG with a long tail of orphans
+        later = modules[i + 1:]
+        imports = rng.sample(later, min(fanout, len(later))) if rng.random() < 0.8 else []
+        lines = ["import React from 'react';", "import { View } from 'react-native';"]
+        for j, imported in enumerate(imports):
+            lines.append(f"import Dep{j} from '{_import_specifier(module, imported)}';")
+        if i % 7 == 0:
+            lines.append(f"const appState = require('{_import_specifier(module, APP_STATE_PATH)}');")
+        lines.append('')
+        lines.append(f'export default function Module{i}() {{')
+        lines.append('  // ' + 'padding ' * rng.randint(10, 200))
+        lines.append('  return <View />;')
+        lines.append('}')
+        written.append(_write(root, module, '\n'.join(lines) + '\n'))
+
+    # AppState.js with thousands of API calls
+    body = ["import React, { Component } from 'react';", '', 'class AppState extends Component {',
+            '  constructor(props) {', '    super(props);']
+    for i in range(api_calls):
+        body.append(_api_call(i, 'privateMethod' if i % 4 else 'publicMethod'))
+    body += ['  }', '}', '', 'export default AppState;']
+    written.append(_write(root, APP_STATE_PATH, '\n'.join(body) + '\n'))
+
+    # Entry points import the first screens
+    roots = modules[:max(1, files // 20)]
+    app_file = 'src/application/SolidiMobileApp/SolidiMobileApp.js'
+    app_lines = [f"import Root{i} from '{_import_specifier(app_file, m)}';" for i, m in enumerate(roots)]
+    app_lines.append(f"import AppState from '{_import_specifier(app_file, APP_STATE_PATH)}';")
+    written.append(_write(root, app_file, '\n'.join(app_lines) + '\n'))
+    written.append(_write(root, 'src/application/index.js', "import App from './SolidiMobileApp';\n"))
+    written.append(_write(root, 'index.js', "import App from './src/application';\n"))
+
+    # Files generate_api_docs.py scans by name
+    for rel_path in generate_api_docs.FILES_TO_SCAN[1:]:
+        calls = ''.join(_api_call(i, 'privateMethod') for i in range(20))
+        written.append(_write(root, rel_path, f'class Screen {{\n  constructor() {{\n{calls}  }}\n}}\n'))
+
+    # Obviously unused files
+    for i in range(max(1, files // 50)):
+        written.append(_write(root, f'src/examples/Example{i}.js', 'export default 1;\n'))
+        written.append(_write(root, f'src/components/old/Widget{i}_backup.js', 'export default 1;\n'))
+        written.append(_write(root, f'test/unit{i}.test.js', 'test("x", () => {});\n'))
+
+    total_bytes = sum(os.path.getsize(os.path.join(root, p)) for p in written)
+    return {'files': len(written), 'bytes': total_bytes, 'api_calls': api_calls, 'fanout': fanout, 'seed': seed}
+
+@contextlib.contextmanager
+def project_root(root):
+    """Point every analyzer at root and run from it, restoring globals afterwards"""
+    saved = {
+        'cwd': os.getcwd(),
+        'fuf_root': find_unused_files.PROJECT_ROOT,
+        'fuf_cache': find_unused_files.CACHE_FILE,
+        'fou_root': find_obviously_unused.PROJECT_ROOT,
+        'argv': sys.argv,
+    }
+    find_unused_files.PROJECT_ROOT = root
+    find_unused_files.CACHE_FILE = os.path.join(root, os.path.basename(saved['fuf_cache']))
+    find_obviously_unused.PROJECT_ROOT = root
+    os.chdir(root)
+    try:
+        yield
+    finally:
+        os.chdir(saved['cwd'])
+        find_unused_files.PROJECT_ROOT = saved['fuf_root']
+        find_unused_files.CACHE_FILE = saved['fuf_cache']
+        find_obviously_unused.PROJECT_ROOT = saved['fou_root']
+        sys.argv = saved['argv']
+
+def measure(func, repeat):
+    """Best wall time of `repeat` runs, then peak traced memory of one more run"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            result = func()
+            elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': round(best, 6), 'peak_bytes': peak}, result
+
+def run_main(module, argv):
+    def call():
+        sys.argv = [module.__file__] + argv
+        module.main()
+    return call
+
+def benchmark_find_unused_files(shape, repeat):
+    fuf = find_unused_files
+    phases = {}
+    phases['walk'], index = measure(fuf.build_file_index, repeat)
+    phases['parse_and_resolve'], (all_files, graph, _) = measure(
+        lambda: fuf.build_dependency_graph(use_cache=False), repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        entry_files = fuf.find_entry_points(all_files)
+    phases['compact_graph'], compact = measure(lambda: fuf.build_compact_graph(all_files, graph), repeat)
+    phases['reachability'], _ = measure(lambda: fuf.find_used_files(entry_files, graph, graph=compact), repeat)
+
+    end_to_end = {}
+    end_to_end['cold'], _ = measure(run_main(fuf, ['--no-cache']), repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_main(fuf, [])()  # prime the parse cache
+    end_to_end['warm_cache'], _ = measure(run_main(fuf, []), repeat)
+    return {'phases': phases, 'end_to_end': end_to_end, 'items': len(index['js_files']), 'unit': 'files'}
+
+def benchmark_extract_all_apis(shape, repeat):
+    phases = {}
+    phases['extract'], apis = measure(lambda: extract_all_apis.extract_apis_with_context(APP_STATE_PATH), repeat)
+    end_to_end = {'cold': measure(run_main(extract_all_apis, []), repeat)[0]}
+    return {'phases': phases, 'end_to_end': end_to_end, 'items': len(apis), 'unit': 'api calls',
+            'bytes': os.path.getsize(APP_STATE_PATH)}
+
+def benchmark_generate_api_docs(shape, repeat):
+    phases = {}
+
+    def extract():
+        apis = []
+        for file_path in generate_api_docs.FILES_TO_SCAN:
+            apis.extend(generate_api_docs.extract_api_calls(file_path))
+        return apis
+
+    phases['extract'], apis = measure(extract, repeat)
+    phases['categorize'], categories = measure(lambda: generate_api_docs.categorize_apis(apis), repeat)
+    phases['render'], _ = measure(lambda: generate_api_docs.generate_markdown(categories), repeat)
+    end_to_end = {'cold': measure(run_main(generate_api_docs, []), repeat)[0]}
+    return {'phases': phases, 'end_to_end': end_to_end, 'items': len(apis), 'unit': 'api calls',
+            'bytes': sum(os.path.getsize(p) for p in generate_api_docs.FILES_TO_SCAN if os.path.exists(p))}
+
+def benchmark_find_obviously_unused(shape, repeat):
+    phases = {}
+    phases['walk_and_classify'], unused = measure(find_obviously_unused.find_obviously_unused_files, repeat)
+    end_to_end = {'cold': measure(run_main(find_obviously_unused, []), repeat)[0]}
+    return {'phases': phases, 'end_to_end': end_to_end,
+            'items': sum(len(files) for files in unused.values()), 'unit': 'files'}
+
+BENCHMARKS = {
+    'find_unused_files': benchmark_find_unused_files,
+    'extract_all_apis': benchmark_extract_all_apis,
+    'generate_api_docs': benchmark_generate_api_docs,
+    'find_obviously_unused': benchmark_find_obviously_unused,
+}
+
+def add_throughput(result, shape):
+    """Items and bytes per second for the cold end-to-end run"""
+    seconds = result['end_to_end']['cold']['seconds'] or 1e-9
+    result['throughput'] = {
+        f"{result['unit'].replace(' ', '_')}_per_second": round(result['items'] / seconds, 1),
+        'bytes_per_second': round(result.get('bytes', shape['bytes']) / seconds, 1),
+    }
+    return result
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the scripts/ analyzers on a synthetic project.')
+    parser.add_argument('--files', type=int, default=500, help='Number of synthetic JS modules')
+    parser.add_argument('--fanout', type=int, default=4, help='Imports per module')
+    parser.add_argument('--api-calls', type=int, default=2000, help='privateMethod/publicMethod calls in AppState.js')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the import graph')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per measurement (best is reported)')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated project directory')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    root = tempfile.mkdtemp(prefix='solidi_bench_')
+    try:
+        print(f"🏗️  Generating synthetic project in {root}...", file=sys.stderr)
+        shape = generate_synthetic_project(root, args.files, args.fanout, args.api_calls, args.seed)
+        print(f"   {shape['files']} files, {shape['bytes']} bytes", file=sys.stderr)
+
+        report = {'shape': shape, 'python': sys.version.split()[0], 'results': {}}
+        with project_root(root):
+            for name in args.only or BENCHMARKS:
+                print(f"⏱️  {name}...", file=sys.stderr)
+                report['results'][name] = add_throughput(BENCHMARKS[name](shape, args.repeat), shape)
+    finally:
+        if args.keep:
+            print(f"📁 Kept {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"📄 Report saved to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
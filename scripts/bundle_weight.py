@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Startup-cost / bundle-weight report for the Solidi Mobile App.
+Sums the source bytes and modules each entry point and each MainPanel
+screen pulls in through the import graph, and ranks modules by their
+exclusive contribution: the bytes that would leave the bundle with them.
+"""
+
+import os
+import json
+import argparse
+from array import array
+
+import profiling
+import project_snapshot
+import find_unused_files
+
+# Each subdirectory is one top-level screen
+SCREENS_DIR = 'src/application/SolidiMobileApp/components/MainPanel/components'
+
+# Rows shown in the heaviest-module table
+DEFAULT_TOP = 25
+
+# Smallest deferred size worth a lazy-loading split point
+DEFAULT_MIN_DEFERRED = 10 * 1024
+
+def format_bytes(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+def file_sizes(graph, snapshot):
+    """Source bytes of every file in the compact graph, indexed by file ID"""
+    stats = snapshot['files']
+    return array('Q', (stats[file][0] if file in stats else 0 for file in graph['files']))
+
+def find_screens(graph, screens_dir=SCREENS_DIR):
+    """
+    {screen name: [root files]} for every subdirectory of screens_dir. A
+    screen's roots are its files imported from outside its directory, so
+    helpers only used inside the screen are not counted as roots.
+    """
+    files = graph['files']
+    screen_files = {}
+    for file in files:
+        if file.startswith(screens_dir + '/'):
+            parts = file[len(screens_dir) + 1:].split('/')
+            if len(parts) > 1:
+                screen_files.setdefault(parts[0], []).append(file)
+
+    reverse_offsets, reverse_targets = graph['reverse_offsets'], graph['reverse_targets']
+    screens = {}
+    for name, members in sorted(screen_files.items()):
+        prefix = f"{screens_dir}/{name}/"
+        roots = []
+        for file in members:
+            i = graph['ids'][file]
+            if any(not files[reverse_targets[k]].startswith(prefix)
+                   for k in range(reverse_offsets[i], reverse_offsets[i + 1])):
+                roots.append(file)
+        screens[name] = roots
+    return screens
+
+def subtree_weight(graph, sizes, root_ids):
+    """(modules, bytes) reachable from root_ids, the roots included"""
+    modules = 0
+    total = 0
+    for i in find_unused_files.bitset_ids(find_unused_files.reachable_bitset(graph, root_ids)):
+        modules += 1
+        total += sizes[i]
+    return modules, total
+
+def exclusive_weights(usage, sizes):
+    """
+    Exclusive (modules, bytes) of every file: the files it dominates, i.e.
+    those that are only reachable through it. The dominator tree is laid out
+    in preorder, so one prefix sum answers every file in O(1).
+    """
+    order = usage['order']
+    prefix = array('Q', [0]) * (len(order) + 1)
+    for k, i in enumerate(order):
+        prefix[k + 1] = prefix[k] + sizes[i]
+    start, end = usage['start'], usage['end']
+
+    def weight(i):
+        if start[i] == -1:
+            return 0, 0
+        return end[i] - start[i], prefix[end[i]] - prefix[start[i]]
+    return weight
+
+def exclusive_union(usage, sizes, root_ids):
+    """Exclusive (modules, bytes) of a group of files, each dominated file counted once"""
+    order = usage['order']
+    seen = set()
+    for i in root_ids:
+        if usage['start'][i] != -1:
+            seen.update(order[usage['start'][i]:usage['end'][i]])
+    return len(seen), sum(sizes[i] for i in seen)
+
+def lazy_candidates(graph, usage, sizes, entry_files, screens, min_bytes=DEFAULT_MIN_DEFERRED):
+    """
+    Split points that would defer code from startup, ranked by bytes deferred.
+
+    The app shell is what the entry points reach without entering any
+    screen. Every used module outside the shell is only reachable through
+    screens; loading it lazily (React.lazy for screens, an inline require
+    otherwise) at all of its import sites defers exactly the files it
+    dominates, which is its exclusive weight. A candidate nested inside a
+    larger one is reported with `inside` set to it.
+    """
+    fuf = find_unused_files
+    ids = graph['ids']
+    files = graph['files']
+    used = fuf.find_used_files(entry_files, None, graph=graph)
+    screen_roots = {ids[file]: name for name, roots in screens.items() for file in roots}
+    entry_ids = [ids[file] for file in entry_files if file in ids]
+
+    with profiling.phase('shell'):
+        roots_bitset = fuf.new_bitset(graph)
+        for i in screen_roots:
+            roots_bitset[i >> 3] |= 1 << (i & 7)
+        shell = fuf.reachable_bitset(graph, [i for i in entry_ids if i not in screen_roots], blocked=roots_bitset)
+        shell_ids = set(fuf.bitset_ids(shell))
+
+    # Screens each non-shell module is reachable from, outside the shell
+    reached_by = {}
+    with profiling.phase('screen reach'):
+        for name, roots in screens.items():
+            for i in fuf.bitset_ids(fuf.reachable_bitset(graph, [ids[file] for file in roots], blocked=shell)):
+                reached_by.setdefault(i, set()).add(name)
+
+    exclusive = exclusive_weights(usage, sizes)
+    candidates = []
+    for file in used:
+        i = ids.get(file)
+        if i is None or i in shell_ids:
+            continue
+        modules, deferred = exclusive(i)
+        if deferred < min_bytes:
+            continue
+        importers = sorted(files[graph['reverse_targets'][k]]
+                           for k in range(graph['reverse_offsets'][i], graph['reverse_offsets'][i + 1])
+                           if files[graph['reverse_targets'][k]] in used)
+        candidates.append({
+            'file': file,
+            'kind': 'React.lazy' if i in screen_roots else 'inline require',
+            'deferred_bytes': deferred,
+            'deferred_modules': modules,
+            'screens': sorted(reached_by.get(i, ())),
+            'import_sites': importers,
+            'inside': None,
+        })
+    candidates.sort(key=lambda c: (-c['deferred_bytes'], c['file']))
+
+    # Mark candidates dominated by a larger candidate
+    by_id = {ids[c['file']]: c for c in candidates}
+    idom = usage['idom']
+    for i, candidate in by_id.items():
+        parent = idom[i]
+        while 0 <= parent < len(files):
+            if parent in by_id:
+                candidate['inside'] = files[parent]
+                break
+            parent = idom[parent]
+
+    return {
+        'shell_modules': len(shell_ids),
+        'shell_bytes': sum(sizes[i] for i in shell_ids),
+        'deferrable_bytes': sum(sizes[ids[file]] for file in used if file in ids and ids[file] not in shell_ids),
+        'candidates': candidates,
+    }
+
+def analyze(graph, entry_files, snapshot, top=DEFAULT_TOP, lazy=False, min_deferred=DEFAULT_MIN_DEFERRED):
+    """
+    Weight report as a dict: the whole reachable bundle, each entry point,
+    each screen and the `top` modules with the largest exclusive weight,
+    plus the lazy-loading candidates if `lazy` is set.
+    """
+    ids = graph['ids']
+    sizes = file_sizes(graph, snapshot)
+    with profiling.phase('dominators'):
+        usage = find_unused_files.build_usage_index(graph, entry_files)
+    exclusive = exclusive_weights(usage, sizes)
+    entry_ids = sorted(ids[file] for file in entry_files if file in ids)
+
+    def row(name, root_ids):
+        modules, total = subtree_weight(graph, sizes, root_ids)
+        own_modules, own_bytes = exclusive_union(usage, sizes, root_ids)
+        return {'name': name, 'modules': modules, 'bytes': total,
+                'exclusive_modules': own_modules, 'exclusive_bytes': own_bytes,
+                'in_bundle': any(usage['start'][i] != -1 for i in root_ids)}
+
+    with profiling.phase('weights'):
+        bundle = row('bundle', entry_ids)
+        entries = [row(graph['files'][i], [i]) for i in entry_ids]
+        screens = []
+        screen_roots = find_screens(graph)
+        for name, roots in screen_roots.items():
+            screen = row(name, [ids[file] for file in roots])
+            screen['roots'] = roots
+            screens.append(screen)
+        screens.sort(key=lambda screen: (-screen['exclusive_bytes'], -screen['bytes']))
+
+        reachable = list(usage['order'])
+        reachable.sort(key=lambda i: (-exclusive(i)[1], graph['files'][i]))
+        heaviest = []
+        for i in reachable[:top]:
+            modules, total = subtree_weight(graph, sizes, [i])
+            own_modules, own_bytes = exclusive(i)
+            heaviest.append({'name': graph['files'][i], 'size': sizes[i], 'modules': modules, 'bytes': total,
+                             'exclusive_modules': own_modules, 'exclusive_bytes': own_bytes})
+
+    report = {'bundle': bundle, 'entries': entries, 'screens': screens, 'heaviest': heaviest}
+    if lazy:
+        with profiling.phase('lazy candidates'):
+            report['lazy'] = lazy_candidates(graph, usage, sizes, entry_files, screen_roots, min_deferred)
+    return report
+
+def print_rows(rows, total):
+    print(f"   {'transitive':>12} {'modules':>8} {'exclusive':>12} {'modules':>8} {'%':>6}  name")
+    for row in rows:
+        if not row['in_bundle']:
+            print(f"   {format_bytes(row['bytes']):>12} {row['modules']:>8} {'-':>12} {'-':>8} {'-':>6}  "
+                  f"{row['name']} (not reachable from the entry points)")
+            continue
+        share = 100 * row['exclusive_bytes'] / total if total else 0
+        print(f"   {format_bytes(row['bytes']):>12} {row['modules']:>8} "
+              f"{format_bytes(row['exclusive_bytes']):>12} {row['exclusive_modules']:>8} {share:>5.1f}%  {row['name']}")
+
+def print_report(report):
+    bundle = report['bundle']
+    total = bundle['bytes']
+
+    print("\n" + "=" * 80)
+    print("BUNDLE WEIGHT")
+    print("=" * 80)
+    print(f"📦 {bundle['modules']} modules, {format_bytes(total)} of source reachable from the entry points")
+    print("   transitive: everything the module pulls in; exclusive: what leaves the bundle with it")
+
+    print("\n📍 Entry points:")
+    print_rows(report['entries'], total)
+
+    print("\n🖼️  Screens (MainPanel/components):")
+    print_rows([screen for screen in report['screens'] if screen['roots']], total)
+    not_imported = [screen['name'] for screen in report['screens'] if not screen['roots']]
+    if not_imported:
+        print(f"   Not imported from outside their directory: {', '.join(not_imported)}")
+
+    print("\n🏋️  Heaviest modules by exclusive weight:")
+    print(f"   {'exclusive':>12} {'modules':>8} {'own size':>10} {'transitive':>12}  file")
+    for row in report['heaviest']:
+        print(f"   {format_bytes(row['exclusive_bytes']):>12} {row['exclusive_modules']:>8} "
+              f"{format_bytes(row['size']):>10} {format_bytes(row['bytes']):>12}  {row['name']}")
+
+def print_lazy(lazy, total):
+    print("\n" + "=" * 80)
+    print("LAZY-LOADING CANDIDATES")
+    print("=" * 80)
+    print(f"🐚 App shell (reachable without entering a screen): {lazy['shell_modules']} modules, "
+          f"{format_bytes(lazy['shell_bytes'])}")
+    print(f"💤 Only reachable through screens: {format_bytes(lazy['deferrable_bytes'])} "
+          f"({100 * lazy['deferrable_bytes'] / total if total else 0:.1f}% of startup source)")
+
+    if not lazy['candidates']:
+        print("\n✅ No split point would defer enough code")
+        return
+    for rank, candidate in enumerate(lazy['candidates'], 1):
+        print(f"\n{rank:>3}. {candidate['file']}")
+        print(f"     defers {format_bytes(candidate['deferred_bytes'])} ({candidate['deferred_modules']} module(s)) "
+              f"with {candidate['kind']}")
+        if candidate['inside']:
+            print(f"     inside {candidate['inside']}")
+        if candidate['screens']:
+            print(f"     screens: {', '.join(candidate['screens'])}")
+        for site in candidate['import_sites']:
+            print(f"     import site: {site}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Report the source bytes each entry point and screen pulls into the Solidi Mobile App bundle.')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, metavar='N',
+                        help=f'Modules shown in the heaviest-module table (default: {DEFAULT_TOP})')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Also rank React.lazy / inline-require split points by bytes deferred from startup')
+    parser.add_argument('--min-deferred', type=int, default=DEFAULT_MIN_DEFERRED, metavar='BYTES',
+                        help=f'With --lazy, hide split points deferring less (default: {DEFAULT_MIN_DEFERRED})')
+    parser.add_argument('--json', metavar='FILE', help='Also write the report as JSON to FILE')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the find_unused_files.py parse cache')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Parse files in N worker processes (0 = one per CPU core)')
+    profiling.add_arguments(parser)
+    project_snapshot.add_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def load_graph(args):
+    """(compact graph, entry files, snapshot) of the project, via find_unused_files"""
+    fuf = find_unused_files
+    snapshot = project_snapshot.open_snapshot(fuf.PROJECT_ROOT, args.snapshot)
+    all_files, dependency_graph, _ = fuf.build_dependency_graph(
+        use_cache=not args.no_cache, jobs=args.jobs, snapshot=snapshot)
+    entry_files = fuf.find_entry_points(all_files)
+    with profiling.phase('compact graph'):
+        graph = fuf.build_compact_graph(all_files, dependency_graph)
+    return graph, entry_files, snapshot
+
+def main():
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
+    graph, entry_files, snapshot = load_graph(args)
+    if not entry_files:
+        print("\n❌ No entry points found! Cannot weigh the bundle.")
+        return
+
+    report = analyze(graph, entry_files, snapshot, args.top, args.lazy, args.min_deferred)
+    print_report(report)
+    if args.lazy:
+        print_lazy(report['lazy'], report['bundle']['bytes'])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 JSON written to {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Declarative codemod engine for the Solidi Mobile App.
+Applies JSON patch specs (anchors, replacements, guards) to many files at
+once. All anchors of a file are found in one pass with an Aho-Corasick
+automaton; patches are shown as unified diffs (the default) or applied
+with --apply, all files or none.
+"""
+
+import os
+import sys
+import json
+import glob
+import difflib
+import argparse
+from collections import deque
+
+import profiling
+
+PROJECT_ROOT = '/Users/henry/Solidi/SolidiMobileApp4'
+
+# Bundled specs, e.g. codemod.py registration-completion-credentials-first
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'codemods')
+
+class PatchError(Exception):
+    pass
+
+def build_automaton(needles):
+    """
+    Aho-Corasick automaton over the needle strings: (goto, fail, output)
+    where output[state] lists the indexes of the needles ending there.
+    """
+    goto = [{}]
+    output = [[]]
+    for index, needle in enumerate(needles):
+        state = 0
+        for char in needle:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                output.append([])
+            state = goto[state][char]
+        output[state].append(index)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(char, 0)
+            output[child] = output[child] + output[fail[child]]
+    return goto, fail, output
+
+def find_all(automaton, needles, text):
+    """{needle index: [start offsets]} of every occurrence, in one pass over text"""
+    goto, fail, output = automaton
+    hits = {index: [] for index in range(len(needles))}
+    state = 0
+    for pos, char in enumerate(text):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        for index in output[state]:
+            hits[index].append(pos + 1 - len(needles[index]))
+    return hits
+
+def load_spec(path):
+    """A spec file, by path or by name in SPECS_DIR"""
+    if not os.path.exists(path) and not os.path.dirname(path):
+        path = os.path.join(SPECS_DIR, path if path.endswith('.json') else path + '.json')
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding='utf-8') as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise PatchError(f"{name}: invalid JSON: {e}")
+    if not isinstance(spec, dict) or not isinstance(spec.get('patches'), list):
+        raise PatchError(f"{name}: spec needs a \"patches\" list")
+    spec.setdefault('name', name)
+    for patch in spec['patches']:
+        if 'replace' in patch and isinstance(patch['replace'], list):
+            patch['replace'] = '\n'.join(patch['replace'])
+        if patch.get('mode', 'replace') not in ('replace', 'insert_before', 'insert_after'):
+            raise PatchError(f"{spec['name']}: unknown mode {patch['mode']!r}")
+    return spec
+
+def patch_needles(patch):
+    return [patch['anchor']] + ([patch['end']] if 'end' in patch else []) + \
+        patch.get('unless', []) + patch.get('require', [])
+
+def _line_bounds(text, start, end):
+    """[start, end) widened to whole lines, without the final newline"""
+    line_end = text.find('\n', end - 1 if end > start else end)
+    return text.rfind('\n', 0, start) + 1, len(text) if line_end == -1 else line_end
+
+def resolve_patch(patch, text, hits):
+    """
+    (start, end, replacement) edits for one patch, [] if a guard says it
+    is already applied. Raises PatchError if the anchors do not match.
+
+    Without `end`, the anchor text itself is the region. With `end`, the
+    region is the whole lines from the anchor to the first `end` after it
+    (within `max_lines` lines, if given).
+    """
+    if any(hits[needle] for needle in patch.get('unless', [])):
+        return []
+    missing = [needle for needle in patch.get('require', []) if not hits[needle]]
+    if missing:
+        raise PatchError(f"required text not found: {missing[0]!r}")
+
+    starts = hits[patch['anchor']]
+    if not starts:
+        raise PatchError(f"anchor not found: {patch['anchor']!r}")
+    occurrence = patch.get('occurrence', 'only')
+    if occurrence == 'only' and len(starts) > 1:
+        raise PatchError(f"anchor found {len(starts)} times (set occurrence to first or all): {patch['anchor']!r}")
+    if occurrence != 'all':
+        starts = starts[:1]
+
+    edits = []
+    for start in starts:
+        if 'end' in patch:
+            ends = [e for e in hits[patch['end']] if e >= start]
+            if not ends:
+                raise PatchError(f"end not found after the anchor: {patch['end']!r}")
+            end = ends[0] + len(patch['end'])
+            if 'max_lines' in patch and text.count('\n', start, end) >= patch['max_lines']:
+                raise PatchError(f"end is more than {patch['max_lines']} lines after the anchor: {patch['end']!r}")
+            start, end = _line_bounds(text, start, end)
+        else:
+            end = start + len(patch['anchor'])
+
+        mode = patch.get('mode', 'replace')
+        region = text[start:end]
+        separator = '\n' if 'end' in patch else ''
+        if mode == 'replace':
+            edits.append((start, end, patch['replace']))
+        elif mode == 'insert_before':
+            edits.append((start, end, patch['replace'] + separator + region))
+        else:
+            edits.append((start, end, region + separator + patch['replace']))
+    return edits
+
+def apply_edits(text, edits):
+    """Text with non-overlapping (start, end, replacement) edits applied in one pass"""
+    pieces = []
+    cursor = 0
+    for start, end, replacement in sorted(edits):
+        if start < cursor:
+            raise PatchError(f"patches overlap at offset {start}")
+        pieces.append(text[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+def plan(specs, root):
+    """
+    Run every patch of every spec against the tree without writing.
+    Returns ({path: (old text, new text)} for changed files,
+    [(spec, patch, file, status)] with status 'applied', 'already applied'
+    or the error message).
+    """
+    by_file = {}
+    for spec in specs:
+        for patch in spec['patches']:
+            pattern = patch['file']
+            files = sorted(os.path.relpath(p, root) for p in glob.glob(os.path.join(root, pattern), recursive=True))
+            if not files:
+                by_file.setdefault(pattern, []).append((spec, patch))
+            for file in files:
+                by_file.setdefault(file, []).append((spec, patch))
+
+    changes = {}
+    results = []
+    for file, patches in sorted(by_file.items()):
+        path = os.path.join(root, file)
+        if not os.path.isfile(path):
+            results.extend((spec['name'], patch, file, 'file not found') for spec, patch in patches)
+            continue
+        with profiling.timed_file(file) as record:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            record['bytes'] = len(text)
+
+        needles = sorted({needle for spec, patch in patches for needle in patch_needles(patch)})
+        with profiling.phase('scan'):
+            found = find_all(build_automaton(needles), needles, text)
+        hits = {needle: found[index] for index, needle in enumerate(needles)}
+
+        edits = []
+        for spec, patch in patches:
+            try:
+                patch_edits = resolve_patch(patch, text, hits)
+            except PatchError as e:
+                results.append((spec['name'], patch, file, str(e)))
+                continue
+            edits.extend(patch_edits)
+            results.append((spec['name'], patch, file, 'applied' if patch_edits else 'already applied'))
+        if edits:
+            try:
+                changes[file] = (text, apply_edits(text, edits))
+            except PatchError as e:
+                results.append(('', {}, file, str(e)))
+    return changes, results
+
+def _write_file(path, text, mode):
+    """Write text to path + '.codemod.tmp' with the given permissions; returns the temporary path"""
+    tmp_path = path + '.codemod.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.chmod(tmp_path, mode)
+    return tmp_path
+
+def write_atomically(changes, root):
+    """
+    Write every changed file or none: all new contents are written to
+    temporary files first, and only renamed over the originals once every
+    write succeeded. If a rename fails, the files already renamed get
+    their original contents back (kept in changes) before the error is
+    raised.
+    """
+    staged = []
+    try:
+        for file, (old, new) in sorted(changes.items()):
+            path = os.path.join(root, file)
+            staged.append((_write_file(path, new, os.stat(path).st_mode), path, old))
+    except OSError:
+        for tmp_path, path, old in staged:
+            os.remove(tmp_path)
+        raise
+
+    replaced = []
+    try:
+        for tmp_path, path, old in staged:
+            os.replace(tmp_path, path)
+            replaced.append((path, old))
+    except OSError:
+        for tmp_path, path, old in staged[len(replaced):]:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        for path, old in replaced:
+            os.replace(_write_file(path, old, os.stat(path).st_mode), path)
+        raise
+
+def print_diffs(changes):
+    for file, (old, new) in sorted(changes.items()):
+        sys.stdout.writelines(difflib.unified_diff(old.splitlines(True), new.splitlines(True),
+                                                   f"a/{file}", f"b/{file}"))
+
+def run_specs(spec_paths, root=None, apply=False, show_diff=True):
+    """
+    Plan and print (and with apply=True, write) the specs. Returns
+    (exit status, number of files written).
+    """
+    root = root or PROJECT_ROOT
+    try:
+        specs = [load_spec(path) for path in spec_paths]
+    except PatchError as e:
+        print(f"❌ {e}")
+        return 1, 0
+    with profiling.phase('plan'):
+        changes, results = plan(specs, root)
+
+    failed = [result for result in results if result[3] not in ('applied', 'already applied')]
+    for spec_name, patch, file, status in results:
+        icon = '✅' if status == 'applied' else '⏭️ ' if status == 'already applied' else '❌'
+        label = patch.get('description') or patch.get('anchor', '')[:60]
+        print(f"{icon} {spec_name}: {file}: {label} ({status})")
+
+    if show_diff and changes and not apply:
+        print()
+        print_diffs(changes)
+    if failed:
+        print(f"\n❌ {len(failed)} patch(es) failed; nothing written")
+        return 1, 0
+    if not changes:
+        print("\n✅ Nothing to change")
+        return 0, 0
+    if not apply:
+        print(f"\n📝 Dry run: {len(changes)} file(s) would change; run with --apply to write them")
+        return 0, 0
+    with profiling.phase('write'):
+        write_atomically(changes, root)
+    print(f"\n✅ {len(changes)} file(s) updated")
+    return 0, len(changes)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Apply declarative JSON patch specs across the Solidi Mobile App.')
+    parser.add_argument('specs', nargs='+', metavar='SPEC',
+                        help=f'Spec files, or names of specs in {os.path.relpath(SPECS_DIR)}/')
+    parser.add_argument('--apply', action='store_true', help='Write the changes (default: dry run with unified diffs)')
+    parser.add_argument('--root', default=PROJECT_ROOT, help='Project root the spec file patterns are relative to')
+    profiling.add_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    with profiling.session(args):
+        status, _ = run_specs(args.specs, args.root, args.apply)
+    sys.exit(status)
+
+if __name__ == '__main__':
+    main()
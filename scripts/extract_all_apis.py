@@ -4,69 +4,93 @@ Comprehensive API endpoint extractor for Solidi Mobile App
 Extracts all API routes with their context and parameters
 """
 
-import re
 import os
+import argparse
+
+import profiling
+from js_scanner import scan_method_calls, property_text, string_literal_value
 
 def extract_apis_with_context(file_path):
     """Extract all API endpoints with their surrounding context"""
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with profiling.timed_file(file_path) as record:
+        with profiling.phase('read'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        record['bytes'] = len(content.encode('utf-8'))
+        
+        return extract_apis_from_content(content)
+
+def extract_apis_from_content(content):
+    """Extract all API endpoints from JavaScript source text"""
+    
+    # One structural pass finds every privateMethod/publicMethod call site
+    with profiling.phase('scan'):
+        calls = scan_method_calls(content)
+    
+    for call in calls:
+        profiling.count_matches(call['method'], 1)
     
     apis = []
     
-    # Pattern to match privateMethod/publicMethod calls
-    patterns = [
-        r'(this\.\w+\s*=\s*async\s*\([^)]*\)\s*=>\s*{[^}]*?(?:privateMethod|publicMethod)\s*\(\s*{[^}]*?apiRoute:\s*[\'"`]([^\'"`]+)[\'"`][^}]*?\})',
-        r'await\s+this\.state\.(privateMethod|publicMethod)\s*\(\s*{([^}]+?)}\s*\)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, content, re.DOTALL)
-        for match in matches:
-            full_context = match.group(0)
-            
-            # Extract function name
-            func_match = re.search(r'this\.(\w+)\s*=\s*async', full_context)
-            func_name = func_match.group(1) if func_match else 'Unknown'
-            
-            # Extract API route
-            route_match = re.search(r'apiRoute:\s*[\'"`]([^\'"`]+)[\'"`]', full_context)
-            if route_match:
-                api_route = route_match.group(1)
-            else:
-                # Try template literal
-                route_match = re.search(r'apiRoute:\s*`([^`]+)`', full_context)
-                if route_match:
-                    api_route = route_match.group(1)
-                else:
-                    continue
-            
-            # Extract HTTP method
-            method_match = re.search(r'httpMethod:\s*[\'"]([^\'"]+)[\'"]', full_context)
-            http_method = method_match.group(1) if method_match else 'POST'
-            
-            # Extract method type (private/public)
-            method_type = 'Private' if 'privateMethod' in full_context else 'Public'
-            
-            # Extract params
-            params_match = re.search(r'params:\s*{([^}]+)}', full_context)
-            params = params_match.group(1).strip() if params_match else '{}'
-            
-            apis.append({
-                'function': func_name,
-                'route': api_route,
-                'method': http_method,
-                'type': method_type,
-                'params': params,
-                'context': full_context[:300]
-            })
+    for call in calls:
+        # Extract API route (quoted string or template literal)
+        api_route = string_literal_value(property_text(content, call, 'apiRoute'))
+        if not api_route:
+            continue
+        
+        # Extract function name (enclosing async function, else functionName option)
+        func_name = call['function'] or string_literal_value(property_text(content, call, 'functionName')) or 'Unknown'
+        
+        # Extract HTTP method
+        http_method = string_literal_value(property_text(content, call, 'httpMethod')) or 'POST'
+        
+        # Extract method type (private/public)
+        method_type = 'Private' if call['method'] == 'privateMethod' else 'Public'
+        
+        # Extract params
+        params = property_text(content, call, 'params')
+        if params and params.startswith('{') and params.endswith('}'):
+            params = params[1:-1].strip() or '{}'
+        elif not params:
+            params = '{}'
+        
+        start, end = call['span']
+        apis.append({
+            'function': func_name,
+            'route': api_route,
+            'method': http_method,
+            'type': method_type,
+            'params': params,
+            'line': call['line'],
+            'span': call['span'],
+            'context': content[start:end][:300]
+        })
     
     return apis
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Extract all API endpoints from AppState.js.')
+    profiling.add_arguments(parser)
+    import watch_analysis
+    watch_analysis.add_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
     app_state_path = 'src/application/data/AppState.js'
     
+    if args.watch:
+        # Imported here: watch_analysis imports this module back
+        import watch_analysis
+        watch_analysis.watch(os.getcwd(), args.interval, track_graph=False,
+                             port=args.port, state_file=args.state_file)
+        return
+    
     if not os.path.exists(app_state_path):
         print(f"❌ File not found: {app_state_path}")
         return
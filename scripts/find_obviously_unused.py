@@ -9,12 +9,28 @@ Conservative unused file identifier - only moves files that are CLEARLY unused:
 
 import os
 import json
+import argparse
 from pathlib import Path
 
+import project_snapshot
+
 PROJECT_ROOT = '/Users/henry/Solidi/SolidiMobileApp4'
 
-def find_obviously_unused_files():
-    """Find files that are obviously unused based on naming patterns"""
+# Directories under src/ that are never reported
+SKIP_DIRS = {'node_modules', 'backup', '__pycache__'}
+
+# The only directories looked at
+SCAN_ROOTS = ('src', 'test')
+
+def find_obviously_unused_files(snapshot=None):
+    """
+    Find files that are obviously unused based on naming patterns.
+    Without a snapshot only src/ and test/ are walked. A shared snapshot
+    (--snapshot) never contains project_snapshot.SKIP_DIRS, so files in
+    e.g. a build/ directory inside src/ are not reported from one.
+    """
+    if snapshot is None:
+        snapshot = project_snapshot.build_snapshot(PROJECT_ROOT, frozenset(), SCAN_ROOTS)
     
     unused_files = {
         'examples': [],
@@ -23,55 +39,46 @@ def find_obviously_unused_files():
         'debug': [],
     }
     
-    # Walk through src directory
-    src_dir = os.path.join(PROJECT_ROOT, 'src')
-    
-    for root, dirs, files in os.walk(src_dir):
-        # Skip node_modules and actual backup dirs
-        dirs[:] = [d for d in dirs if d not in {'node_modules', 'backup', '__pycache__'}]
+    # Walk through src directory (skipping node_modules and actual backup dirs)
+    for rel_path in project_snapshot.select_files(snapshot, ['src'], SKIP_DIRS, ('.js', '.jsx')):
+        file = os.path.basename(rel_path)
+        
+        # Check for example files
+        if 'example' in file.lower() or 'example' in rel_path.lower():
+            unused_files['examples'].append(rel_path)
         
-        for file in files:
-            if not (file.endswith('.js') or file.endswith('.jsx')):
-                continue
-            
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, PROJECT_ROOT)
-            
-            # Check for example files
-            if 'example' in file.lower() or 'example' in rel_path.lower():
-                unused_files['examples'].append(rel_path)
-            
-            # Check for test files
-            elif 'test' in file.lower() or 'test' in rel_path.lower() or '__tests__' in rel_path:
-                unused_files['tests'].append(rel_path)
-            
-            # Check for backup files
-            elif 'backup' in file.lower() or 'backup' in rel_path.lower() or '_backup' in rel_path.lower():
-                unused_files['backups'].append(rel_path)
-            
-            # Check for debug files
-            elif 'debug' in file.lower() and 'debug' not in file.lower().replace('debug', ''):
-                unused_files['debug'].append(rel_path)
+        # Check for test files
+        elif 'test' in file.lower() or 'test' in rel_path.lower() or '__tests__' in rel_path:
+            unused_files['tests'].append(rel_path)
+        
+        # Check for backup files
+        elif 'backup' in file.lower() or 'backup' in rel_path.lower() or '_backup' in rel_path.lower():
+            unused_files['backups'].append(rel_path)
+        
+        # Check for debug files
+        elif 'debug' in file.lower() and 'debug' not in file.lower().replace('debug', ''):
+            unused_files['debug'].append(rel_path)
     
     # Also check test directory at root
-    test_dir = os.path.join(PROJECT_ROOT, 'test')
-    if os.path.exists(test_dir):
-        for root, dirs, files in os.walk(test_dir):
-            for file in files:
-                if file.endswith('.js') or file.endswith('.jsx'):
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, PROJECT_ROOT)
-                    unused_files['tests'].append(rel_path)
+    unused_files['tests'].extend(project_snapshot.select_files(snapshot, ['test'], extensions=('.js', '.jsx')))
     
     return unused_files
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Identify files that are clearly unused (examples, tests, backups, debug).')
+    project_snapshot.add_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     print("=" * 80)
     print("CONSERVATIVE UNUSED FILE FINDER")
     print("Only identifies files that are CLEARLY unused")
     print("=" * 80)
     
-    unused = find_obviously_unused_files()
+    snapshot = project_snapshot.open_snapshot(PROJECT_ROOT, args.snapshot) if args.snapshot else None
+    unused = find_obviously_unused_files(snapshot)
     
     total = sum(len(files) for files in unused.values())
     
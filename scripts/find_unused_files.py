@@ -6,9 +6,18 @@ Analyzes imports and identifies files that are never referenced.
 
 import os
 import re
+import sys
 import json
+import hashlib
+import argparse
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from array import array
+
+import profiling
+import project_snapshot
 
 # Project root
 PROJECT_ROOT = '/Users/henry/Solidi/SolidiMobileApp4'
@@ -27,6 +36,10 @@ ENTRY_POINTS = [
 # Directories to scan
 SCAN_DIRS = ['src', '.']
 
+# On-disk cache of per-file imports and resolved edges
+CACHE_FILE = os.path.join(PROJECT_ROOT, '.find_unused_files_cache.json')
+CACHE_VERSION = 3
+
 # Directories to ignore
 IGNORE_DIRS = {
     'node_modules',
@@ -38,58 +51,105 @@ IGNORE_DIRS = {
     'backup'
 }
 
+# Ignored directories re-enabled with --include; the project snapshot must walk them
+INCLUDED_DIRS = set()
+
+# Index of the scanned tree, built once by build_file_index
+_file_index = None
+
+def build_file_index(snapshot=None, scan_dirs=None, ignore_dirs=None, included_dirs=None):
+    """
+    Index the scanned directories from a project snapshot (walking the tree
+    if none is given). The directory settings default to SCAN_DIRS,
+    IGNORE_DIRS and INCLUDED_DIRS.
+    
+    Returns a dict with every file path (relative to PROJECT_ROOT), the
+    JavaScript files in walk order, and their (size, mtime_ns) stats, so
+    import resolution and the parse cache never need to touch the disk.
+    """
+    scan_dirs = SCAN_DIRS if scan_dirs is None else scan_dirs
+    ignore_dirs = IGNORE_DIRS if ignore_dirs is None else ignore_dirs
+    included_dirs = INCLUDED_DIRS if included_dirs is None else included_dirs
+    if snapshot is None:
+        snapshot = project_snapshot.build_snapshot(PROJECT_ROOT, project_snapshot.SKIP_DIRS - included_dirs)
+    
+    files = project_snapshot.select_files(snapshot, scan_dirs, ignore_dirs)
+    js_files = [f for f in files if f.endswith('.js') or f.endswith('.jsx')]
+    stats = {f: snapshot['files'][f] for f in js_files}
+    
+    return {'files': frozenset(files), 'js_files': js_files, 'stats': stats}
+
+def set_file_index(index):
+    """Install the snapshot used by resolve_import_path"""
+    global _file_index
+    _file_index = index
+    _resolve_in_index.cache_clear()
+
+def get_file_index():
+    """Current snapshot, walking the tree on first use"""
+    if _file_index is None:
+        set_file_index(build_file_index())
+    return _file_index
+
 def find_all_js_files():
     """Find all JavaScript files in the project"""
-    js_files = []
+    return list(get_file_index()['js_files'])
+
+# Cycles through these files are listed first in the --cycles report
+CYCLE_FOCUS_FILES = ['src/application/data/AppState.js']
+
+# Jest's default testMatch: files in __tests__ dirs, and *.test.js / *.spec.js
+# (JavaScript only, like the files this script indexes)
+JEST_TEST_FILE = re.compile(r'(?:^|/)__tests__/.+\.jsx?$|(?:^|/)(?:[^/]*\.)?(?:test|spec)\.jsx?$')
+
+# Apps with their own package.json and Jest setup; their tests are not the root app's
+SEPARATE_JEST_DIRS = ('web',)
+
+# Changing one of these can affect every test
+RUN_ALL_TESTS_FILES = {
+    'package.json', 'package-lock.json', 'yarn.lock', 'jest.config.js',
+    'babel.config.js', 'tsconfig.json', 'metro.config.js',
+}
+
+# Patterns to match various import styles (name, pattern)
+IMPORT_PATTERNS = [
+    # import ... from '...'
+    ('import from', r"import\s+.*?\s+from\s+['\"]([^'\"]+)['\"]"),
+    # import '...'
+    ('import', r"import\s+['\"]([^'\"]+)['\"]"),
+    # require('...')
+    ('require', r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)"),
+    # require.resolve('...')
+    ('require.resolve', r"require\.resolve\s*\(\s*['\"]([^'\"]+)['\"]\s*\)"),
+    # export {...} from '...' / export * from '...' (re-exports, e.g. the MainPanel screen index)
+    ('export from', r"export\s+(?:\*(?:\s+as\s+\w+)?|\{[^}]*\})\s*from\s+['\"]([^'\"]+)['\"]"),
+]
+
+def extract_imports_from_content(content):
+    """Extract all imports and requires from JavaScript source text"""
+    imports = set()
     
-    for scan_dir in SCAN_DIRS:
-        full_path = os.path.join(PROJECT_ROOT, scan_dir)
-        if not os.path.exists(full_path):
-            continue
-            
-        for root, dirs, files in os.walk(full_path):
-            # Remove ignored directories from search
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-            
-            for file in files:
-                if file.endswith('.js') or file.endswith('.jsx'):
-                    file_path = os.path.join(root, file)
-                    # Make path relative to project root
-                    rel_path = os.path.relpath(file_path, PROJECT_ROOT)
-                    js_files.append(rel_path)
+    with profiling.phase('regex'):
+        for name, pattern in IMPORT_PATTERNS:
+            matches = 0
+            for match in re.finditer(pattern, content, re.MULTILINE):
+                import_path = match.group(1)
+                imports.add(import_path)
+                matches += 1
+            profiling.count_matches(name, matches)
     
-    return js_files
+    return imports
 
 def extract_imports_from_file(file_path):
     """Extract all imports and requires from a JavaScript file"""
-    imports = set()
-    
     try:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             content = f.read()
-        
-        # Patterns to match various import styles
-        patterns = [
-            # import ... from '...'
-            r"import\s+.*?\s+from\s+['\"]([^'\"]+)['\"]",
-            # import '...'
-            r"import\s+['\"]([^'\"]+)['\"]",
-            # require('...')
-            r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)",
-            # require.resolve('...')
-            r"require\.resolve\s*\(\s*['\"]([^'\"]+)['\"]\s*\)",
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
-                import_path = match.group(1)
-                imports.add(import_path)
-    
     except Exception as e:
         print(f"Warning: Could not read {file_path}: {e}")
+        return set()
     
-    return imports
+    return extract_imports_from_content(content)
 
 def resolve_import_path(import_path, from_file):
     """Resolve an import path to an actual file path"""
@@ -100,16 +160,21 @@ def resolve_import_path(import_path, from_file):
             return None
     
     # Get directory of the importing file
-    from_dir = os.path.dirname(os.path.join(PROJECT_ROOT, from_file))
+    return _resolve_in_index(os.path.dirname(from_file), import_path)
+
+@lru_cache(maxsize=65536)
+def _resolve_in_index(from_dir, import_path):
+    """Resolve an import against the file index; memoized per (directory, specifier)"""
+    files = get_file_index()['files']
     
-    # Resolve the import path
+    # Resolve the import path (relative to PROJECT_ROOT)
     if import_path.startswith('.'):
         resolved = os.path.normpath(os.path.join(from_dir, import_path))
     elif import_path.startswith('/'):
-        resolved = os.path.normpath(import_path)
+        resolved = os.path.relpath(os.path.normpath(import_path), PROJECT_ROOT)
     else:
         # Try resolving from project root
-        resolved = os.path.normpath(os.path.join(PROJECT_ROOT, import_path))
+        resolved = os.path.normpath(import_path)
     
     # Try various extensions and index files
     candidates = [
@@ -123,15 +188,131 @@ def resolve_import_path(import_path, from_file):
     ]
     
     for candidate in candidates:
-        if os.path.isfile(candidate):
-            rel_path = os.path.relpath(candidate, PROJECT_ROOT)
-            return rel_path
+        if candidate in files:
+            return candidate
     
     return None
 
-def build_dependency_graph():
-    """Build a graph of which files import which"""
+def load_parse_cache():
+    """Load the on-disk parse cache, or an empty one if missing/stale"""
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {'version': CACHE_VERSION, 'file_set': None, 'files': {}}
+    
+    if cache.get('version') != CACHE_VERSION:
+        return {'version': CACHE_VERSION, 'file_set': None, 'files': {}}
+    
+    return cache
+
+def save_parse_cache(cache):
+    """Write the parse cache atomically so an interrupted run cannot corrupt it"""
+    tmp_file = CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, CACHE_FILE)
+
+def file_set_signature(all_files):
+    """Fingerprint of the scanned file set; resolved edges depend on it"""
+    return hashlib.sha1('\n'.join(sorted(all_files)).encode('utf-8')).hexdigest()
+
+# Set in each worker process (and in-process for serial runs) by init_parse_worker
+_worker_known_files = frozenset()
+
+def init_parse_worker(project_root, index, profile=False):
+    """Give a parse worker the project root and the file index snapshot"""
+    global PROJECT_ROOT, _worker_known_files
+    PROJECT_ROOT = project_root
+    if profile:
+        # Forked workers inherit the parent's numbers; start from zero
+        profiling.enable()
+        profiling.reset()
+    if index is not _file_index:
+        set_file_index(index)
+    _worker_known_files = frozenset(index['js_files'])
+
+def resolve_file_edges(file, imports):
+    """Resolve a file's imports to the scanned files it depends on"""
+    edges = set()
+    with profiling.phase('resolve'):
+        for import_path in imports:
+            resolved = resolve_import_path(import_path, file)
+            if resolved and resolved in _worker_known_files:
+                edges.add(resolved)
+    return sorted(edges)
+
+def parse_file_entry(task):
+    """
+    Return (file, entry, status) with an up-to-date cache entry for one file.
+    
+    Runs in worker processes. The size and mtime come from the file index;
+    when they match the cache entry the file is not read at all. Otherwise
+    the content is hashed, and an unchanged hash (e.g. after a touch or
+    checkout) still reuses the cached imports.
+    Status is 'hit', 'parsed' or 'error'.
+    """
+    file, (size, mtime), entry, edges_valid = task
+    file_path = os.path.join(PROJECT_ROOT, file)
+    
+    try:
+        if not (entry and entry['size'] == size and entry['mtime'] == mtime):
+            with profiling.timed_file(file) as record:
+                with profiling.phase('read'):
+                    with open(file_path, 'rb') as f:
+                        raw = f.read()
+                record['bytes'] = len(raw)
+                with profiling.phase('hash'):
+                    digest = hashlib.sha1(raw).hexdigest()
+                if entry and entry['hash'] == digest:
+                    entry = dict(entry, size=size, mtime=mtime)
+                else:
+                    imports = extract_imports_from_content(raw.decode('utf-8', errors='ignore'))
+                    entry = {
+                        'size': size,
+                        'mtime': mtime,
+                        'hash': digest,
+                        'imports': sorted(imports),
+                        'edges': resolve_file_edges(file, imports),
+                    }
+                    return file, entry, 'parsed'
+    except OSError as e:
+        return file, f"Could not read {file_path}: {e}", 'error'
+    
+    if not edges_valid or entry['edges'] is None:
+        entry = dict(entry, edges=resolve_file_edges(file, entry['imports']))
+    return file, entry, 'hit'
+
+def parse_file_entry_in_worker(task):
+    """parse_file_entry plus the profile data the worker recorded for it"""
+    return parse_file_entry(task), profiling.drain()
+
+def parse_files(tasks, index, jobs):
+    """Run parse_file_entry over all tasks, in a process pool when jobs > 1"""
+    if jobs <= 1 or len(tasks) < 2:
+        init_parse_worker(PROJECT_ROOT, index)
+        return [parse_file_entry(task) for task in tasks]
+    
+    # A few chunks per worker keeps the pool balanced without per-file IPC
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_parse_worker,
+                             initargs=(PROJECT_ROOT, index, profiling.enabled)) as executor:
+        for result, profile in executor.map(parse_file_entry_in_worker, tasks, chunksize=chunksize):
+            profiling.merge(profile)
+            results.append(result)
+    return results
+
+def build_dependency_graph(use_cache=True, jobs=1, snapshot=None, file_imports=None):
+    """
+    Build a graph of which files import which. If a file_imports dict is
+    given, it is filled with each file's raw import specifiers.
+    """
     print("🔍 Scanning all JavaScript files...")
+    # One walk of the tree (or a shared snapshot); every later lookup is served from the index
+    with profiling.phase('walk'):
+        index = build_file_index(snapshot)
+    set_file_index(index)
     all_files = find_all_js_files()
     print(f"   Found {len(all_files)} JavaScript files")
     
@@ -139,22 +320,47 @@ def build_dependency_graph():
     dependency_graph = defaultdict(set)
     reverse_graph = defaultdict(set)  # Which files import this file
     
-    for file in all_files:
-        file_path = os.path.join(PROJECT_ROOT, file)
-        imports = extract_imports_from_file(file_path)
+    with profiling.phase('cache load'):
+        cache = load_parse_cache() if use_cache else {'version': CACHE_VERSION, 'file_set': None, 'files': {}}
+    signature = file_set_signature(index['files'])
+    # Resolved edges are only reusable if no file was added or removed
+    edges_valid = cache['file_set'] == signature
+    cache_files = cache['files']
+    stats = {'hit': 0, 'parsed': 0, 'error': 0}
+    
+    tasks = [(file, index['stats'][file], cache_files.get(file), edges_valid) for file in all_files]
+    if jobs > 1:
+        print(f"   Parsing with {jobs} worker processes")
+    
+    for file, entry, status in parse_files(tasks, index, jobs):
+        stats[status] += 1
+        profiling.count(f'cache {status}')
+        if status == 'error':
+            print(f"Warning: {entry}")
+            continue
+        cache_files[file] = entry
+        if file_imports is not None:
+            file_imports[file] = entry['imports']
         
-        for import_path in imports:
-            resolved = resolve_import_path(import_path, file)
-            if resolved and resolved in all_files:
-                dependency_graph[file].add(resolved)
-                reverse_graph[resolved].add(file)
+        for resolved in entry['edges']:
+            dependency_graph[file].add(resolved)
+            reverse_graph[resolved].add(file)
     
     print(f"   Built dependency graph with {len(dependency_graph)} files that import others")
     
+    if use_cache:
+        print(f"   Parse cache: {stats['hit']} reused, {stats['parsed']} parsed")
+        # Drop entries for files that no longer exist
+        current = set(all_files)
+        cache['files'] = {f: e for f, e in cache_files.items() if f in current}
+        cache['file_set'] = signature
+        with profiling.phase('cache save'):
+            save_parse_cache(cache)
+    
     return all_files, dependency_graph, reverse_graph
 
-def find_entry_points(all_files):
-    """Find all entry point files"""
+def select_entry_points(all_files):
+    """Entry point files present in all_files"""
     entry_files = set()
     
     # Add explicit entry points
@@ -166,32 +372,534 @@ def find_entry_points(all_files):
         if src_entry in all_files:
             entry_files.add(src_entry)
     
+    return entry_files
+
+def find_entry_points(all_files):
+    """Find all entry point files"""
+    entry_files = select_entry_points(all_files)
+    
     print(f"\n📍 Found {len(entry_files)} entry points:")
     for entry in sorted(entry_files):
         print(f"   - {entry}")
     
     return entry_files
 
-def find_used_files(entry_files, dependency_graph):
-    """Find all files that are reachable from entry points"""
-    used = set()
-    to_visit = list(entry_files)
+def build_compact_graph(all_files, dependency_graph):
+    """
+    Pack the dependency graph into integer IDs and CSR adjacency arrays.
+    
+    Files are interned in sorted order. The imports of file i are
+    targets[offsets[i]:offsets[i + 1]], and the importers of file i are
+    reverse_targets[reverse_offsets[i]:reverse_offsets[i + 1]]. Each edge
+    costs 4 bytes per direction instead of a set entry holding a path string.
+    """
+    files = set(all_files).union(dependency_graph)
+    for imported_files in dependency_graph.values():
+        files.update(imported_files)
+    files = sorted(files)
+    ids = {file: i for i, file in enumerate(files)}
+    count = len(files)
+    
+    offsets = array('I', [0]) * (count + 1)
+    targets = array('I')
+    in_degree = array('I', [0]) * (count + 1)
+    for i, file in enumerate(files):
+        imported_ids = sorted(ids[imported] for imported in dependency_graph.get(file, ()) if imported in ids)
+        targets.extend(imported_ids)
+        offsets[i + 1] = len(targets)
+        for target in imported_ids:
+            in_degree[target + 1] += 1
+    
+    # Counting sort of the forward edges gives the reverse adjacency
+    reverse_offsets = array('I', [0]) * (count + 1)
+    for i in range(count):
+        reverse_offsets[i + 1] = reverse_offsets[i] + in_degree[i + 1]
+    reverse_targets = array('I', [0]) * len(targets)
+    fill = array('I', reverse_offsets[:count])
+    for source in range(count):
+        for k in range(offsets[source], offsets[source + 1]):
+            target = targets[k]
+            reverse_targets[fill[target]] = source
+            fill[target] += 1
+    
+    return {
+        'files': files,
+        'ids': ids,
+        'offsets': offsets,
+        'targets': targets,
+        'reverse_offsets': reverse_offsets,
+        'reverse_targets': reverse_targets,
+    }
+
+def new_bitset(graph):
+    """Empty visited set with one bit per file in the compact graph"""
+    return bytearray((len(graph['files']) + 7) // 8)
+
+def reachable_bitset(graph, root_ids, reverse=False, blocked=None):
+    """
+    Mark every file reachable from root_ids (following imports, or
+    importers when reverse=True) in a bitset and return it. Files set in
+    the `blocked` bitset are neither entered nor returned.
+    """
+    if reverse:
+        offsets, targets = graph['reverse_offsets'], graph['reverse_targets']
+    else:
+        offsets, targets = graph['offsets'], graph['targets']
+    visited = new_bitset(graph) if blocked is None else bytearray(blocked)
+    to_visit = []
+    for root in root_ids:
+        if not visited[root >> 3] & (1 << (root & 7)):
+            visited[root >> 3] |= 1 << (root & 7)
+            to_visit.append(root)
     
     while to_visit:
         current = to_visit.pop()
-        if current in used:
-            continue
-        
-        used.add(current)
-        
-        # Add all files that this file imports
-        if current in dependency_graph:
-            for imported in dependency_graph[current]:
-                if imported not in used:
-                    to_visit.append(imported)
+        for k in range(offsets[current], offsets[current + 1]):
+            target = targets[k]
+            if not visited[target >> 3] & (1 << (target & 7)):
+                visited[target >> 3] |= 1 << (target & 7)
+                to_visit.append(target)
     
+    if blocked is not None:
+        for k, byte in enumerate(blocked):
+            visited[k] &= ~byte
+    return visited
+
+def bitset_ids(bitset):
+    """File IDs whose bit is set"""
+    for byte_index, byte in enumerate(bitset):
+        while byte:
+            low = byte & -byte
+            yield (byte_index << 3) + low.bit_length() - 1
+            byte ^= low
+
+def reachable_files(graph, entry_sets):
+    """Files reachable from each of several entry-point sets, sharing one compact graph"""
+    ids = graph['ids']
+    files = graph['files']
+    results = []
+    for entry_files in entry_sets:
+        visited = reachable_bitset(graph, [ids[f] for f in entry_files if f in ids])
+        results.append({files[i] for i in bitset_ids(visited)})
+    return results
+
+def find_used_files(entry_files, dependency_graph, graph=None):
+    """Find all files that are reachable from entry points"""
+    if graph is None:
+        graph = build_compact_graph(list(entry_files), dependency_graph)
+    used = reachable_files(graph, [entry_files])[0]
+    # Entry points are used even if they are not part of the graph
+    used.update(entry_files)
     return used
 
+def build_usage_index(graph, entry_files):
+    """
+    Precompute answers to "why is this file used" and "what becomes dead if
+    I delete it" over the compact graph, in O(files + imports).
+    
+    A multi-source BFS from the entry points gives every reachable file its
+    parent on a shortest import chain. The dominator tree (Cooper, Harvey &
+    Kennedy's iterative algorithm, with a virtual root above all entry
+    points) is laid out in preorder, so the files a given file dominates
+    form one contiguous slice of `order`.
+    """
+    count = len(graph['files'])
+    offsets, targets = graph['offsets'], graph['targets']
+    reverse_offsets, reverse_targets = graph['reverse_offsets'], graph['reverse_targets']
+    entry_ids = sorted({graph['ids'][f] for f in entry_files if f in graph['ids']})
+    entry_set = set(entry_ids)
+    root = count  # virtual root importing every entry point
+    
+    # Shortest import chains: BFS parents (-1 for entry points, -2 unreachable)
+    parents = array('i', [-2]) * count
+    queue = list(entry_ids)
+    for entry in entry_ids:
+        parents[entry] = -1
+    for current in queue:
+        for k in range(offsets[current], offsets[current + 1]):
+            target = targets[k]
+            if parents[target] == -2:
+                parents[target] = current
+                queue.append(target)
+    
+    # Postorder numbers from an iterative DFS below the virtual root
+    postorder = array('i', [-1]) * (count + 1)
+    rpo = []
+    seen = bytearray(count + 1)
+    seen[root] = 1
+    stack = [(root, iter(entry_ids))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if not seen[child]:
+                seen[child] = 1
+                stack.append((child, iter(targets[offsets[child]:offsets[child + 1]])))
+                break
+        else:
+            stack.pop()
+            postorder[node] = len(rpo)
+            rpo.append(node)
+    rpo.reverse()
+    
+    # Immediate dominators; -1 for unreachable files
+    idom = array('i', [-1]) * (count + 1)
+    idom[root] = root
+    changed = True
+    while changed:
+        changed = False
+        for node in rpo[1:]:
+            new_idom = root if node in entry_set else -1
+            for k in range(reverse_offsets[node], reverse_offsets[node + 1]):
+                pred = reverse_targets[k]
+                if idom[pred] == -1:
+                    continue
+                if new_idom == -1:
+                    new_idom = pred
+                    continue
+                # Walk both fingers up the tree until they meet
+                a, b = pred, new_idom
+                while a != b:
+                    while postorder[a] < postorder[b]:
+                        a = idom[a]
+                    while postorder[b] < postorder[a]:
+                        b = idom[b]
+                new_idom = a
+            if idom[node] != new_idom:
+                idom[node] = new_idom
+                changed = True
+    
+    # Dominator tree in preorder: node's subtree is order[start[node]:end[node]]
+    children = defaultdict(list)
+    for node in rpo[1:]:
+        children[idom[node]].append(node)
+    order = array('I')
+    start = array('i', [-1]) * (count + 1)
+    end = array('i', [-1]) * (count + 1)
+    stack = [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            end[node] = len(order)
+            continue
+        start[node] = len(order)
+        if node != root:
+            order.append(node)
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children[node]))
+    
+    return {
+        'graph': graph,
+        'parents': parents,
+        'idom': idom,
+        'order': order,
+        'start': start,
+        'end': end,
+    }
+
+def import_chain(usage, file):
+    """
+    Shortest chain of imports from an entry point to file, as a list of
+    paths starting at the entry point, or None if file is unreachable.
+    """
+    ids = usage['graph']['ids']
+    files = usage['graph']['files']
+    parents = usage['parents']
+    node = ids.get(file)
+    if node is None or parents[node] == -2:
+        return None
+    chain = []
+    while node != -1:
+        chain.append(files[node])
+        node = parents[node]
+    chain.reverse()
+    return chain
+
+def dead_if_deleted(usage, file):
+    """Files that become unreachable if file is deleted (those it dominates), sorted"""
+    node = usage['graph']['ids'].get(file)
+    if node is None or usage['idom'][node] == -1:
+        return []
+    files = usage['graph']['files']
+    order = usage['order']
+    # order[start] is the file itself
+    return sorted(files[i] for i in order[usage['start'][node] + 1:usage['end'][node]])
+
+def strongly_connected_components(graph):
+    """
+    Import cycles as lists of file IDs: every strongly connected component
+    with more than one file, or a file importing itself. Iterative Tarjan,
+    O(files + imports).
+    """
+    offsets, targets = graph['offsets'], graph['targets']
+    count = len(graph['files'])
+    index = array('i', [-1]) * count
+    lowlink = array('i', [0]) * count
+    on_stack = bytearray(count)
+    stack = []
+    components = []
+    next_index = 0
+    
+    for start in range(count):
+        if index[start] != -1:
+            continue
+        work = [(start, offsets[start])]
+        index[start] = lowlink[start] = next_index
+        next_index += 1
+        stack.append(start)
+        on_stack[start] = 1
+        while work:
+            node, k = work[-1]
+            if k < offsets[node + 1]:
+                work[-1] = (node, k + 1)
+                target = targets[k]
+                if index[target] == -1:
+                    index[target] = lowlink[target] = next_index
+                    next_index += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append((target, offsets[target]))
+                elif on_stack[target] and index[target] < lowlink[node]:
+                    lowlink[node] = index[target]
+                continue
+            
+            work.pop()
+            if work and lowlink[node] < lowlink[work[-1][0]]:
+                lowlink[work[-1][0]] = lowlink[node]
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                self_import = node in targets[offsets[node]:offsets[node + 1]]
+                if len(component) > 1 or self_import:
+                    components.append(sorted(component))
+    
+    return components
+
+def feedback_edges(graph, component):
+    """
+    Imports to remove so a cycle component becomes acyclic.
+    
+    Eades, Lin & Smyth's greedy ordering, in time linear in the component's
+    size: sinks go to the end and sources to the front, otherwise the file
+    with the largest (outgoing - incoming) imports goes next. The imports
+    pointing backwards in that order break every cycle. Finding the true
+    minimum is NP-hard; this is a small set, usually close to it.
+    """
+    offsets, targets = graph['offsets'], graph['targets']
+    reverse_offsets, reverse_targets = graph['reverse_offsets'], graph['reverse_targets']
+    members = set(component)
+    out_edges = {u: [targets[k] for k in range(offsets[u], offsets[u + 1]) if targets[k] in members and targets[k] != u]
+                 for u in component}
+    in_edges = {u: [reverse_targets[k] for k in range(reverse_offsets[u], reverse_offsets[u + 1])
+                    if reverse_targets[k] in members and reverse_targets[k] != u]
+                for u in component}
+    out_degree = {u: len(out_edges[u]) for u in component}
+    in_degree = {u: len(in_edges[u]) for u in component}
+    
+    # Buckets of remaining files by out - in degree; sinks and sources kept apart
+    buckets = defaultdict(set)
+    sinks, sources = [], []
+    
+    def place(u):
+        if out_degree[u] == 0:
+            sinks.append(u)
+        elif in_degree[u] == 0:
+            sources.append(u)
+        else:
+            buckets[out_degree[u] - in_degree[u]].add(u)
+    
+    for u in component:
+        place(u)
+    remaining = set(component)
+    front, back = [], []
+    top = len(component)
+    
+    def remove(u):
+        # Sinks and sources may be listed twice; they are skipped once removed
+        remaining.discard(u)
+        for v in out_edges[u]:
+            if v in remaining:
+                buckets[out_degree[v] - in_degree[v]].discard(v)
+                in_degree[v] -= 1
+                place(v)
+        for v in in_edges[u]:
+            if v in remaining:
+                buckets[out_degree[v] - in_degree[v]].discard(v)
+                out_degree[v] -= 1
+                place(v)
+    
+    while remaining:
+        if sinks:
+            u = sinks.pop()
+            if u in remaining:
+                back.append(u)
+                remove(u)
+        elif sources:
+            u = sources.pop()
+            if u in remaining:
+                front.append(u)
+                remove(u)
+        else:
+            # A removal raises a neighbour's out - in by at most one
+            while not buckets[top]:
+                top -= 1
+            u = buckets[top].pop()
+            front.append(u)
+            remove(u)
+            top = min(len(component), top + 1)
+    
+    position = {u: i for i, u in enumerate(front + back[::-1])}
+    return sorted((u, v) for u in component for v in out_edges[u] if position[v] < position[u]) + \
+        [(u, u) for u in component if u in targets[offsets[u]:offsets[u + 1]]]
+
+def shortest_cycle(graph, component, node):
+    """Shortest import cycle through node inside its component, as file IDs"""
+    offsets, targets = graph['offsets'], graph['targets']
+    members = set(component)
+    parents = {node: None}
+    queue = [node]
+    for current in queue:
+        for k in range(offsets[current], offsets[current + 1]):
+            target = targets[k]
+            if target == node:
+                cycle = [current]
+                while parents[cycle[-1]] is not None:
+                    cycle.append(parents[cycle[-1]])
+                return cycle[::-1] + [node]
+            if target in members and target not in parents:
+                parents[target] = current
+                queue.append(target)
+    return None
+
+def print_cycles(graph):
+    """Answer --cycles"""
+    files = graph['files']
+    ids = graph['ids']
+    components = strongly_connected_components(graph)
+    focus = {ids[file] for file in CYCLE_FOCUS_FILES if file in ids}
+    components.sort(key=lambda c: (not focus.intersection(c), -len(c), files[c[0]]))
+    
+    print("\n" + "=" * 80)
+    print("IMPORT CYCLES")
+    print("=" * 80)
+    if not components:
+        print("✅ No import cycles")
+        return
+    
+    total_cut = 0
+    print(f"🔁 {len(components)} import cycle(s), {sum(len(c) for c in components)} files involved")
+    for number, component in enumerate(components, 1):
+        cut = feedback_edges(graph, component)
+        total_cut += len(cut)
+        print(f"\n{number}. {len(component)} file(s); remove {len(cut)} import(s) to break it")
+        for node in sorted(focus.intersection(component)):
+            cycle = shortest_cycle(graph, component, node)
+            print(f"   Shortest cycle through {files[node]}:")
+            print(f"      {' → '.join(files[i] for i in cycle)}")
+        print("   Imports to remove:")
+        for importer, imported in cut:
+            print(f"      {files[importer]} → {files[imported]}")
+        print("   Files:")
+        for node in component:
+            print(f"      - {files[node]}")
+    print(f"\n📊 {total_cut} import(s) to remove in total to make the graph acyclic")
+
+def importers_of_paths(paths, file_imports):
+    """
+    Files with an import that resolves to one of paths, for changed files
+    that are not in the graph (deleted files, or non-JS files such as JSON).
+    """
+    index = get_file_index()
+    set_file_index(dict(index, files=index['files'] | set(paths)))
+    importers = set()
+    try:
+        for file, imports in file_imports.items():
+            if any(resolve_import_path(import_path, file) in paths for import_path in imports):
+                importers.add(file)
+    finally:
+        set_file_index(index)
+    return importers
+
+def is_jest_test(file):
+    """Whether `npx jest` in the project root runs this file as a test"""
+    return bool(JEST_TEST_FILE.search(file)) and file.split('/', 1)[0] not in SEPARATE_JEST_DIRS
+
+def affected_tests(graph, changed_files, file_imports):
+    """
+    Jest test files that import (directly or transitively) any changed file.
+    
+    Returns (tests, run_all). Changed files outside the graph are mapped to
+    the files importing them; run_all is True when a changed file (package
+    or Jest/Babel config) can affect every test.
+    """
+    ids = graph['ids']
+    files = graph['files']
+    if any(os.path.basename(file) in RUN_ALL_TESTS_FILES and os.path.dirname(file) == '' for file in changed_files):
+        return sorted(f for f in files if is_jest_test(f)), True
+    
+    roots = {file for file in changed_files if file in ids}
+    outside = {file for file in changed_files if file not in ids}
+    if outside:
+        roots |= importers_of_paths(outside, file_imports)
+    
+    importers = reachable_bitset(graph, [ids[file] for file in roots], reverse=True)
+    return sorted(files[i] for i in bitset_ids(importers) if is_jest_test(files[i])), False
+
+def print_affected_tests(graph, changed_files, file_imports, output_file=None):
+    """Answer --affected-tests, optionally writing the result as JSON for Jest"""
+    changed_files = sorted(set(map(project_relative, changed_files)))
+    tests, run_all = affected_tests(graph, changed_files, file_imports)
+    
+    print(f"\n🧪 {len(changed_files)} changed file(s) affect {len(tests)} Jest test file(s)")
+    if run_all:
+        print("   ⚠️  A package or build config file changed; every test is affected")
+    for test in tests:
+        print(f"   - {test}")
+    if tests:
+        print(f"\n   Run with: npx jest --runTestsByPath {' '.join(tests)}")
+    
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump({'changed': changed_files, 'run_all': run_all, 'tests': tests}, f, indent=2)
+        print(f"\n📄 Affected tests written to: {output_file}")
+        print("   In jest.config.js: testMatch: require('./<file>').tests.map(t => '<rootDir>/' + t)")
+
+def project_relative(path):
+    """A path given on the command line, relative to PROJECT_ROOT"""
+    if os.path.isabs(path):
+        path = os.path.relpath(path, PROJECT_ROOT)
+    return os.path.normpath(path)
+
+def print_usage_queries(usage, why_files, deleted_files):
+    """Answer --why and --if-deleted"""
+    for file in map(project_relative, why_files):
+        print(f"\n❓ Why is {file} used?")
+        chain = import_chain(usage, file)
+        if chain is None:
+            print("   ❌ Not reachable from any entry point")
+        elif len(chain) == 1:
+            print("   📍 It is an entry point")
+        else:
+            print(f"   {chain[0]}")
+            for depth, step in enumerate(chain[1:]):
+                print(f"   {'   ' * depth}└─ {step}")
+    
+    for file in map(project_relative, deleted_files):
+        if file not in usage['graph']['ids']:
+            print(f"\n🗑️  {file} is not a scanned JavaScript file")
+            continue
+        if import_chain(usage, file) is None:
+            print(f"\n🗑️  {file} is not reachable; deleting it affects no used file")
+            continue
+        dead = dead_if_deleted(usage, file)
+        print(f"\n🗑️  Deleting {file} would leave {len(dead)} more files unreachable")
+        for dead_file in dead:
+            print(f"   - {dead_file}")
+
 def categorize_file(file_path):
     """Categorize a file by its path"""
     if 'example' in file_path.lower():
@@ -215,13 +923,82 @@ def categorize_file(file_path):
     else:
         return 'other'
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Find unused JavaScript files in the Solidi Mobile App project.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Ignore and do not update the parse cache ({os.path.basename(CACHE_FILE)})')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Parse files in N worker processes (0 = one per CPU core)')
+    parser.add_argument('--include', action='append', default=[], metavar='DIR',
+                        help=f'Scan a normally ignored directory, e.g. node_modules (ignored: {", ".join(sorted(IGNORE_DIRS))})')
+    parser.add_argument('--pre-commit', action='store_true',
+                        help='Only report files the staged changes orphan or revive (for a git pre-commit hook)')
+    parser.add_argument('--fail-on-orphans', action='store_true',
+                        help='With --pre-commit, exit with status 1 if the commit leaves files unreachable')
+    parser.add_argument('--affected-tests', nargs='*', metavar='FILE',
+                        help='List the Jest tests that import any of the changed FILEs (- reads them from stdin), '
+                             'e.g. git diff --name-only main | find_unused_files.py --affected-tests -')
+    parser.add_argument('--tests-output', metavar='FILE',
+                        help='With --affected-tests, also write {changed, run_all, tests} as JSON to FILE')
+    parser.add_argument('--cycles', action='store_true',
+                        help='Report every import cycle with the imports to remove to break it (instead of the report)')
+    parser.add_argument('--why', action='append', default=[], metavar='FILE',
+                        help='Show the shortest import chain from an entry point to FILE (instead of the report)')
+    parser.add_argument('--if-deleted', action='append', default=[], metavar='FILE',
+                        help='List the files that become unreachable if FILE is deleted (instead of the report)')
+    profiling.add_arguments(parser)
+    project_snapshot.add_arguments(parser)
+    import watch_analysis
+    watch_analysis.add_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
 def main():
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
+    if args.affected_tests is not None:
+        # Tests live in __tests__, which the unused-file report ignores
+        args.include.append('__tests__')
+        if '-' in args.affected_tests:
+            args.affected_tests.remove('-')
+            args.affected_tests.extend(line.strip() for line in sys.stdin if line.strip())
+    IGNORE_DIRS.difference_update(args.include)
+    INCLUDED_DIRS.update(args.include)
+    
+    if args.pre_commit:
+        # Imported here: precommit_check imports this module back
+        import precommit_check
+        status = precommit_check.run_pre_commit(PROJECT_ROOT, SCAN_DIRS, IGNORE_DIRS, args.fail_on_orphans)
+        if status:
+            sys.exit(status)
+        return
+    
+    if args.watch:
+        # Imported here: watch_analysis imports this module back. When run
+        # as a script, it drives a separate imported copy of this module,
+        # so the --include settings are passed explicitly.
+        import watch_analysis
+        watch_analysis.watch(PROJECT_ROOT, args.interval, track_apis=False,
+                             port=args.port, state_file=args.state_file,
+                             scan_dirs=SCAN_DIRS, ignore_dirs=set(IGNORE_DIRS), included_dirs=set(INCLUDED_DIRS))
+        return
+    
     print("=" * 80)
     print("UNUSED FILE FINDER FOR SOLIDI MOBILE APP")
     print("=" * 80)
     
     # Build dependency graph
-    all_files, dependency_graph, reverse_graph = build_dependency_graph()
+    snapshot = None
+    if args.snapshot:
+        snapshot = project_snapshot.open_snapshot(PROJECT_ROOT, args.snapshot, project_snapshot.SKIP_DIRS - INCLUDED_DIRS)
+    file_imports = {}
+    all_files, dependency_graph, reverse_graph = build_dependency_graph(
+        use_cache=not args.no_cache, jobs=args.jobs, snapshot=snapshot, file_imports=file_imports)
     
     # Find entry points
     entry_files = find_entry_points(all_files)
@@ -232,9 +1009,28 @@ def main():
     
     # Find all used files
     print("\n🔍 Tracing file usage from entry points...")
-    used_files = find_used_files(entry_files, dependency_graph)
+    with profiling.phase('reachability'):
+        graph = build_compact_graph(all_files, dependency_graph)
+        used_files = find_used_files(entry_files, dependency_graph, graph=graph)
     print(f"   Found {len(used_files)} files that are used")
     
+    if args.cycles:
+        with profiling.phase('cycles'):
+            print_cycles(graph)
+        return
+    
+    if args.affected_tests is not None:
+        with profiling.phase('affected tests'):
+            print_affected_tests(graph, args.affected_tests, file_imports, args.tests_output)
+        return
+    
+    if args.why or args.if_deleted:
+        with profiling.phase('usage index'):
+            usage = build_usage_index(graph, entry_files)
+        with profiling.phase('usage queries'):
+            print_usage_queries(usage, args.why, args.if_deleted)
+        return
+    
     # Find unused files
     unused_files = set(all_files) - used_files
     print(f"\n📊 Found {len(unused_files)} potentially unused files")
@@ -270,8 +1066,9 @@ def main():
         'all_unused': sorted(unused_files)
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    with profiling.phase('report write'):
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
     
     print(f"\n📄 Detailed report saved to: unused_files_report.json")
     
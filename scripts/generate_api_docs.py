@@ -4,11 +4,19 @@ Solidi Mobile App - API Documentation Generator
 Scans the codebase and generates comprehensive API documentation
 """
 
+import os
 import re
 import json
+import hashlib
+import argparse
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import profiling
+import project_snapshot
+
 # File paths to scan
 FILES_TO_SCAN = [
     'src/application/data/AppState.js',
@@ -16,63 +24,198 @@ FILES_TO_SCAN = [
     'src/application/SolidiMobileApp/components/MainPanel/components/EmailVerification/EmailVerification.js',
 ]
 
-def extract_api_calls(file_path):
-    """Extract all API calls from a JavaScript file"""
+# Repository-wide mode (--all): every source file under SRC_DIR
+SRC_DIR = 'src'
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+SKIP_DIRS = {'node_modules', '.git'}
+
+# A file without any of these substrings cannot contain an API call
+API_METHOD_NAMES = ('privateMethod', 'publicMethod')
+
+# privateMethod and publicMethod calls, optionally on a known receiver, in one pass
+API_CALL_PATTERN = re.compile(
+    r'(?:(?:this\.state|appState|this|apiClient)\.)?(privateMethod|publicMethod)'
+    r'\s*\(\s*\{[^}]*?apiRoute:\s*[\'"`]([^\'"`]+)[\'"`][^}]*?\}',
+    re.DOTALL)
+
+# Params object looked up near a call (characters searched before / after it)
+PARAMS_PATTERN = re.compile(r'params:\s*\{([^}]+)\}')
+PARAMS_WINDOW = (500, 200)
+
+# --incremental: section fingerprints and content hash of the last written docs.
+# Bump DOCS_FORMAT_VERSION whenever the rendered markdown format changes.
+DOCS_CACHE_FILE = '.api_docs_cache.json'
+DOCS_FORMAT_VERSION = 1
+
+def extract_api_calls(file_path, snapshot=None):
+    """Extract all API calls from a JavaScript file (read through the project snapshot if given)"""
     apis = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if snapshot is not None:
+            if file_path not in snapshot['files']:
+                raise FileNotFoundError(file_path)
+            with profiling.phase('read'):
+                content = project_snapshot.read_text(snapshot, file_path)
+            return extract_api_calls_from_content(content, file_path)
         
-        # Pattern to match privateMethod and publicMethod calls
-        private_pattern = r'(?:privateMethod|this\.state\.privateMethod|appState\.privateMethod|this\.privateMethod|apiClient\.privateMethod)\s*\(\s*\{[^}]*?apiRoute:\s*[\'"`]([^\'"`]+)[\'"`][^}]*?\}'
-        public_pattern = r'(?:publicMethod|this\.state\.publicMethod|appState\.publicMethod|this\.publicMethod|apiClient\.publicMethod)\s*\(\s*\{[^}]*?apiRoute:\s*[\'"`]([^\'"`]+)[\'"`][^}]*?\}'
-        
-        # Find private API calls
-        for match in re.finditer(private_pattern, content, re.DOTALL):
-            route = match.group(1)
-            # Get surrounding context
-            start = max(0, match.start() - 500)
-            end = min(len(content), match.end() + 200)
-            context = content[start:end]
+        with profiling.timed_file(file_path) as record:
+            with profiling.phase('read'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            record['bytes'] = len(content.encode('utf-8'))
             
-            # Extract params if present
-            params_match = re.search(r'params:\s*\{([^}]+)\}', context)
-            params = params_match.group(1).strip() if params_match else None
+            apis = extract_api_calls_from_content(content, file_path)
             
-            apis.append({
-                'route': route,
-                'type': 'PRIVATE',
-                'file': file_path,
-                'params': params,
-                'context': context
-            })
-        
-        # Find public API calls
-        for match in re.finditer(public_pattern, content, re.DOTALL):
-            route = match.group(1)
-            start = max(0, match.start() - 500)
-            end = min(len(content), match.end() + 200)
-            context = content[start:end]
+    except FileNotFoundError:
+        print(f"Warning: File not found: {file_path}")
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+    
+    return apis
+
+def extract_api_calls_from_content(content, file_path):
+    """
+    Extract all API calls from JavaScript source text.
+    
+    Each call records its match span and a reference to the (shared) source
+    text rather than a copy of its context; api_params() looks the params
+    up on demand.
+    """
+    apis = []
+    newlines = None
+    matches = {'PRIVATE': 0, 'PUBLIC': 0}
+    
+    with profiling.phase('regex'):
+        for match in API_CALL_PATTERN.finditer(content):
+            api_type = 'PRIVATE' if match.group(1) == 'privateMethod' else 'PUBLIC'
+            matches[api_type] += 1
             
-            params_match = re.search(r'params:\s*\{([^}]+)\}', context)
-            params = params_match.group(1).strip() if params_match else None
+            if newlines is None:
+                newlines = [m.start() for m in re.finditer('\n', content)]
             
             apis.append({
-                'route': route,
-                'type': 'PUBLIC',
+                'route': match.group(2),
+                'type': api_type,
                 'file': file_path,
-                'params': params,
-                'context': context
+                'line': bisect_right(newlines, match.start() - 1) + 1,
+                'span': match.span(),
+                'source': content,
             })
-            
-    except FileNotFoundError:
-        print(f"Warning: File not found: {file_path}")
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
     
+    for api_type, n in matches.items():
+        profiling.count_matches(f'{api_type.lower()}_pattern', n)
+    
+    # Private calls first, as the documentation has always listed them
+    apis.sort(key=lambda api: api['type'] != 'PRIVATE')
     return apis
 
+def api_params(api):
+    """
+    Params object text for an API call (or merged inventory entry), or None.
+    Computed on first use from the window around the call and cached.
+    """
+    if 'calls' in api:
+        for call in api['calls']:
+            params = api_params(call)
+            if params:
+                return params
+        return None
+    
+    if 'params' not in api:
+        start, end = api['span']
+        source = api['source']
+        before, after = PARAMS_WINDOW
+        params_match = PARAMS_PATTERN.search(source, max(0, start - before), min(len(source), end + after))
+        api['params'] = params_match.group(1).strip() if params_match else None
+    return api['params']
+
+def find_source_files(snapshot, src_dir=SRC_DIR):
+    """Every JS/TS source file under src_dir, taken from the project snapshot"""
+    return project_snapshot.select_files(snapshot, [src_dir], SKIP_DIRS, SOURCE_EXTENSIONS)
+
+def scan_file_for_apis(file_path, snapshot=None):
+    """
+    Return (file_path, apis, scanned) for one file. Files that never mention
+    privateMethod/publicMethod are rejected by a substring check before any
+    regex work (scanned is False for them).
+    """
+    try:
+        if snapshot is not None:
+            with profiling.phase('read'):
+                content = project_snapshot.read_text(snapshot, file_path)
+            if not any(name in content for name in API_METHOD_NAMES):
+                return file_path, [], False
+            return file_path, extract_api_calls_from_content(content, file_path), True
+        
+        with profiling.timed_file(file_path) as record:
+            with profiling.phase('read'):
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            record['bytes'] = len(content.encode('utf-8'))
+            
+            if not any(name in content for name in API_METHOD_NAMES):
+                return file_path, [], False
+            return file_path, extract_api_calls_from_content(content, file_path), True
+    except OSError as e:
+        print(f"Warning: Could not read {file_path}: {e}")
+        return file_path, [], False
+
+def _init_scan_worker(profile):
+    if profile:
+        # Forked workers inherit the parent's numbers; start from zero
+        profiling.enable()
+        profiling.reset()
+
+def _scan_file_in_worker(file_path):
+    return scan_file_for_apis(file_path), profiling.drain()
+
+def scan_files(files, jobs=1, snapshot=None):
+    """
+    Scan files for API calls, fanning out over a process pool when jobs > 1.
+    Serial scans read through the snapshot's content cache; workers read
+    the files themselves.
+    """
+    if jobs <= 1 or len(files) < 2:
+        return [scan_file_for_apis(file_path, snapshot) for file_path in files]
+    
+    chunksize = max(1, len(files) // (jobs * 4))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_scan_worker,
+                             initargs=(profiling.enabled,)) as executor:
+        for result, profile in executor.map(_scan_file_in_worker, files, chunksize=chunksize):
+            profiling.merge(profile)
+            results.append(result)
+    return results
+
+def merge_api_inventory(apis):
+    """
+    Deduplicate API calls by (type, route), keeping every call site.
+    
+    Each merged entry keeps the first call's fields, the member calls in
+    'calls' (api_params() takes the first one that has params) and all
+    (file, line) call sites in 'locations'.
+    """
+    inventory = {}
+    for api in apis:
+        key = (api['type'], api['route'])
+        merged = inventory.get(key)
+        if merged is None:
+            merged = inventory[key] = {
+                'route': api['route'],
+                'type': api['type'],
+                'file': api['file'],
+                'line': api['line'],
+                'calls': [],
+                'locations': [],
+            }
+        merged['calls'].append(api)
+        merged['locations'].append((api['file'], api['line']))
+    
+    for merged in inventory.values():
+        merged['locations'] = sorted(set(merged['locations']))
+    return list(inventory.values())
+
 def categorize_apis(apis):
     """Group APIs by category"""
     categories = {
@@ -111,14 +254,15 @@ def categorize_apis(apis):
     
     return categories
 
-def generate_markdown(categories):
-    """Generate markdown documentation"""
+def render_header(generated):
+    """Static documentation header; the Generated line is omitted when generated is None"""
     doc = []
     
     doc.append("# Solidi Mobile App - Complete API Documentation")
     doc.append("")
-    doc.append(f"**Generated:** {datetime.now().strftime('%B %d, %Y at %H:%M')}")
-    doc.append("")
+    if generated is not None:
+        doc.append(f"**Generated:** {generated.strftime('%B %d, %Y at %H:%M')}")
+        doc.append("")
     doc.append("## Base Configuration")
     doc.append("")
     doc.append("- **Base URL**: `https://DOMAIN/api2/v1/`")
@@ -162,53 +306,178 @@ def generate_markdown(categories):
     doc.append("---")
     doc.append("")
     
+    return doc
+
+def unique_category_apis(apis):
+    """(route, api) pairs for a category, first call per route, sorted by route"""
+    unique_apis = {}
+    for api in apis:
+        if api['route'] not in unique_apis:
+            unique_apis[api['route']] = api
+    return sorted(unique_apis.items())
+
+def render_category(category, apis, call_sites=False):
+    """Markdown lines for one category section; call_sites adds each endpoint's callers"""
+    doc = []
+    doc.append(f"## {category}")
+    doc.append("")
+    
+    for route, api in unique_category_apis(apis):
+        doc.append(f"### `{route}`")
+        doc.append("")
+        doc.append(f"- **Type**: {api['type']}")
+        doc.append(f"- **Method**: POST" if api['type'] == 'PRIVATE' else f"- **Method**: GET or POST")
+        doc.append(f"- **Endpoint**: `/api2/v1/{route}`")
+        
+        params = api_params(api)
+        if params:
+            doc.append(f"- **Parameters**:")
+            doc.append(f"  ```javascript")
+            doc.append(f"  {params}")
+            doc.append(f"  ```")
+        
+        if call_sites and api.get('locations'):
+            doc.append(f"- **Called from**:")
+            for file, line in api['locations']:
+                doc.append(f"  - `{file}:{line}`")
+        
+        doc.append("")
+    
+    return doc
+
+def generate_markdown(categories, generated=None, call_sites=False):
+    """Generate markdown documentation"""
+    doc = render_header(generated or datetime.now())
+    
     # Generate documentation for each category
     for category, apis in categories.items():
         if not apis:
             continue
-            
-        doc.append(f"## {category}")
-        doc.append("")
-        
-        # Group by unique route
-        unique_apis = {}
-        for api in apis:
-            if api['route'] not in unique_apis:
-                unique_apis[api['route']] = api
-        
-        for route, api in sorted(unique_apis.items()):
-            doc.append(f"### `{route}`")
-            doc.append("")
-            doc.append(f"- **Type**: {api['type']}")
-            doc.append(f"- **Method**: POST" if api['type'] == 'PRIVATE' else f"- **Method**: GET or POST")
-            doc.append(f"- **Endpoint**: `/api2/v1/{route}`")
-            
-            if api['params']:
-                doc.append(f"- **Parameters**:")
-                doc.append(f"  ```javascript")
-                doc.append(f"  {api['params']}")
-                doc.append(f"  ```")
-            
-            doc.append("")
+        doc.extend(render_category(category, apis, call_sites))
     
     return "\n".join(doc)
 
+def category_fingerprint(category, apis, call_sites=False):
+    """Hash of everything render_category() output depends on"""
+    items = []
+    for route, api in unique_category_apis(apis):
+        locations = (api.get('locations') or []) if call_sites else []
+        items.append([route, api['type'], api_params(api), locations])
+    payload = json.dumps([DOCS_FORMAT_VERSION, category, items], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def load_docs_cache(cache_file=DOCS_CACHE_FILE):
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get('version') == DOCS_FORMAT_VERSION else {}
+
+def save_docs_cache(cache, cache_file=DOCS_CACHE_FILE):
+    tmp_file = cache_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+def generate_markdown_incremental(categories, cache, call_sites=False):
+    """
+    Content-addressed variant of generate_markdown.
+    
+    Each category is fingerprinted from its routes, types, params and (with
+    call_sites) call sites; the document hash is derived from those fingerprints. Returns
+    (markdown, new_cache, stats). markdown is None when the hash matches
+    the cache, so nothing needs rendering or writing. Otherwise only
+    sections whose fingerprint changed are re-rendered.
+    """
+    sections = cache.get('sections', {})
+    fingerprints = [(category, category_fingerprint(category, apis, call_sites))
+                    for category, apis in categories.items() if apis]
+    content_hash = hashlib.sha1(json.dumps(fingerprints).encode('utf-8')).hexdigest()
+    stats = {'rendered': 0, 'reused': 0}
+    
+    if content_hash == cache.get('content_hash'):
+        stats['reused'] = len(fingerprints)
+        return None, cache, stats
+    
+    generated = datetime.now()
+    doc = render_header(generated)
+    new_sections = {}
+    for category, fingerprint in fingerprints:
+        cached = sections.get(category)
+        if cached and cached['fingerprint'] == fingerprint:
+            lines = cached['lines']
+            stats['reused'] += 1
+        else:
+            lines = render_category(category, categories[category], call_sites)
+            stats['rendered'] += 1
+        new_sections[category] = {'fingerprint': fingerprint, 'lines': lines}
+        doc.extend(lines)
+    
+    new_cache = {
+        'version': DOCS_FORMAT_VERSION,
+        'content_hash': content_hash,
+        'generated': generated.isoformat(),
+        'sections': new_sections,
+    }
+    return "\n".join(doc), new_cache, stats
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate API documentation for the Solidi Mobile App.')
+    parser.add_argument('--all', action='store_true',
+                        help=f'Scan every JS/TS file under {SRC_DIR}/ instead of the FILES_TO_SCAN list, '
+                             'and list each endpoint\'s call sites')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='With --all, scan in N worker processes (0 = one per CPU core)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Re-render only changed sections and skip the write when nothing changed ({DOCS_CACHE_FILE})')
+    profiling.add_arguments(parser)
+    project_snapshot.add_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
 def main():
     """Main execution"""
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
+    """Scan, categorize and write the documentation"""
     print("🔍 Scanning Solidi Mobile App for API endpoints...")
     
     all_apis = []
-    for file_path in FILES_TO_SCAN:
-        print(f"  📄 Scanning {file_path}...")
-        apis = extract_api_calls(file_path)
-        all_apis.extend(apis)
-        print(f"     Found {len(apis)} API calls")
+    snapshot = None
+    if args.all or args.snapshot:
+        snapshot = project_snapshot.open_snapshot(os.getcwd(), args.snapshot)
+    if args.all:
+        files = find_source_files(snapshot)
+        print(f"  📂 Found {len(files)} source files under {SRC_DIR}/")
+        results = scan_files(files, args.jobs, snapshot)
+        scanned = 0
+        for file_path, apis, was_scanned in results:
+            all_apis.extend(apis)
+            scanned += was_scanned
+        print(f"  🔎 {scanned} files mention an API method; {len(files) - scanned} skipped by prefilter")
+        print(f"     Found {len(all_apis)} API calls in {sum(1 for r in results if r[1])} files")
+    else:
+        for file_path in FILES_TO_SCAN:
+            print(f"  📄 Scanning {file_path}...")
+            apis = extract_api_calls(file_path, snapshot)
+            all_apis.extend(apis)
+            print(f"     Found {len(apis)} API calls")
     
     print(f"\n✅ Total API calls found: {len(all_apis)}")
     
+    all_apis = merge_api_inventory(all_apis)
+    print(f"   {len(all_apis)} unique endpoints after merging call sites")
+    
     # Categorize
     print("\n📊 Categorizing APIs...")
-    categories = categorize_apis(all_apis)
+    with profiling.phase('categorize'):
+        categories = categorize_apis(all_apis)
     
     for cat, apis in categories.items():
         if apis:
@@ -217,12 +486,25 @@ def main():
     
     # Generate documentation
     print("\n📝 Generating documentation...")
-    markdown = generate_markdown(categories)
-    
-    # Write to file
     output_file = 'API_DOCUMENTATION_NEW.md'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    if args.incremental:
+        with profiling.phase('render'):
+            cache = load_docs_cache() if os.path.exists(output_file) else {}
+            markdown, cache, stats = generate_markdown_incremental(categories, cache, args.all)
+        if markdown is None:
+            print(f"\n✅ {output_file} is up to date ({stats['reused']} sections unchanged), nothing written")
+            return
+        print(f"   {stats['rendered']} sections rendered, {stats['reused']} reused")
+        with profiling.phase('cache save'):
+            save_docs_cache(cache)
+    else:
+        with profiling.phase('render'):
+            markdown = generate_markdown(categories, call_sites=args.all)
+
+    # Write to file
+    with profiling.phase('report write'):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(markdown)
     
     print(f"\n✅ Documentation written to {output_file}")
     print(f"📏 Total lines: {len(markdown.splitlines())}")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Reading git objects for the scripts/ tools.
+All objects go through one long-lived `git cat-file --batch` process, so
+tools that walk many revisions (api_history.py) or staged blobs
+(precommit_check.py) never check out trees.
+"""
+
+import subprocess
+
+import profiling
+
+def git(repo, *args):
+    """Output of a git command run in `repo`"""
+    return subprocess.run(['git', '-C', repo] + list(args), check=True,
+                          stdout=subprocess.PIPE, text=True).stdout
+
+def start_cat_file(repo):
+    """Start the `git cat-file --batch` process all objects are read through"""
+    return subprocess.Popen(['git', '-C', repo, 'cat-file', '--batch'],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+def read_object(cat_file, spec):
+    """(sha, type, data) for an object name or revision expression, or None if missing"""
+    cat_file.stdin.write(spec.encode('utf-8') + b'\n')
+    cat_file.stdin.flush()
+    header = cat_file.stdout.readline().split()
+    if len(header) != 3:
+        return None
+    sha, object_type, size = header
+    data = cat_file.stdout.read(int(size))
+    cat_file.stdout.read(1)  # trailing newline
+    profiling.count(f'{object_type.decode()} objects read')
+    return sha.decode(), object_type.decode(), data
+
+def stop_cat_file(cat_file):
+    cat_file.stdin.close()
+    cat_file.wait()
+
+def parse_tree(data):
+    """Yield (mode, name, sha) for each entry of a raw tree object"""
+    pos = 0
+    n = len(data)
+    while pos < n:
+        space = data.index(b' ', pos)
+        nul = data.index(b'\0', space)
+        yield data[pos:space], data[space + 1:nul].decode('utf-8', 'surrogateescape'), data[nul + 1:nul + 21].hex()
+        pos = nul + 21
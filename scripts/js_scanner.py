@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Single-pass JavaScript call-site scanner for the Solidi Mobile App scripts.
+Tracks strings, template literals, comments, regex literals and balanced
+brackets so every privateMethod/publicMethod call is found in linear time,
+including calls whose options object contains nested braces.
+"""
+
+import re
+from bisect import bisect_right
+
+# Methods that talk to the Solidi API
+API_METHOD_NAMES = ('privateMethod', 'publicMethod')
+
+# Characters / keywords after which a '/' starts a regex literal, not a division
+REGEX_PRECEDING_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_PRECEDING_WORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'instanceof', 'yield', 'await',
+}
+
+IDENTIFIER_CHARS = re.compile(r'[\w$.]')
+
+# Tokens recognised inside a template literal
+TEMPLATE_TOKEN = re.compile(r'\\.|`|\$\{', re.DOTALL)
+
+# Body of a regex literal (everything after the opening '/')
+REGEX_LITERAL_BODY = re.compile(r'(?:[^\\/\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# `async function name` after an `async` token
+ASYNC_FUNCTION = re.compile(r'\s+function\s*\*?\s*([A-Za-z_$][\w$]*)')
+
+# Token kinds keyed by first character; identifiers and '/' are resolved in _token_kind
+TOKEN_KINDS = {
+    "'": 'squote', '"': 'dquote', '`': 'backtick',
+    '{': 'open', '(': 'open', '[': 'open',
+    '}': 'close', ')': 'close', ']': 'close',
+    ':': 'punct', ',': 'punct',
+}
+
+_code_token_cache = {}
+
+def _code_token_pattern(method_names):
+    """
+    Build (and cache) the tokenizer used outside template literals.
+    
+    Every alternative starts with a literal character, so the regex engine
+    can skip straight to candidate positions instead of trying each branch
+    at every offset. Identifier boundaries are checked in _token_kind.
+    """
+    key = tuple(method_names)
+    if key not in _code_token_cache:
+        names = ''.join('|' + re.escape(name) for name in key)
+        _code_token_cache[key] = re.compile(
+            r"//[^\n]*|/\*.*?(?:\*/|\Z)|/"
+            r"|'(?:[^'\\\n]|\\.)*'?|\"(?:[^\"\\\n]|\\.)*\"?|`"
+            r"|\{|\(|\[|\}|\)|\]|:|,"
+            r"|async" + names,
+            re.DOTALL)
+    return _code_token_cache[key]
+
+def _is_word_char(char):
+    return char.isalnum() or char in '_$'
+
+def _token_kind(content, token, start, end):
+    """Classify a token; identifiers must not be part of a longer word"""
+    kind = TOKEN_KINDS.get(token[0])
+    if kind is not None:
+        return kind
+    if token[0] == '/':
+        if token.startswith('//'):
+            return 'line_comment'
+        if token.startswith('/*'):
+            return 'block_comment'
+        return 'slash'
+    if (start > 0 and (_is_word_char(content[start - 1]) or content[start - 1] == '.' and token == 'async')) \
+            or (end < len(content) and _is_word_char(content[end])):
+        return None
+    return 'async' if token == 'async' else 'method'
+
+def _async_function_name(content, start, end):
+    """Name of the function an `async` keyword introduces, if it is named"""
+    # async function name(...)
+    m = ASYNC_FUNCTION.match(content, end)
+    if m:
+        return m.group(1)
+    # name = async ..., this.name = async ..., name: async ...
+    i = start - 1
+    while i >= 0 and content[i] in ' \t\r\n':
+        i -= 1
+    if i < 1 or content[i] not in ':=' or (content[i] == '=' and content[i - 1] in '=!<>+-*/%&|^?'):
+        return None
+    i -= 1
+    while i >= 0 and content[i] in ' \t\r\n':
+        i -= 1
+    name_end = i + 1
+    while i >= 0 and _is_word_char(content[i]):
+        i -= 1
+    name = content[i + 1:name_end]
+    return name if name and not name[0].isdigit() else None
+
+def _starts_regex_literal(content, pos):
+    """Decide whether the '/' at pos opens a regex literal"""
+    i = pos - 1
+    while i >= 0 and content[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return True
+    prev = content[i]
+    if prev in REGEX_PRECEDING_CHARS:
+        return True
+    if prev.isalnum() or prev in '_$':
+        end = i + 1
+        while i >= 0 and (content[i].isalnum() or content[i] in '_$'):
+            i -= 1
+        return content[i + 1:end] in REGEX_PRECEDING_WORDS
+    return False
+
+def _receiver_start(content, pos):
+    """Walk back over a dotted member chain (e.g. this.state.apiClient.)"""
+    i = pos
+    while i > 0 and IDENTIFIER_CHARS.match(content, i - 1):
+        i -= 1
+    return i
+
+def _skip_whitespace(content, pos):
+    n = len(content)
+    while pos < n and content[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+def _strip_comments(content, start, end, comments):
+    """Text of content[start:end] with the given comment spans cut out"""
+    pieces = []
+    for comment_start, comment_end in comments:
+        if comment_end <= start or comment_start >= end:
+            continue
+        pieces.append(content[start:comment_start])
+        start = comment_end
+    pieces.append(content[start:end])
+    return ''.join(pieces)
+
+def _trim_span(content, start, end, comments):
+    """Shrink (start, end) past surrounding whitespace and comments"""
+    changed = True
+    while changed:
+        changed = False
+        while start < end and content[start] in ' \t\r\n':
+            start += 1
+        while end > start and content[end - 1] in ' \t\r\n':
+            end -= 1
+        for comment_start, comment_end in comments:
+            if comment_start == start and comment_end <= end:
+                start, changed = comment_end, True
+            elif comment_end == end and comment_start >= start:
+                end, changed = comment_start, True
+    return start, end
+
+def _finish_property(content, options, end):
+    """Record the top-level property that ends at `end` in an options object"""
+    start = options['prop_start']
+    colon = options['colon']
+    comments = options['comments']
+    if colon is None:
+        # Shorthand property (`apiRoute,`) or spread (`...args`)
+        key = _strip_comments(content, start, end, comments).strip()
+        if key:
+            options['properties'][key] = None
+    else:
+        key = _strip_comments(content, start, colon, comments).strip().strip('\'"')
+        if key:
+            options['properties'][key] = _trim_span(content, colon + 1, end, comments)
+    options['prop_start'] = end + 1
+    options['colon'] = None
+    options['comments'] = []
+
+def scan_method_calls(content, method_names=API_METHOD_NAMES):
+    """
+    Find every call to one of `method_names` in a JavaScript source string.
+
+    Returns a list of call-site dicts ordered by position. Spans are
+    (start, end) offsets into `content`, as with re match spans:
+      - method:        the called method name (e.g. 'privateMethod')
+      - receiver:      the member chain before it (e.g. 'this.state'), or ''
+      - span:          the whole call expression, receiver included
+      - args_span:     the text between the call parentheses
+      - options_span:  the first argument when it is an object literal, else None
+      - properties:    top-level keys of that object -> value span (None for shorthand)
+      - function:      name of the enclosing async function, if known
+      - line:          1-based line number of the call
+    """
+    code_token = _code_token_pattern(method_names)
+    n = len(content)
+    calls = []
+    # Each frame is [opening char, offset, info]; info is a dict for call
+    # parentheses and options objects, else None
+    stack = []
+    functions = []  # (depth, name) for named function bodies that are open
+    pending_function = None
+    pending_call = None
+    in_template = False
+    pos = 0
+
+    while pos < n:
+        if in_template:
+            m = TEMPLATE_TOKEN.search(content, pos)
+            if not m:
+                break
+            pos = m.end()
+            token = m.group()
+            if token == '`':
+                in_template = False
+            elif token == '${':
+                stack.append(['${', m.start(), None])
+                in_template = False
+            continue
+
+        m = code_token.search(content, pos)
+        if not m:
+            break
+        start = m.start()
+        pos = m.end()
+        kind = _token_kind(content, m.group(), start, pos)
+
+        if kind == 'backtick':
+            in_template = True
+
+        elif kind == 'slash':
+            if _starts_regex_literal(content, start):
+                literal = REGEX_LITERAL_BODY.match(content, pos)
+                if literal:
+                    pos = literal.end()
+
+        elif kind == 'async':
+            name = _async_function_name(content, start, pos)
+            if name:
+                pending_function = (len(stack), name)
+
+        elif kind == 'method':
+            paren = _skip_whitespace(content, pos)
+            if paren < n and content[paren] == '(':
+                receiver_start = _receiver_start(content, start)
+                pending_call = {
+                    'method': m.group(),
+                    'receiver': content[receiver_start:start].rstrip('.'),
+                    'start': receiver_start,
+                    'paren': paren,
+                }
+                pos = paren
+
+        elif kind == 'open':
+            char = m.group()
+            info = None
+            top = stack[-1] if stack else None
+            if char == '(' and pending_call is not None and pending_call['paren'] == start:
+                info = pending_call
+                info['options'] = None
+                pending_call = None
+            elif (char == '{' and top is not None and top[0] == '(' and top[2] is not None
+                    and top[2].get('options', False) is None
+                    and not content[top[1] + 1:start].strip()):
+                info = {'prop_start': pos, 'colon': None, 'comments': [], 'properties': {}}
+                top[2]['options'] = info
+            elif char == '{' and pending_function is not None and pending_function[0] == len(stack):
+                functions.append((len(stack) + 1, pending_function[1]))
+                pending_function = None
+            stack.append([char, start, info])
+
+        elif kind == 'close':
+            if not stack:
+                continue
+            char, open_pos, info = stack.pop()
+            depth = len(stack) + 1
+            if functions and functions[-1][0] == depth:
+                functions.pop()
+            if char == '${':
+                in_template = True
+            elif char == '{' and info is not None and 'properties' in info:
+                _finish_property(content, info, start)
+                info['span'] = (open_pos, pos)
+            elif char == '(' and info is not None and 'method' in info:
+                # `privateMethod(args) {` is a method definition, not a call
+                after = _skip_whitespace(content, pos)
+                if after < n and content[after] == '{':
+                    continue
+                options = info['options']
+                calls.append({
+                    'method': info['method'],
+                    'receiver': info['receiver'],
+                    'span': (info['start'], pos),
+                    'args_span': (open_pos + 1, start),
+                    'options_span': options.get('span') if options else None,
+                    'properties': options['properties'] if options else {},
+                    'function': functions[-1][1] if functions else None,
+                })
+
+        elif kind == 'punct':
+            top = stack[-1] if stack else None
+            if top is not None and top[0] == '{' and top[2] is not None and 'properties' in top[2]:
+                if m.group() == ',':
+                    _finish_property(content, top[2], start)
+                elif top[2]['colon'] is None:
+                    top[2]['colon'] = start
+
+        elif kind in ('line_comment', 'block_comment'):
+            top = stack[-1] if stack else None
+            if top is not None and top[0] == '{' and top[2] is not None and 'properties' in top[2]:
+                top[2]['comments'].append((start, pos))
+
+        # String literals are consumed whole by the tokenizer
+
+    calls.sort(key=lambda call: call['span'][0])
+    if calls:
+        newlines = [nl.start() for nl in re.finditer('\n', content)]
+        for call in calls:
+            call['line'] = bisect_right(newlines, call['span'][0] - 1) + 1
+    return calls
+
+def property_text(content, call, key):
+    """Source text of a top-level option property, or None if absent/shorthand"""
+    span = call['properties'].get(key)
+    if span is None:
+        return None
+    return content[span[0]:span[1]]
+
+def string_literal_value(text):
+    """Contents of a single string or template literal, or None for any other expression"""
+    if text is None or len(text) < 2:
+        return None
+    quote = text[0]
+    if quote not in '\'"`' or text[-1] != quote:
+        return None
+    inner = text[1:-1]
+    if quote != '`' and quote in inner.replace('\\' + quote, ''):
+        return None
+    return inner
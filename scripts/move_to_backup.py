@@ -1,86 +1,500 @@
 #!/usr/bin/env python3
 """
 Move obviously unused files to backup directory
+File contents go to a shared content-addressed store (backup/store), so
+files backed up before cost nothing; each run keeps only its manifest.
+Moves are recorded in a write-ahead journal inside the backup directory, so
+an interrupted run can be finished with --resume or undone with --rollback.
 """
 
 import os
 import json
+import stat
+import errno
 import shutil
+import argparse
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import backup_store
+import project_snapshot
 
 PROJECT_ROOT = '/Users/henry/Solidi/SolidiMobileApp4'
 BACKUP_DIR = os.path.join(PROJECT_ROOT, 'backup')
+STORE_DIR = os.path.join(BACKUP_DIR, 'store')
+
+# Journal of one backup run, inside its backup directory. JSON lines:
+#   begin     the full plan (files, categories, layout), fsynced before anything moves
+#   moved     a file is in the backup (store layout: sha256, size, mode, mtime_ns,
+#             or symlink (the link target) instead of sha256 and size;
+#             tree layout: method rename or copy)
+#   commit    summary and README written; the run is complete
+#   restored  a file was moved back by --rollback
+JOURNAL_NAME = '.move_journal.jsonl'
+
+# fsync the journal after this many moved records (and always at the end)
+JOURNAL_SYNC_EVERY = 256
+
+# Suffix of a cross-device copy in progress; renamed into place when complete
+PARTIAL_SUFFIX = '.partial'
+
+def _store_size():
+    """Bytes in the store's packs and indexes"""
+    if not os.path.isdir(STORE_DIR):
+        return 0
+    return sum(entry.stat().st_size for entry in os.scandir(STORE_DIR))
 
 def create_backup_structure():
-    """Create backup directory with timestamp"""
+    """
+    Create backup directory with timestamp. Each run gets a new directory:
+    a second run in the same second gets a -2 suffix, and so on.
+    """
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_root = os.path.join(BACKUP_DIR, f'unused_files_{timestamp}')
+    base = os.path.join(BACKUP_DIR, f'unused_files_{timestamp}')
+    os.makedirs(BACKUP_DIR, exist_ok=True)
     
-    os.makedirs(backup_root, exist_ok=True)
-    
-    return backup_root
+    backup_root = base
+    number = 1
+    while True:
+        try:
+            os.mkdir(backup_root)
+            return backup_root
+        except FileExistsError:
+            number += 1
+            backup_root = f'{base}-{number}'
+
+def _run_order(journal_path):
+    """Sort key of a run's journal: the run's timestamp, then its -N suffix"""
+    timestamp, _, number = journal_path.parent.name.partition('-')
+    return timestamp, int(number) if number.isdigit() else 1
+
+def _load_journal(path):
+    """
+    (records, bytes) of a journal: the complete lines, and where they
+    end. A torn last line (crash mid-write) is not counted.
+    """
+    records = []
+    end = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            end += len(line)
+    return records, end
+
+def open_journal(backup_root):
+    """
+    The run's journal, opened for appending after its last complete line.
+    A torn line is cut off first; records appended after it would never
+    be read back.
+    """
+    path = os.path.join(backup_root, JOURNAL_NAME)
+    end = _load_journal(path)[1] if os.path.exists(path) else 0
+    f = open(path, 'a')
+    f.truncate(end)
+    return {'file': f, 'unsynced': 0}
 
-def move_file_to_backup(file_path, backup_root):
-    """Move a file to backup maintaining directory structure"""
-    # Get relative path from project root
-    rel_path = os.path.relpath(file_path, PROJECT_ROOT)
+def journal_write(journal, op, sync=False, **fields):
+    """Append one record; flushed always, fsynced if sync or every JOURNAL_SYNC_EVERY records"""
+    journal['file'].write(json.dumps(dict(fields, op=op)) + '\n')
+    journal['file'].flush()
+    journal['unsynced'] += 1
+    if sync or journal['unsynced'] >= JOURNAL_SYNC_EVERY:
+        journal_sync(journal)
+
+def journal_sync(journal):
+    if journal['unsynced']:
+        os.fsync(journal['file'].fileno())
+        journal['unsynced'] = 0
+
+def close_journal(journal):
+    journal_sync(journal)
+    journal['file'].close()
+
+def read_journal(backup_root):
+    """Records of a backup run's journal; a torn last line (crash mid-write) is ignored"""
+    records, _ = _load_journal(os.path.join(backup_root, JOURNAL_NAME))
+    if not records or records[0]['op'] != 'begin':
+        raise ValueError(f"{backup_root}: journal has no begin record")
+    return records
+
+def find_run(path, want):
+    """
+    Backup directory to --resume or --rollback: path if given, else the
+    newest journaled run (for resume, the newest one not committed).
+    """
+    if path:
+        return os.path.abspath(path)
+    runs = sorted(Path(BACKUP_DIR).glob(f'unused_files_*/{JOURNAL_NAME}'), key=_run_order, reverse=True)
+    for journal_path in runs:
+        backup_root = str(journal_path.parent)
+        if want == 'rollback' or not any(r['op'] == 'commit' for r in read_journal(backup_root)):
+            return backup_root
+    return None
+
+def file_state(src, dest):
+    """
+    Where a planned file is, from the filesystem alone:
+      pending   still in the project
+      moved     only in the backup
+      copied    in both: a cross-device copy completed but the source was
+                not removed yet (copies only appear under dest once complete)
+      missing   in neither
+    """
+    in_src = os.path.lexists(src)
+    in_dest = os.path.lexists(dest)
+    if in_src and in_dest:
+        return 'copied'
+    return 'moved' if in_dest else 'pending' if in_src else 'missing'
+
+def ensure_dir(path, created):
+    """os.makedirs, once per directory per run"""
+    if path not in created:
+        os.makedirs(path, exist_ok=True)
+        created.add(path)
+
+def copy_file(src, dest):
+    """Copy src to dest via a .partial file, so dest only ever exists complete"""
+    partial = dest + PARTIAL_SUFFIX
+    shutil.copy2(src, partial, follow_symlinks=False)
+    if not os.path.islink(partial):
+        with open(partial, 'rb') as f:
+            os.fsync(f.fileno())
+    os.replace(partial, dest)
+
+def transfer(pairs, journal, jobs, op):
+    """
+    Move (rel, src, dest) pairs: os.rename where src and dest share a
+    filesystem, otherwise a copy (in parallel over jobs threads) followed
+    by removing src. Each completed move is journaled as op. Returns
+    ({rel: method}, {rel: error}).
+    """
+    done = {}
+    errors = {}
+    cross_device = []
+    
+    for rel, src, dest in pairs:
+        try:
+            os.rename(src, dest)
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                cross_device.append((rel, src, dest))
+            else:
+                errors[rel] = str(e)
+            continue
+        done[rel] = 'rename'
+        journal_write(journal, op, file=rel, method='rename')
     
-    # Create destination path in backup
-    dest_path = os.path.join(backup_root, rel_path)
-    dest_dir = os.path.dirname(dest_path)
+    if cross_device:
+        print(f"   Copying {len(cross_device)} file(s) across filesystems with {jobs} thread(s)...")
     
-    # Create destination directory
-    os.makedirs(dest_dir, exist_ok=True)
+    def copy_one(pair):
+        rel, src, dest = pair
+        try:
+            copy_file(src, dest)
+        except OSError as e:
+            return rel, e
+        return rel, None
     
-    # Move file
-    shutil.move(file_path, dest_path)
+    pending_unlink = {rel: src for rel, src, dest in cross_device}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for rel, error in pool.map(copy_one, cross_device):
+            if error:
+                errors[rel] = str(error)
+                continue
+            # The journal must say the copy is complete before the source goes
+            journal_write(journal, op, sync=True, file=rel, method='copy')
+            os.remove(pending_unlink[rel])
+            done[rel] = 'copy'
     
-    return rel_path
+    journal_sync(journal)
+    return done, errors
 
-def main():
-    print("=" * 80)
-    print("MOVING UNUSED FILES TO BACKUP")
-    print("=" * 80)
+def move_files(backup_root, records, jobs):
+    """
+    Bring the run in backup_root to the state where every planned file
+    that still exists is in the backup. Safe to repeat after a crash:
+    the filesystem says which files are already moved.
+    Returns (moved, failed) relative paths.
+    """
+    plan = records[0]
+    moved = [r['file'] for r in records if r['op'] == 'moved']
+    moved_set = set(moved)
+    failed = list(plan['failed'])
+    created = set()
+    pairs = []
+    journal = open_journal(backup_root)
     
-    # Load the list of files to move
-    report_file = os.path.join(PROJECT_ROOT, 'conservative_unused_files.json')
-    if not os.path.exists(report_file):
-        print("❌ Error: conservative_unused_files.json not found!")
-        print("   Run find_obviously_unused.py first")
-        return
+    for rel in plan['files']:
+        src = os.path.join(PROJECT_ROOT, rel)
+        dest = os.path.join(backup_root, rel)
+        state = file_state(src, dest)
+        if state == 'copied':
+            # Interrupted between copy and unlink: the backup copy is complete
+            if rel not in moved_set:
+                journal_write(journal, 'moved', sync=True, file=rel, method='copy')
+                moved.append(rel)
+                moved_set.add(rel)
+            os.remove(src)
+        elif state == 'moved':
+            if rel not in moved_set:
+                journal_write(journal, 'moved', file=rel)
+                moved.append(rel)
+                moved_set.add(rel)
+        elif state == 'missing':
+            print(f"⚠️  File not found: {rel}")
+            failed.append(rel)
+        else:
+            partial = dest + PARTIAL_SUFFIX
+            if os.path.lexists(partial):
+                os.remove(partial)
+            ensure_dir(os.path.dirname(dest), created)
+            pairs.append((rel, src, dest))
     
-    with open(report_file) as f:
-        data = json.load(f)
+    done, errors = transfer(pairs, journal, jobs, 'moved')
+    close_journal(journal)
     
-    files_to_move = data['all_files']
+    for rel, src, dest in pairs:
+        if rel in done:
+            moved.append(rel)
+            print(f"✅ Moved: {rel}")
+        else:
+            print(f"❌ Failed to move {rel}: {errors[rel]}")
+            failed.append(rel)
     
-    print(f"\n📦 Preparing to move {len(files_to_move)} files to backup...")
+    return moved, failed
+
+def _inspect(path):
+    """
+    (lstat, sha256, symlink target, error) of a file. It is stat'ed before
+    it is read, so a later edit shows up as a changed stat. Symbolic links
+    are not followed: their target is returned instead of a hash.
+    """
+    try:
+        st = os.lstat(path)
+        if stat.S_ISLNK(st.st_mode):
+            return st, None, os.readlink(path), None
+        return st, backup_store.hash_file(path), None, None
+    except OSError as e:
+        return None, None, None, e
+
+def _identity(st):
+    """What changes when a file is edited or replaced"""
+    return st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns
+
+def store_files(backup_root, records, jobs):
+    """
+    Store layout of move_files(): add each planned file's content to the
+    store (skipped when its hash is already there), then remove it from
+    the project. Symbolic links are journaled with their target, not
+    stored. Per batch, the blobs are fsynced before the journal records
+    them, and the journal before any source is removed. A file whose stat
+    changed since it was hashed is left in place and counted as failed.
+    Returns (moved, failed, {rel: moved record}).
+    """
+    plan = records[0]
+    objects = {r['file']: r for r in records if r['op'] == 'moved'}
+    failed = list(plan['failed'])
+    pending = []
     
-    # Create backup directory
-    backup_root = create_backup_structure()
-    print(f"📁 Backup directory: {os.path.relpath(backup_root, PROJECT_ROOT)}")
+    for rel in plan['files']:
+        if os.path.lexists(os.path.join(PROJECT_ROOT, rel)):
+            # Not stored yet, or stored but interrupted before the removal
+            pending.append(rel)
+            objects.pop(rel, None)
+        elif rel not in objects:
+            print(f"⚠️  File not found: {rel}")
+            failed.append(rel)
     
-    # Move files
-    moved_files = []
-    failed_files = []
+    store = backup_store.open_store(STORE_DIR)
+    journal = open_journal(backup_root)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for start in range(0, len(pending), JOURNAL_SYNC_EVERY):
+            batch = pending[start:start + JOURNAL_SYNC_EVERY]
+            stored = []
+            inspected = pool.map(_inspect, [os.path.join(PROJECT_ROOT, rel) for rel in batch])
+            for rel, (st, sha, target, error) in zip(batch, inspected):
+                src = os.path.join(PROJECT_ROOT, rel)
+                try:
+                    if error:
+                        raise error
+                    if target is not None:
+                        record = {'file': rel, 'symlink': target}
+                    else:
+                        if sha not in store['index']:
+                            sha, _ = backup_store.store_file(store, src)
+                        record = {'file': rel, 'sha256': sha, 'size': st.st_size}
+                except OSError as e:
+                    print(f"❌ Failed to move {rel}: {e}")
+                    failed.append(rel)
+                    continue
+                record.update(mode=st.st_mode, mtime_ns=st.st_mtime_ns)
+                stored.append((record, _identity(st)))
+            
+            backup_store.sync_store(store)
+            for record, _ in stored:
+                journal_write(journal, 'moved', **record)
+            journal_sync(journal)
+            for record, identity in stored:
+                rel = record['file']
+                src = os.path.join(PROJECT_ROOT, rel)
+                try:
+                    unchanged = _identity(os.lstat(src)) == identity
+                except OSError:
+                    unchanged = False
+                if not unchanged:
+                    # Edited after it was hashed: the stored content is stale
+                    print(f"❌ Failed to move {rel}: changed while it was being backed up; left in place")
+                    failed.append(rel)
+                    continue
+                os.remove(src)
+                objects[rel] = record
+                print(f"✅ Moved: {rel}")
     
-    for file_rel in files_to_move:
-        file_path = os.path.join(PROJECT_ROOT, file_rel)
-        
-        if not os.path.exists(file_path):
-            print(f"⚠️  File not found: {file_rel}")
-            failed_files.append(file_rel)
-            continue
-        
+    close_journal(journal)
+    backup_store.close_store(store)
+    moved = [rel for rel in plan['files'] if rel in objects]
+    return moved, failed, objects
+
+def load_manifest(backup_root, records):
+    """
+    The objects of a run's BACKUP_SUMMARY.json, with each record's file
+    set: {} if the run has no summary yet, None if it should have one
+    (the run committed) or it cannot be read.
+    """
+    summary_file = os.path.join(backup_root, 'BACKUP_SUMMARY.json')
+    if not os.path.exists(summary_file):
+        return None if any(r['op'] == 'commit' for r in records) else {}
+    try:
+        with open(summary_file) as f:
+            objects = json.load(f)['objects']
+    except (OSError, ValueError, KeyError):
+        return None
+    return {rel: dict(record, file=rel) for rel, record in objects.items()}
+
+def run_objects(records, manifest):
+    """
+    {rel: moved record} of a store-layout run, newest first: the journal's
+    moved records, plus any file only the summary's manifest lists
+    """
+    objects = {}
+    for record in reversed(records):
+        if record['op'] == 'moved':
+            objects.setdefault(record['file'], record)
+    for rel, record in (manifest or {}).items():
+        objects.setdefault(rel, record)
+    return objects
+
+def restore_files(backup_root, objects, jobs):
+    """
+    Store layout of rollback(): write every stored file (objects, see
+    run_objects()) back with its mode and mtime, and recreate symbolic
+    links. Files already in the project (never removed, or restored by an
+    earlier attempt) are left alone.
+    Returns ({rel: error} of files not restored, number restored).
+    """
+    pending = [record for rel, record in objects.items() if not os.path.lexists(os.path.join(PROJECT_ROOT, rel))]
+    created = set()
+    for record in pending:
+        ensure_dir(os.path.dirname(os.path.join(PROJECT_ROOT, record['file'])), created)
+    
+    store = backup_store.open_store(STORE_DIR)
+    
+    def restore_one(record):
+        src = os.path.join(PROJECT_ROOT, record['file'])
         try:
-            moved_rel = move_file_to_backup(file_path, backup_root)
-            moved_files.append(moved_rel)
-            print(f"✅ Moved: {moved_rel}")
-        except Exception as e:
-            print(f"❌ Failed to move {file_rel}: {e}")
-            failed_files.append(file_rel)
+            if 'symlink' in record:
+                os.symlink(record['symlink'], src)
+                return record['file'], None
+            backup_store.restore_blob(store, record['sha256'], src)
+            os.chmod(src, record['mode'] & 0o7777)
+            os.utime(src, ns=(record['mtime_ns'], record['mtime_ns']))
+        except (OSError, KeyError, ValueError) as e:
+            return record['file'], e
+        return record['file'], None
+    
+    errors = {}
+    journal = open_journal(backup_root)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for rel, error in pool.map(restore_one, pending):
+            if error:
+                errors[rel] = str(error)
+            else:
+                journal_write(journal, 'restored', file=rel)
+    close_journal(journal)
+    backup_store.close_store(store)
+    return errors, len(pending) - len(errors)
+
+def rollback(backup_root, jobs):
+    """
+    Move every file of the run in backup_root back to where it was, newest
+    first, then remove the backup directory. Safe to repeat after a crash.
+    For the store layout the directory is only removed once every file
+    of the journal and of the summary's manifest is back in the project.
+    Returns the relative paths that could not be restored.
+    """
+    records = read_journal(backup_root)
+    plan = records[0]
+    if plan.get('layout') == 'store':
+        manifest = load_manifest(backup_root, records)
+        objects = run_objects(records, manifest)
+        errors, restored = restore_files(backup_root, objects, jobs)
+        for rel in errors:
+            print(f"❌ Failed to restore {rel}: {errors[rel]}")
+        absent = [rel for rel in objects
+                  if rel not in errors and not os.path.lexists(os.path.join(PROJECT_ROOT, rel))]
+        for rel in absent:
+            print(f"❌ Not back in the project: {rel}")
+        if manifest is None:
+            print("⚠️  BACKUP_SUMMARY.json is missing or unreadable; cannot check the run is fully restored")
+        if errors or absent or manifest is None:
+            print(f"⚠️  Keeping {os.path.relpath(backup_root, PROJECT_ROOT)}")
+        else:
+            shutil.rmtree(backup_root)
+        print(f"✅ Restored {restored} file(s)")
+        return list(errors) + absent
+    
+    order = list(dict.fromkeys([r['file'] for r in reversed(records) if r['op'] == 'moved'] +
+                               plan['files'][::-1]))
+    created = set()
+    pairs = []
+    journal = open_journal(backup_root)
     
+    for rel in order:
+        src = os.path.join(PROJECT_ROOT, rel)
+        dest = os.path.join(backup_root, rel)
+        partial = dest + PARTIAL_SUFFIX
+        if os.path.lexists(partial):
+            os.remove(partial)
+        state = file_state(src, dest)
+        if state == 'copied':
+            # The source was never removed; the backup copy is redundant
+            os.remove(dest)
+        elif state == 'moved':
+            ensure_dir(os.path.dirname(src), created)
+            pairs.append((rel, dest, src))
+    
+    restored, errors = transfer(pairs, journal, jobs, 'restored')
+    close_journal(journal)
+    for rel in errors:
+        print(f"❌ Failed to restore {rel}: {errors[rel]}")
+    
+    if not errors:
+        shutil.rmtree(backup_root)
+    print(f"✅ Restored {len(restored)} file(s)")
+    return list(errors)
+
+def write_summary(backup_root, data, files_to_move, moved_files, failed_files, objects=None):
+    """
+    Write BACKUP_SUMMARY.json and README.md; returns their paths. For the
+    store layout, objects ({rel: moved record}) makes the summary the
+    run's manifest into the store.
+    """
     # Create summary report
     summary = {
         'timestamp': datetime.now().isoformat(),
@@ -92,6 +506,11 @@ def main():
         'failed_files': failed_files,
         'categories': data['by_category']
     }
+    if objects is not None:
+        summary['store'] = os.path.relpath(STORE_DIR, backup_root)
+        summary['objects'] = {rel: {key: objects[rel][key] for key in ('sha256', 'size', 'symlink', 'mode', 'mtime_ns')
+                                    if key in objects[rel]}
+                              for rel in moved_files}
     
     summary_file = os.path.join(backup_root, 'BACKUP_SUMMARY.json')
     with open(summary_file, 'w') as f:
@@ -107,7 +526,7 @@ def main():
 ## Categories
 
 """
-    
+
     for category, files in data['by_category'].items():
         if files:
             readme_content += f"\n### {category.title()} ({len(files)} files)\n\n"
@@ -115,23 +534,144 @@ def main():
                 readme_content += f"- {file}\n"
             if len(files) > 10:
                 readme_content += f"- ... and {len(files) - 10} more\n"
-    
+
+    if objects is None:
+        layout_note = """or simply move them back to their original locations in the project.
+The directory structure is preserved, so you can copy entire folders back if needed."""
+    else:
+        layout_note = f"""File contents are kept in the shared store ({os.path.relpath(STORE_DIR, PROJECT_ROOT)}),
+compressed and stored once per content hash; the `objects` of
+`BACKUP_SUMMARY.json` map each file to its SHA-256 there (symbolic
+links to their target)."""
+
     readme_content += f"""
 
 ## Restoration
 
-To restore these files, simply move them back to their original locations in the project.
+To restore these files, run:
 
-The directory structure is preserved, so you can copy entire folders back if needed.
+    python3 scripts/move_to_backup.py --rollback {os.path.relpath(backup_root, PROJECT_ROOT)}
+
+{layout_note}
 
 ## Details
 
-See `BACKUP_SUMMARY.json` for complete file list and metadata.
+See `BACKUP_SUMMARY.json` for complete file list and metadata, and
+`{JOURNAL_NAME}` for the order the files were moved in.
 """
-    
+
     readme_file = os.path.join(backup_root, 'README.md')
     with open(readme_file, 'w') as f:
         f.write(readme_content)
+
+    return summary_file, readme_file
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Move the files listed in conservative_unused_files.json to backup/.')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Threads for hashing, restores and cross-device copies (0 = one per CPU core)')
+    parser.add_argument('--tree', action='store_true',
+                        help='Move files into a plain directory tree instead of the deduplicating store')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--resume', nargs='?', const='', metavar='BACKUP_DIR',
+                       help='Finish an interrupted run (default: the newest unfinished one)')
+    group.add_argument('--rollback', nargs='?', const='', metavar='BACKUP_DIR',
+                       help='Move the files of a run back into the project (default: the newest run)')
+    project_snapshot.add_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def main():
+    args = parse_args()
+    
+    if args.rollback is not None:
+        print("=" * 80)
+        print("RESTORING FILES FROM BACKUP")
+        print("=" * 80)
+        backup_root = find_run(args.rollback, 'rollback')
+        if not backup_root:
+            print("❌ Error: no journaled backup run found")
+            return
+        print(f"📁 Backup directory: {os.path.relpath(backup_root, PROJECT_ROOT)}")
+        failed = rollback(backup_root, args.jobs)
+        if failed:
+            print(f"❌ {len(failed)} file(s) not restored; fix the errors above and run --rollback again")
+        return
+    
+    print("=" * 80)
+    print("MOVING UNUSED FILES TO BACKUP")
+    print("=" * 80)
+    
+    if args.resume is not None:
+        backup_root = find_run(args.resume, 'resume')
+        if not backup_root:
+            print("✅ No unfinished backup run to resume")
+            return
+        records = read_journal(backup_root)
+        if any(r['op'] == 'commit' for r in records):
+            print(f"✅ {os.path.relpath(backup_root, PROJECT_ROOT)} is already complete")
+            return
+        plan = records[0]
+        data = {'by_category': plan['categories']}
+        files_to_move = plan['files'] + plan['failed']
+        print(f"\n📦 Resuming {os.path.relpath(backup_root, PROJECT_ROOT)}...")
+    else:
+        # Load the list of files to move
+        report_file = os.path.join(PROJECT_ROOT, 'conservative_unused_files.json')
+        if not os.path.exists(report_file):
+            print("❌ Error: conservative_unused_files.json not found!")
+            print("   Run find_obviously_unused.py first")
+            return
+        
+        with open(report_file) as f:
+            data = json.load(f)
+        
+        files_to_move = data['all_files']
+        
+        print(f"\n📦 Preparing to move {len(files_to_move)} files to backup...")
+        
+        # Existence checks come from a saved project snapshot when there is one
+        snapshot = None
+        if args.snapshot:
+            snapshot = project_snapshot.open_snapshot(PROJECT_ROOT, args.snapshot, walk=False)
+        
+        planned = []
+        missing = []
+        for file_rel in files_to_move:
+            exists = file_rel in snapshot['files'] if snapshot else os.path.lexists(os.path.join(PROJECT_ROOT, file_rel))
+            if exists:
+                planned.append(file_rel)
+            else:
+                print(f"⚠️  File not found: {file_rel}")
+                missing.append(file_rel)
+        
+        # Create backup directory
+        backup_root = create_backup_structure()
+        print(f"📁 Backup directory: {os.path.relpath(backup_root, PROJECT_ROOT)}")
+        
+        # Write-ahead: the whole plan is on disk before the first file moves
+        journal = open_journal(backup_root)
+        journal_write(journal, 'begin', sync=True, timestamp=datetime.now().isoformat(),
+                      files=planned, failed=missing, categories=data['by_category'],
+                      layout='tree' if args.tree else 'store')
+        close_journal(journal)
+        records = read_journal(backup_root)
+    
+    # Move files
+    objects = None
+    if records[0].get('layout') == 'store':
+        store_size = _store_size()
+        moved_files, failed_files, objects = store_files(backup_root, records, args.jobs)
+        added = _store_size() - store_size
+    else:
+        moved_files, failed_files = move_files(backup_root, records, args.jobs)
+    
+    summary_file, readme_file = write_summary(backup_root, data, files_to_move, moved_files, failed_files, objects)
+    journal = open_journal(backup_root)
+    journal_write(journal, 'commit', sync=True, moved=len(moved_files), failed=len(failed_files))
+    close_journal(journal)
     
     print("\n" + "=" * 80)
     print("SUMMARY")
@@ -140,8 +680,12 @@ See `BACKUP_SUMMARY.json` for complete file list and metadata.
     if failed_files:
         print(f"❌ Failed to move: {len(failed_files)} files")
     print(f"📁 Backup location: {os.path.relpath(backup_root, PROJECT_ROOT)}")
+    if objects is not None:
+        total = sum(objects[rel].get('size', 0) for rel in moved_files)
+        print(f"🗄️  Store: {total} bytes backed up, {added} bytes added to {os.path.relpath(STORE_DIR, PROJECT_ROOT)}")
     print(f"📄 Summary: {os.path.relpath(summary_file, PROJECT_ROOT)}")
     print(f"📖 README: {os.path.relpath(readme_file, PROJECT_ROOT)}")
+    print(f"↩️  Undo with: --rollback {os.path.relpath(backup_root, PROJECT_ROOT)}")
     print("=" * 80)
 
 if __name__ == '__main__':
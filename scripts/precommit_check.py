@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Pre-commit orphan check for find_unused_files.py (--pre-commit).
+Keeps the import graph and used set of HEAD on disk, applies only the
+staged changes from `git diff --cached --name-only` and updates
+reachability incrementally, reporting the files this commit orphans or
+revives. Install as a hook with:
+    echo 'python3 scripts/find_unused_files.py --pre-commit' > .git/hooks/pre-commit
+"""
+
+import os
+import json
+import subprocess
+from collections import defaultdict
+
+import profiling
+import project_snapshot
+import find_unused_files
+from git_objects import start_cat_file, read_object, stop_cat_file
+
+# Graph state of the last commit checked, next to the parse cache
+STATE_FILE = '.find_unused_files_precommit.json'
+STATE_VERSION = 2
+
+JS_EXTENSIONS = ('.js', '.jsx')
+
+def git_entries(root, *args):
+    """NUL-separated output of a git command run in root"""
+    output = subprocess.run(['git', '-C', root] + list(args), check=True, stdout=subprocess.PIPE).stdout
+    return [entry.decode('utf-8', 'surrogateescape') for entry in output.split(b'\0') if entry]
+
+def head_commit(root):
+    entries = subprocess.run(['git', '-C', root, 'rev-parse', '--verify', '-q', 'HEAD'],
+                             stdout=subprocess.PIPE, text=True).stdout.split()
+    return entries[0] if entries else None
+
+def tree_blobs(root, commit, scan_dirs, ignore_dirs):
+    """{path: blob sha} of the scanned JavaScript files in a commit"""
+    blobs = {}
+    for entry in git_entries(root, 'ls-tree', '-r', '-z', commit):
+        info, path = entry.split('\t', 1)
+        mode, object_type, sha = info.split()
+        if object_type == 'blob':
+            blobs[path] = sha
+    return {path: blobs[path] for path in project_snapshot.filter_paths(blobs, scan_dirs, ignore_dirs, JS_EXTENSIONS)}
+
+def staged_blobs(root, scan_dirs, ignore_dirs):
+    """
+    {path: blob sha, or None if deleted} for the scanned JavaScript files
+    in the staged changes.
+    """
+    changed = git_entries(root, 'diff', '--cached', '--name-only', '--no-renames', '-z')
+    changed = project_snapshot.filter_paths(changed, scan_dirs, ignore_dirs, JS_EXTENSIONS)
+    blobs = dict.fromkeys(changed)
+    if changed:
+        for entry in git_entries(root, 'ls-files', '-s', '-z', '--', *changed):
+            info, path = entry.split('\t', 1)
+            mode, sha, stage = info.split()
+            if stage == '0' and path in blobs:
+                blobs[path] = sha
+    return blobs
+
+def load_state(root):
+    try:
+        with open(os.path.join(root, STATE_FILE)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('version') != STATE_VERSION:
+        return None
+    state['used'] = set(state['used'])
+    return state
+
+def save_state(root, state):
+    path = os.path.join(root, STATE_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(dict(state, used=sorted(state['used'])), f)
+    os.replace(tmp_path, path)
+
+def apply_blob_changes(state, changes, cat_file, root):
+    """
+    Move the graph in state to a new set of blobs ({path: sha or None}).
+
+    Changed blobs are read and parsed; if files were added or removed,
+    every file's cached imports are re-resolved (no re-read), as with the
+    parse cache. Returns {file: old edges} for every file whose edges
+    changed, was added or was removed.
+    """
+    fuf = find_unused_files
+    files = state['files']
+    old_edges = {}
+    file_set_changed = False
+
+    for path, sha in changes.items():
+        if sha is None:
+            if path in files:
+                old_edges[path] = files.pop(path)['edges']
+                file_set_changed = True
+        elif path not in files or files[path]['blob'] != sha:
+            file_set_changed |= path not in files
+            with profiling.timed_file(path) as record:
+                data = read_object(cat_file, sha)[2]
+                record['bytes'] = len(data)
+                imports = fuf.extract_imports_from_content(data.decode('utf-8', 'ignore'))
+            old_edges[path] = files[path]['edges'] if path in files else []
+            files[path] = {'blob': sha, 'imports': sorted(imports), 'edges': None}
+
+    js_files = sorted(files)
+    fuf.PROJECT_ROOT = root
+    fuf.init_parse_worker(root, {'files': frozenset(js_files), 'js_files': js_files, 'stats': {}})
+    with profiling.phase('resolve'):
+        for path, entry in files.items():
+            if entry['edges'] is None or file_set_changed:
+                edges = fuf.resolve_file_edges(path, entry['imports'])
+                if entry['edges'] is not None and edges != entry['edges']:
+                    old_edges.setdefault(path, entry['edges'])
+                entry['edges'] = edges
+    return old_edges
+
+def update_reachability(state, old_edges):
+    """
+    Update state['used'] after the edges of the files in old_edges changed,
+    without a full traversal (delete and re-derive):
+      1. Files reachable, through used files, from the targets of removed
+         edges are suspects and are taken out of the used set.
+      2. Suspects still imported by a used file (or that are entry points)
+         are re-derived, with everything they reach.
+      3. Targets of new edges from used files, and new entry points, are
+         added with everything they reach.
+    The work is proportional to the suspect region, not the whole graph.
+    """
+    files = state['files']
+    used = state['used']
+    entries = find_unused_files.select_entry_points(files)
+    visits = 0
+
+    def edges_of(file):
+        return files[file]['edges'] if file in files else ()
+
+    # 1. Suspects
+    used.difference_update(f for f in old_edges if f not in files)
+    to_visit = []
+    for file, edges in old_edges.items():
+        current = set(edges_of(file))
+        to_visit.extend(t for t in edges if t not in current and t in used)
+    suspects = set()
+    while to_visit:
+        file = to_visit.pop()
+        if file in suspects or file not in used:
+            continue
+        suspects.add(file)
+        visits += 1
+        to_visit.extend(edges_of(file))
+    used.difference_update(suspects)
+
+    # 2. Re-derive suspects that are still imported by a used file
+    to_visit = []
+    if suspects:
+        importers = defaultdict(list)
+        for file, entry in files.items():
+            for target in entry['edges']:
+                if target in suspects:
+                    importers[target].append(file)
+        to_visit.extend(f for f in suspects if f in entries or any(i in used for i in importers[f]))
+
+    # 3. New edges out of used files, and new entry points
+    for file in old_edges:
+        if file in used or file in entries:
+            to_visit.extend(edges_of(file))
+    to_visit.extend(f for f in entries if f not in used)
+
+    while to_visit:
+        file = to_visit.pop()
+        if file in used or file not in files:
+            continue
+        used.add(file)
+        visits += 1
+        to_visit.extend(edges_of(file))
+
+    profiling.count('reachability visits', visits)
+    return visits
+
+def build_state(root, commit, scan_dirs, ignore_dirs, cat_file):
+    """Graph state of a commit, parsed from scratch"""
+    state = {'version': STATE_VERSION, 'commit': commit, 'files': {}, 'used': set()}
+    blobs = tree_blobs(root, commit, scan_dirs, ignore_dirs) if commit else {}
+    update_reachability(state, apply_blob_changes(state, blobs, cat_file, root))
+    return state
+
+def check_staged(root, scan_dirs, ignore_dirs):
+    """
+    Return (orphaned, new_unreachable, revived, staged JavaScript file count)
+    for the staged changes, keeping the stored HEAD state current.
+    """
+    commit = head_commit(root)
+    cat_file = start_cat_file(root)
+    try:
+        with profiling.phase('state load'):
+            state = load_state(root)
+        if state is None:
+            print("   Building the graph of HEAD (first run)...")
+            state = build_state(root, commit, scan_dirs, ignore_dirs, cat_file)
+            save_state(root, state)
+        elif state['commit'] != commit:
+            # HEAD moved since the last check: advance the stored state to it
+            with profiling.phase('advance to HEAD'):
+                blobs = tree_blobs(root, commit, scan_dirs, ignore_dirs) if commit else {}
+                changes = {path: sha for path, sha in blobs.items() if path not in state['files'] or state['files'][path]['blob'] != sha}
+                changes.update((path, None) for path in state['files'] if path not in blobs)
+                update_reachability(state, apply_blob_changes(state, changes, cat_file, root))
+                state['commit'] = commit
+            save_state(root, state)
+
+        with profiling.phase('staged changes'):
+            staged = staged_blobs(root, scan_dirs, ignore_dirs)
+        old_used = set(state['used'])
+        old_files = set(state['files'])
+        with profiling.phase('incremental reachability'):
+            update_reachability(state, apply_blob_changes(state, staged, cat_file, root))
+    finally:
+        stop_cat_file(cat_file)
+
+    used = state['used']
+    orphaned = sorted(f for f in old_used - used if f in state['files'])
+    new_unreachable = sorted(f for f in set(state['files']) - old_files if f not in used)
+    revived = sorted(f for f in used - old_used if f in old_files)
+    return orphaned, new_unreachable, revived, len(staged)
+
+def run_pre_commit(root, scan_dirs, ignore_dirs, fail_on_orphans=False):
+    """Print the pre-commit report; returns the hook's exit status"""
+    print("🔍 Pre-commit orphan check")
+    orphaned, new_unreachable, revived, staged = check_staged(root, scan_dirs, ignore_dirs)
+    print(f"   {staged} staged JavaScript file(s)")
+    for file in orphaned:
+        print(f"   🪦 orphaned         {file}")
+    for file in new_unreachable:
+        print(f"   🆕 new, unreachable {file}")
+    for file in revived:
+        print(f"   🌱 revived          {file}")
+    if not (orphaned or new_unreachable or revived):
+        print("✅ No files orphaned or revived by this commit")
+        return 0
+    if fail_on_orphans and (orphaned or new_unreachable):
+        print("❌ Commit leaves files unreachable (use git commit --no-verify to skip this check)")
+        return 1
+    return 0
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Shared instrumentation for the analysis scripts.
+Records wall time per phase, files and bytes read, matches per pattern and
+the slowest files, and can dump cProfile/pstats output. Everything is a
+no-op until enable() is called, so instrumented code costs almost nothing
+in normal runs.
+"""
+
+import heapq
+import cProfile
+import contextlib
+from time import perf_counter
+from collections import defaultdict
+
+# Number of slowest files kept for the report
+SLOWEST_FILES = 10
+
+enabled = False
+
+_phases = defaultdict(float)
+_phase_calls = defaultdict(int)
+_counters = defaultdict(int)
+_matches = defaultdict(int)
+_slowest = []  # min-heap of (seconds, path, bytes)
+
+def enable():
+    global enabled
+    enabled = True
+
+def reset():
+    """Clear everything recorded so far"""
+    _phases.clear()
+    _phase_calls.clear()
+    _counters.clear()
+    _matches.clear()
+    del _slowest[:]
+
+@contextlib.contextmanager
+def phase(name):
+    """Accumulate wall time spent inside the block under `name`"""
+    if not enabled:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] += perf_counter() - start
+        _phase_calls[name] += 1
+
+def count(name, n=1):
+    """Bump a named counter"""
+    if enabled:
+        _counters[name] += n
+
+def count_matches(pattern_name, n):
+    """Record how many matches a pattern produced"""
+    if enabled:
+        _matches[pattern_name] += n
+
+def record_file(path, seconds, nbytes):
+    """Record one file read: counts toward totals and the slowest-files list"""
+    if not enabled:
+        return
+    _counters['files read'] += 1
+    _counters['bytes read'] += nbytes
+    item = (seconds, path, nbytes)
+    if len(_slowest) < SLOWEST_FILES:
+        heapq.heappush(_slowest, item)
+    elif item > _slowest[0]:
+        heapq.heapreplace(_slowest, item)
+
+@contextlib.contextmanager
+def timed_file(path):
+    """
+    Time all work on one file; the block sets record['bytes'] once it has
+    read the content.
+    """
+    record = {'bytes': 0}
+    if not enabled:
+        yield record
+        return
+    start = perf_counter()
+    try:
+        yield record
+    finally:
+        record_file(path, perf_counter() - start, record['bytes'])
+
+def drain():
+    """
+    Return and clear what this process has recorded (None when disabled).
+    Worker processes send this back so the parent can merge() it.
+    """
+    if not enabled:
+        return None
+    data = {
+        'phases': dict(_phases),
+        'phase_calls': dict(_phase_calls),
+        'counters': dict(_counters),
+        'matches': dict(_matches),
+        'slowest': list(_slowest),
+    }
+    reset()
+    return data
+
+def merge(data):
+    """Fold data from drain() (possibly from another process) into this one"""
+    if not enabled or not data:
+        return
+    for name, seconds in data['phases'].items():
+        _phases[name] += seconds
+    for name, calls in data['phase_calls'].items():
+        _phase_calls[name] += calls
+    for name, n in data['counters'].items():
+        _counters[name] += n
+    for name, n in data['matches'].items():
+        _matches[name] += n
+    for item in data['slowest']:
+        if len(_slowest) < SLOWEST_FILES:
+            heapq.heappush(_slowest, item)
+        elif item > _slowest[0]:
+            heapq.heapreplace(_slowest, item)
+
+def print_report(total_seconds=None):
+    """Print the collected profile"""
+    print("\n" + "=" * 80)
+    print("PROFILE")
+    print("=" * 80)
+    if total_seconds is not None:
+        print(f"⏱️  Total wall time: {total_seconds * 1000:.1f} ms")
+
+    if _phases:
+        print("\nPhases (wall time, summed over calls):")
+        for name, seconds in sorted(_phases.items(), key=lambda item: -item[1]):
+            share = f" ({seconds / total_seconds:5.1%})" if total_seconds else ""
+            print(f"   {name:<24} {seconds * 1000:10.1f} ms{share}  x{_phase_calls[name]}")
+
+    if _counters:
+        print("\nCounters:")
+        for name, n in sorted(_counters.items()):
+            print(f"   {name:<24} {n:>10}")
+
+    if _matches:
+        print("\nMatches per pattern:")
+        for name, n in sorted(_matches.items(), key=lambda item: -item[1]):
+            print(f"   {name:<24} {n:>10}")
+
+    if _slowest:
+        print(f"\nSlowest files:")
+        for seconds, path, nbytes in sorted(_slowest, reverse=True):
+            print(f"   {seconds * 1000:8.2f} ms  {nbytes:>9} B  {path}")
+
+def add_arguments(parser):
+    """Add --profile and --profile-pstats to a script's argument parser"""
+    parser.add_argument('--profile', action='store_true',
+                        help='Report time per phase, bytes read, pattern matches and slowest files')
+    parser.add_argument('--profile-pstats', metavar='FILE',
+                        help='Also run under cProfile and dump pstats output to FILE')
+
+@contextlib.contextmanager
+def session(args):
+    """Enable profiling for the block if the script was run with --profile / --profile-pstats"""
+    pstats_file = getattr(args, 'profile_pstats', None)
+    if not (getattr(args, 'profile', False) or pstats_file):
+        yield
+        return
+
+    enable()
+    reset()
+    profiler = cProfile.Profile() if pstats_file else None
+    start = perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        total = perf_counter() - start
+        print_report(total)
+        if profiler:
+            profiler.dump_stats(pstats_file)
+            print(f"\n📄 cProfile stats saved to: {pstats_file}")
+            print(f"   View with: python3 -m pstats {pstats_file}")
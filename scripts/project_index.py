@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+SQLite index of the Solidi Mobile App analysis results.
+Persists the import graph, file usage, API call sites and obviously unused
+files, updates them incrementally, and answers queries such as "who imports
+X", "which files call route Y" or "unused files in category tests" with
+indexed lookups instead of a full rescan.
+"""
+
+import os
+import sqlite3
+import argparse
+from datetime import datetime
+from time import perf_counter
+
+import profiling
+import project_snapshot
+import find_unused_files
+import find_obviously_unused
+import generate_api_docs
+
+INDEX_FILE = '.project_index.sqlite'
+
+# Stored as PRAGMA user_version; bump when SCHEMA changes and the index is rebuilt
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    in_graph INTEGER NOT NULL,  -- scanned by find_unused_files
+    used INTEGER,               -- reachable from an entry point; NULL outside the graph
+    category TEXT               -- categorize_file() bucket of unused files
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_unused ON files (category, path) WHERE used = 0;
+
+CREATE TABLE IF NOT EXISTS imports (
+    importer TEXT NOT NULL,
+    imported TEXT NOT NULL,
+    PRIMARY KEY (importer, imported)
+) WITHOUT ROWID;
+-- Reverse edges: covering index plus a view, so the edges are stored once
+CREATE INDEX IF NOT EXISTS imports_reverse ON imports (imported, importer);
+CREATE VIEW IF NOT EXISTS reverse_edges AS SELECT imported AS file, importer AS imported_by FROM imports;
+
+CREATE TABLE IF NOT EXISTS api_routes (
+    route TEXT NOT NULL,
+    type TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS api_routes_route ON api_routes (route, file, line);
+CREATE INDEX IF NOT EXISTS api_routes_file ON api_routes (file);
+
+CREATE TABLE IF NOT EXISTS obviously_unused (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS obviously_unused_category ON obviously_unused (category, path);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+def connect(db_path):
+    """Open the index, (re)creating the schema if it is missing or outdated"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+        with conn:
+            for name, kind in conn.execute("SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view')").fetchall():
+                conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+            conn.executescript(SCHEMA)
+            conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+    return conn
+
+def _sync_rows(conn, table, key_columns, columns, old_rows, new_rows):
+    """
+    Make a table match new_rows ({key: row}) given its current old_rows,
+    writing only rows that were added, changed or removed.
+    """
+    changed = [row for key, row in new_rows.items() if old_rows.get(key) != row]
+    removed = [key for key in old_rows if key not in new_rows]
+    where = ' AND '.join(f'{column} = ?' for column in key_columns)
+    if removed:
+        conn.executemany(f'DELETE FROM {table} WHERE {where}', removed)
+    if changed:
+        placeholders = ', '.join('?' * len(columns))
+        conn.executemany(f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}) VALUES ({placeholders})', changed)
+    return len(changed), len(removed)
+
+def update_index(conn, snapshot, use_cache=True, jobs=1):
+    """
+    Bring the index up to date with the tree in the snapshot.
+
+    The import graph comes from build_dependency_graph (which only re-parses
+    files its parse cache cannot vouch for); API call sites are rescanned
+    only for files whose size or mtime changed. Every table is diffed
+    against what is stored, so a quiet update writes almost nothing.
+    Returns {table: (rows written, rows deleted)}.
+    """
+    fuf = find_unused_files
+    result = {}
+    old_files = {row[0]: row for row in conn.execute('SELECT path, size, mtime, in_graph, used, category FROM files')}
+
+    all_files, dependency_graph, _ = fuf.build_dependency_graph(use_cache=use_cache, jobs=jobs, snapshot=snapshot)
+    with profiling.phase('reachability'):
+        entry_files = fuf.select_entry_points(all_files)
+        graph = fuf.build_compact_graph(all_files, dependency_graph)
+        used = fuf.find_used_files(entry_files, dependency_graph, graph=graph)
+
+    with profiling.phase('select'):
+        api_files = generate_api_docs.find_source_files(snapshot)
+
+    new_files = {}
+    for path in api_files:
+        size, mtime = snapshot['files'][path]
+        new_files[path] = (path, size, mtime, 0, None, None)
+    for path in all_files:
+        size, mtime = snapshot['files'][path]
+        is_used = path in used
+        new_files[path] = (path, size, mtime, 1, int(is_used), None if is_used else fuf.categorize_file(path))
+
+    with profiling.phase('index write'):
+        with conn:
+            result['files'] = _sync_rows(conn, 'files', ('path',), ('path', 'size', 'mtime', 'in_graph', 'used', 'category'),
+                                         old_files, new_files)
+
+            old_edges = {edge: edge for edge in conn.execute('SELECT importer, imported FROM imports')}
+            new_edges = {(file, target): (file, target) for file, targets in dependency_graph.items() for target in targets}
+            result['imports'] = _sync_rows(conn, 'imports', ('importer', 'imported'), ('importer', 'imported'),
+                                           old_edges, new_edges)
+
+            # API call sites: only files that are new, changed or gone
+            rescan = [path for path in api_files if old_files.get(path, (None,) * 3)[1:3] != new_files[path][1:3]]
+            gone = [path for path in old_files if path not in new_files]
+            deleted = conn.executemany('DELETE FROM api_routes WHERE file = ?', [(path,) for path in rescan + gone]).rowcount
+            rows = []
+            for file_path, apis, scanned in generate_api_docs.scan_files(rescan, snapshot=snapshot):
+                rows.extend((api['route'], api['type'], file_path, api['line']) for api in apis)
+            conn.executemany('INSERT INTO api_routes (route, type, file, line) VALUES (?, ?, ?, ?)', rows)
+            result['api_routes'] = (len(rows), max(deleted, 0))
+
+            obvious = find_obviously_unused.find_obviously_unused_files(snapshot)
+            old_obvious = {row[0]: row for row in conn.execute('SELECT path, category FROM obviously_unused')}
+            new_obvious = {path: (path, category) for category, paths in obvious.items() for path in paths}
+            result['obviously_unused'] = _sync_rows(conn, 'obviously_unused', ('path',), ('path', 'category'),
+                                                    old_obvious, new_obvious)
+
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('updated', ?)", (datetime.now().isoformat(),))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('root', ?)", (snapshot['root'],))
+    return result
+
+def importers_of(conn, path):
+    """Files that import path"""
+    return [row[0] for row in conn.execute('SELECT importer FROM imports WHERE imported = ? ORDER BY importer', (path,))]
+
+def imports_of(conn, path):
+    """Files path imports"""
+    return [row[0] for row in conn.execute('SELECT imported FROM imports WHERE importer = ? ORDER BY imported', (path,))]
+
+def route_callers(conn, route):
+    """(file, line, type) of every call site for an API route"""
+    return conn.execute('SELECT file, line, type FROM api_routes WHERE route = ? ORDER BY file, line', (route,)).fetchall()
+
+def unused_files(conn, category=None):
+    """Files not reachable from any entry point, optionally in one category"""
+    if category:
+        query = 'SELECT path FROM files WHERE used = 0 AND category = ? ORDER BY path'
+        return [row[0] for row in conn.execute(query, (category,))]
+    return [row[0] for row in conn.execute('SELECT path FROM files WHERE used = 0 ORDER BY path')]
+
+def obviously_unused_files(conn, category=None):
+    """Files find_obviously_unused.py flags, optionally in one category"""
+    if category:
+        query = 'SELECT path FROM obviously_unused WHERE category = ? ORDER BY path'
+        return [row[0] for row in conn.execute(query, (category,))]
+    return [row[0] for row in conn.execute('SELECT path FROM obviously_unused ORDER BY path')]
+
+QUERIES = {
+    'importers': lambda conn, args: importers_of(conn, args.path),
+    'imports': lambda conn, args: imports_of(conn, args.path),
+    'route': lambda conn, args: [f"{file}:{line} ({api_type})" for file, line, api_type in route_callers(conn, args.route)],
+    'unused': lambda conn, args: unused_files(conn, args.category),
+    'obvious': lambda conn, args: obviously_unused_files(conn, args.category),
+    'sql': lambda conn, args: [' | '.join(str(value) for value in row) for row in conn.execute(args.query)],
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build and query the SQLite index of the Solidi Mobile App analyzers.')
+    parser.add_argument('--root', default=find_unused_files.PROJECT_ROOT, help='Project root')
+    parser.add_argument('--db', help=f'Index file (default: {INDEX_FILE} in the project root)')
+    profiling.add_arguments(parser)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    update = commands.add_parser('update', help='Create or incrementally update the index')
+    update.add_argument('--no-cache', action='store_true', help='Ignore the find_unused_files.py parse cache')
+    update.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Parse files in N worker processes (0 = one per CPU core)')
+    project_snapshot.add_arguments(update)
+
+    commands.add_parser('importers', help='Files that import PATH').add_argument('path')
+    commands.add_parser('imports', help='Files PATH imports').add_argument('path')
+    commands.add_parser('route', help='Call sites of an API route, e.g. balance').add_argument('route')
+    commands.add_parser('unused', help='Files unreachable from the entry points').add_argument(
+        '--category', help='Only this find_unused_files.py category, e.g. tests')
+    commands.add_parser('obvious', help='Files find_obviously_unused.py flags').add_argument(
+        '--category', help='Only this category, e.g. tests')
+    commands.add_parser('sql', help='Run a read-only SQL query against the index').add_argument('query')
+
+    args = parser.parse_args()
+    if getattr(args, 'jobs', 1) <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def main():
+    args = parse_args()
+    with profiling.session(args):
+        run(args)
+
+def run(args):
+    root = os.path.abspath(args.root)
+    db_path = args.db or os.path.join(root, INDEX_FILE)
+
+    if args.command == 'update':
+        find_unused_files.PROJECT_ROOT = root
+        find_unused_files.CACHE_FILE = os.path.join(root, os.path.basename(find_unused_files.CACHE_FILE))
+        snapshot = project_snapshot.open_snapshot(root, args.snapshot)
+        conn = connect(db_path)
+        result = update_index(conn, snapshot, use_cache=not args.no_cache, jobs=args.jobs)
+        print(f"\n🗂️  Index updated: {db_path}")
+        for table, (written, deleted) in result.items():
+            print(f"   {table:<18} {written:>6} written, {deleted:>6} deleted")
+        return
+
+    if not os.path.exists(db_path):
+        print(f"❌ No index at {db_path}; run `project_index.py update` first")
+        return
+
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    start = perf_counter()
+    with profiling.phase('query'):
+        try:
+            rows = QUERIES[args.command](conn, args)
+        except sqlite3.Error as e:
+            print(f"❌ Query failed: {e}")
+            return
+    elapsed = perf_counter() - start
+    for row in rows:
+        print(row)
+    print(f"\n{len(rows)} result(s) in {elapsed * 1000:.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared snapshot of the project tree for the scripts/ analyzers.
+One os.scandir walk records every file with its (size, mtime_ns); file
+contents are read lazily and kept in memory. A snapshot can be saved to
+disk so chained runs (e.g. find_obviously_unused.py, then move_to_backup.py)
+reuse it instead of walking the tree again.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+
+import profiling
+
+# Directories no analyzer looks inside; they are never walked
+SKIP_DIRS = frozenset({'.git', 'node_modules', 'Pods', 'build', '.gradle'})
+
+# Default file for --snapshot, relative to the project root
+SNAPSHOT_FILE = '.project_snapshot.json'
+SNAPSHOT_VERSION = 1
+
+def _walk(root, rel_dir, skip_dirs, files, dirs):
+    """Add the subtree at rel_dir to files and dirs"""
+    pending = [rel_dir]
+    while pending:
+        rel_dir = pending.pop()
+        dir_path = root if rel_dir == '.' else os.path.join(root, rel_dir)
+        try:
+            dirs[rel_dir] = os.stat(dir_path).st_mtime_ns
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = entry.name if rel_dir == '.' else os.path.join(rel_dir, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    subdirs.append(rel_path)
+            elif entry.is_file():
+                st = entry.stat()
+                files[rel_path] = (st.st_size, st.st_mtime_ns)
+        pending.extend(reversed(subdirs))
+
+def build_snapshot(root, skip_dirs=SKIP_DIRS, roots=('.',)):
+    """
+    Walk root once. Returns a dict with every file (relative path ->
+    (size, mtime_ns), in walk order), the mtime of every walked directory,
+    and an empty content cache filled by read_text().
+    With roots, only those subdirectories are walked; such a partial
+    snapshot is for the caller alone and should not be saved.
+    """
+    files = {}
+    dirs = {}
+    for rel_dir in roots:
+        _walk(root, os.path.normpath(rel_dir), skip_dirs, files, dirs)
+    profiling.count('snapshot files', len(files))
+    return {
+        'root': root,
+        'skip_dirs': sorted(skip_dirs),
+        'created': time.time(),
+        'dirs': dirs,
+        'files': files,
+        'contents': {},
+    }
+
+def _drop_subtree(snapshot, rel_dir):
+    prefix = rel_dir + os.sep
+    for rel_path in [f for f in snapshot['files'] if f.startswith(prefix)]:
+        del snapshot['files'][rel_path]
+    for sub_dir in [d for d in snapshot['dirs'] if d == rel_dir or d.startswith(prefix)]:
+        del snapshot['dirs'][sub_dir]
+
+def refresh_snapshot(snapshot):
+    """
+    Bring a saved snapshot up to date. Only directories whose mtime
+    changed (files added, removed or renamed in them) are listed again;
+    new subdirectories are walked and vanished ones dropped. Files in the
+    other directories are stat'ed again, since editing a file in place
+    does not change its directory's mtime. Returns (directories re-listed,
+    files whose stats changed).
+    """
+    root = snapshot['root']
+    skip_dirs = set(snapshot['skip_dirs'])
+    files = snapshot['files']
+    dirs = snapshot['dirs']
+    relisted = 0
+    fresh = set()  # files listed again, whose stats are current
+
+    # Parents before children, so a vanished subtree is dropped in one go
+    for rel_dir in sorted(dirs, key=lambda d: (d != '.', d.count(os.sep), d)):
+        if rel_dir not in dirs:
+            continue
+        dir_path = root if rel_dir == '.' else os.path.join(root, rel_dir)
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            _drop_subtree(snapshot, rel_dir)
+            continue
+        if mtime == dirs[rel_dir]:
+            continue
+
+        relisted += 1
+        prefix = '' if rel_dir == '.' else rel_dir + os.sep
+        for rel_path in [f for f in files if f.startswith(prefix) and os.sep not in f[len(prefix):]]:
+            del files[rel_path]
+        old_subdirs = {d for d in dirs if d.startswith(prefix) and d != '.' and os.sep not in d[len(prefix):]}
+
+        new_files = {}
+        new_dirs = {}
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            rel_path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs and rel_path not in dirs:
+                    _walk(root, rel_path, skip_dirs, new_files, new_dirs)
+                old_subdirs.discard(rel_path)
+            elif entry.is_file():
+                st = entry.stat()
+                files[rel_path] = (st.st_size, st.st_mtime_ns)
+                fresh.add(rel_path)
+        for sub_dir in old_subdirs:
+            _drop_subtree(snapshot, sub_dir)
+        files.update(new_files)
+        fresh.update(new_files)
+        dirs.update(new_dirs)
+        dirs[rel_dir] = mtime
+
+    changed = 0
+    for rel_path in [f for f in files if f not in fresh]:
+        try:
+            st = os.stat(os.path.join(root, rel_path))
+        except OSError:
+            del files[rel_path]
+            changed += 1
+            continue
+        stat = (st.st_size, st.st_mtime_ns)
+        if stat != files[rel_path]:
+            files[rel_path] = stat
+            changed += 1
+
+    return relisted, changed
+
+def filter_paths(paths, roots=('.',), skip_dirs=(), extensions=None):
+    """
+    Paths (relative to the project root) below any of `roots`, in the
+    given order, ending in one of `extensions` (all if None). A path is
+    skipped when a directory between its root and itself is named in
+    skip_dirs.
+    """
+    prefixes = []
+    for root in roots:
+        root = os.path.normpath(root)
+        prefixes.append(('', 0) if root == '.' else (root + os.sep, len(root.split(os.sep))))
+
+    allowed = {}  # directory -> bool, so each directory is checked once
+    selected = []
+    for rel_path in paths:
+        if extensions is not None and not rel_path.endswith(extensions):
+            continue
+        rel_dir = os.path.dirname(rel_path)
+        ok = allowed.get(rel_dir)
+        if ok is None:
+            parts = rel_dir.split(os.sep) if rel_dir else []
+            ok = any(rel_path.startswith(prefix) and not any(part in skip_dirs for part in parts[depth:])
+                     for prefix, depth in prefixes)
+            allowed[rel_dir] = ok
+        if ok:
+            selected.append(rel_path)
+    return selected
+
+def select_files(snapshot, roots=('.',), skip_dirs=(), extensions=None):
+    """Files in the snapshot selected as by filter_paths, in walk order"""
+    return filter_paths(snapshot['files'], roots, skip_dirs, extensions)
+
+def read_text(snapshot, rel_path):
+    """Content of a file, read on first use and kept; raises OSError like open()"""
+    contents = snapshot['contents']
+    if rel_path not in contents:
+        with profiling.timed_file(rel_path) as record:
+            with open(os.path.join(snapshot['root'], rel_path), 'r', encoding='utf-8', errors='ignore') as f:
+                contents[rel_path] = f.read()
+            record['bytes'] = len(contents[rel_path])
+    return contents[rel_path]
+
+def save_snapshot(snapshot, path):
+    """Write the snapshot (without file contents) atomically"""
+    data = {key: snapshot[key] for key in ('root', 'skip_dirs', 'created', 'dirs', 'files')}
+    data['version'] = SNAPSHOT_VERSION
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def load_snapshot(path, root, skip_dirs=SKIP_DIRS):
+    """
+    Saved snapshot of root, or None if it is missing, was taken of another
+    root or skipped directories this run needs. The file stats are as of
+    the save; see refresh_snapshot().
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('version') != SNAPSHOT_VERSION or data['root'] != root:
+        return None
+    if not set(data['skip_dirs']) <= set(skip_dirs):
+        return None
+
+    data['files'] = {rel_path: tuple(stat) for rel_path, stat in data['files'].items()}
+    data['dirs'] = dict(data['dirs'])
+    data['contents'] = {}
+    return data
+
+def open_snapshot(root, path=None, skip_dirs=SKIP_DIRS, walk=True):
+    """
+    Snapshot of root for this run. With a path (relative to root), a saved
+    snapshot is reused and refreshed; otherwise the tree is walked and, if
+    a path was given, the new snapshot saved there. With walk=False, None
+    is returned instead of walking.
+    """
+    if path:
+        path = os.path.join(root, path)
+        with profiling.phase('snapshot load'):
+            snapshot = load_snapshot(path, root, skip_dirs)
+        if snapshot is not None:
+            with profiling.phase('snapshot refresh'):
+                relisted, changed = refresh_snapshot(snapshot)
+            created = datetime.fromtimestamp(snapshot['created']).strftime('%H:%M:%S')
+            print(f"♻️  Reusing project snapshot from {created} "
+                  f"({len(snapshot['files'])} files, {relisted} directories re-listed, {changed} files changed)")
+            if relisted or changed:
+                with profiling.phase('snapshot save'):
+                    save_snapshot(snapshot, path)
+            return snapshot
+
+    if not walk:
+        return None
+    with profiling.phase('snapshot walk'):
+        snapshot = build_snapshot(root, skip_dirs)
+    if path:
+        with profiling.phase('snapshot save'):
+            save_snapshot(snapshot, path)
+    return snapshot
+
+def add_arguments(parser):
+    """Add --snapshot to a script's argument parser"""
+    parser.add_argument('--snapshot', nargs='?', const=SNAPSHOT_FILE, metavar='FILE',
+                        help=f'Reuse the project snapshot in FILE (relative to the project root, default '
+                             f'{SNAPSHOT_FILE}) after checking every file for changes, else walk the tree and save it there')
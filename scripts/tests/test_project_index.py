@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for project_index.py against a small throwaway project tree.
+Run from the repository root: python3 -m unittest discover scripts/tests
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import argparse
+import unittest
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import find_unused_files
+import project_index
+
+ENTRY = "import Wallet from './components/Wallet';\n"
+
+WALLET = """export default function Wallet(appState) {
+  appState.privateMethod({functionName: 'balance', apiRoute: 'balance', httpMethod: 'POST'});
+}
+"""
+
+class UpdateWithSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.saved = (find_unused_files.PROJECT_ROOT, find_unused_files.CACHE_FILE)
+        self.write('src/application/index.js', ENTRY)
+        self.write('src/application/components/Wallet.js', WALLET)
+
+    def tearDown(self):
+        find_unused_files.PROJECT_ROOT, find_unused_files.CACHE_FILE = self.saved
+        find_unused_files.set_file_index(None)
+        shutil.rmtree(self.root)
+
+    def write(self, rel_path, content, mode='w'):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as f:
+            f.write(content)
+
+    def run_command(self, command, **options):
+        args = argparse.Namespace(root=self.root, db=None, command=command, **options)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            project_index.run(args)
+        return out.getvalue()
+
+    def update(self):
+        return self.run_command('update', snapshot=project_index.project_snapshot.SNAPSHOT_FILE,
+                                no_cache=False, jobs=1)
+
+    def route(self, route):
+        return [line for line in self.run_command('route', route=route).splitlines() if ':' in line and '(' in line]
+
+    def test_in_place_edit_between_snapshot_updates(self):
+        self.update()
+        self.assertEqual(self.route('withdraw'), [])
+
+        # Appending does not change the directory's mtime, only the file's
+        wallet_dir = os.path.join(self.root, 'src/application/components')
+        dir_mtime = os.stat(wallet_dir).st_mtime_ns
+        self.write('src/application/components/Wallet.js',
+                   "appState.privateMethod({functionName: 'withdraw', apiRoute: 'withdraw', httpMethod: 'POST'});\n",
+                   mode='a')
+        self.assertEqual(os.stat(wallet_dir).st_mtime_ns, dir_mtime)
+
+        output = self.update()
+        self.assertIn('Reusing project snapshot', output)
+        self.assertEqual(self.route('withdraw'), ['src/application/components/Wallet.js:4 (PRIVATE)'])
+        self.assertEqual(len(self.route('balance')), 1)
+
+    def test_sql_errors_are_reported(self):
+        self.update()
+        self.assertIn('❌ Query failed', self.run_command('sql', query='SELEC path FROM files'))
+        self.assertIn('❌ Query failed', self.run_command('sql', query='DELETE FROM files'))
+        self.assertIn('src/application/index.js', self.run_command('sql', query='SELECT path FROM files'))
+
+if __name__ == '__main__':
+    unittest.main()
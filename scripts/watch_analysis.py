@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the Solidi Mobile App analyzers.
+Keeps the dependency graph, orphan list and API endpoint inventory in
+memory, polls the tree for added, modified and deleted files, applies
+them incrementally and prints only what changed. The current state can be
+queried over HTTP (--port) or read from a JSON file (--state-file).
+
+Polling is not free: each poll stats every file in the tree (directories
+are only listed again when their mtime changed). Reachability is updated
+incrementally while edits only add imports; removing an import from a
+used file, or adding/deleting a file, re-runs the full reachability pass.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import find_unused_files
+import extract_all_apis
+import project_snapshot
+from js_scanner import API_METHOD_NAMES
+
+def _api_key(file, api):
+    return (file, api['type'], api['route'], api['method'], api['function'])
+
+def _read_apis(root, file):
+    """API endpoints in one file, skipping files that cannot contain calls"""
+    try:
+        with open(os.path.join(root, file), 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except OSError:
+        return []
+    if not any(name in content for name in API_METHOD_NAMES):
+        return []
+    return extract_all_apis.extract_apis_from_content(content)
+
+def build_index(state):
+    """File index of the watched tree, with the scan settings the watch was started with"""
+    return find_unused_files.build_file_index(state['snapshot'], **state['scan'])
+
+def initial_state(root, track_graph=True, track_apis=True, scan=None):
+    """
+    Full scan that later polls update incrementally. scan holds the
+    build_file_index() directory settings (scan_dirs, ignore_dirs,
+    included_dirs); find_unused_files' defaults are used for any not given.
+    """
+    fuf = find_unused_files
+    fuf.PROJECT_ROOT = root
+
+    state = {
+        'root': root,
+        'scan': dict(scan or {}),
+        'track_graph': track_graph,
+        'track_apis': track_apis,
+        'entries': {},
+        'apis': {},
+        'used': set(),
+        'orphans': set(),
+        'version': 0,
+        'updated': None,
+    }
+    included_dirs = state['scan'].get('included_dirs', fuf.INCLUDED_DIRS)
+    state['snapshot'] = project_snapshot.build_snapshot(root, project_snapshot.SKIP_DIRS - included_dirs)
+    index = state['index'] = build_index(state)
+    fuf.init_parse_worker(root, index)
+
+    if track_graph:
+        for file in index['js_files']:
+            file, entry, status = fuf.parse_file_entry((file, index['stats'][file], None, False))
+            if status != 'error':
+                state['entries'][file] = entry
+    if track_apis:
+        for file in index['js_files']:
+            apis = _read_apis(root, file)
+            if apis:
+                state['apis'][file] = apis
+
+    _recompute_reachability(state)
+    state['updated'] = datetime.now().isoformat()
+    return state
+
+def _recompute_reachability(state):
+    """Full reachability pass from the entry points over the whole graph"""
+    if not state['track_graph']:
+        return
+    fuf = find_unused_files
+    all_files = state['index']['js_files']
+    dependency_graph = {file: entry['edges'] for file, entry in state['entries'].items()}
+    entry_files = fuf.select_entry_points(all_files)
+    graph = fuf.build_compact_graph(all_files, dependency_graph)
+    state['used'] = fuf.find_used_files(entry_files, dependency_graph, graph=graph)
+    state['orphans'] = set(all_files) - state['used']
+
+def _update_reachability(state, old_edges):
+    """
+    Update reachability after files were re-parsed with the same set of
+    files on disk; old_edges maps each re-parsed file to its previous
+    edges. New edges out of used files only make more files used, which a
+    walk from the new targets finds. A dropped edge out of a used file may
+    leave files unreachable, and only the full pass can tell.
+    """
+    used = state['used']
+    pending = []
+    for file, old in old_edges.items():
+        entry = state['entries'].get(file)
+        new = set(entry['edges']) if entry else set()
+        if file in used:
+            if old - new:
+                _recompute_reachability(state)
+                return
+            pending.extend(new - old)
+
+    while pending:
+        file = pending.pop()
+        if file in used:
+            continue
+        used.add(file)
+        entry = state['entries'].get(file)
+        if entry:
+            pending.extend(entry['edges'])
+    state['orphans'] = set(state['index']['js_files']) - used
+
+def detect_changes(state, index):
+    """(added, modified, removed) JavaScript files between the stored index and a new one"""
+    old_stats = state['index']['stats']
+    new_stats = index['stats']
+    added = [f for f in new_stats if f not in old_stats]
+    removed = [f for f in old_stats if f not in new_stats]
+    modified = [f for f in new_stats if f in old_stats and new_stats[f] != old_stats[f]]
+    return added, modified, removed
+
+def apply_changes(state, index, added, modified, removed):
+    """
+    Update the in-memory state for the given file events.
+
+    Only added/modified files are re-read. If the set of files on disk
+    changed, the other files' cached imports are re-resolved (no re-read),
+    since a new or deleted file can change what an import points to, and
+    reachability is recomputed in full; otherwise it is updated from the
+    re-read files' edges (see _update_reachability).
+    Returns what changed: orphaned/revived files and added/removed APIs.
+    """
+    fuf = find_unused_files
+    root = state['root']
+    file_set_changed = index['files'] != state['index']['files']
+    state['index'] = index
+    fuf.init_parse_worker(root, index)
+
+    changed = set(added) | set(modified)
+    old_orphans = state['orphans']
+    old_api_keys = {_api_key(f, api) for f, apis in state['apis'].items() for api in apis}
+
+    for file in removed:
+        state['entries'].pop(file, None)
+        state['apis'].pop(file, None)
+
+    if state['track_graph']:
+        to_parse = changed if not file_set_changed else set(index['js_files'])
+        old_edges = {}
+        for file in to_parse:
+            old_entry = state['entries'].get(file)
+            old_edges[file] = set(old_entry['edges']) if old_entry else set()
+            task = (file, index['stats'][file], old_entry, not file_set_changed)
+            file, entry, status = fuf.parse_file_entry(task)
+            if status == 'error':
+                state['entries'].pop(file, None)
+            else:
+                state['entries'][file] = entry
+        if file_set_changed:
+            _recompute_reachability(state)
+        else:
+            _update_reachability(state, old_edges)
+
+    if state['track_apis']:
+        for file in changed:
+            apis = _read_apis(root, file)
+            if apis:
+                state['apis'][file] = apis
+            else:
+                state['apis'].pop(file, None)
+
+    new_api_keys = {_api_key(f, api) for f, apis in state['apis'].items() for api in apis}
+    state['version'] += 1
+    state['updated'] = datetime.now().isoformat()
+
+    return {
+        'added': sorted(added),
+        'modified': sorted(modified),
+        'removed': sorted(removed),
+        'orphaned': sorted(state['orphans'] - old_orphans),
+        'revived': sorted((old_orphans - state['orphans']) - set(removed)),
+        'apis_added': sorted(new_api_keys - old_api_keys),
+        'apis_removed': sorted(old_api_keys - new_api_keys),
+    }
+
+def state_snapshot(state):
+    """JSON-serializable view of the current state"""
+    apis = []
+    for file in sorted(state['apis']):
+        for api in state['apis'][file]:
+            apis.append({
+                'file': file,
+                'line': api['line'],
+                'function': api['function'],
+                'route': api['route'],
+                'method': api['method'],
+                'type': api['type'],
+            })
+    return {
+        'version': state['version'],
+        'updated': state['updated'],
+        'total_files': len(state['index']['js_files']),
+        'used_files': len(state['used']),
+        'orphans': sorted(state['orphans']),
+        'apis': apis,
+        'routes': sorted({api['route'] for api in apis}),
+    }
+
+def print_changes(changes):
+    stamp = datetime.now().strftime('%H:%M:%S')
+    events = len(changes['added']) + len(changes['modified']) + len(changes['removed'])
+    print(f"\n[{stamp}] 🔄 {events} file event(s)")
+    for file in changes['added']:
+        print(f"   ➕ added     {file}")
+    for file in changes['modified']:
+        print(f"   ✏️  modified  {file}")
+    for file in changes['removed']:
+        print(f"   ➖ removed   {file}")
+    for file in changes['orphaned']:
+        print(f"   🪦 orphaned  {file}")
+    for file in changes['revived']:
+        print(f"   🌱 revived   {file}")
+    for file, api_type, route, method, function in changes['apis_added']:
+        print(f"   ✅ API added   {api_type} {method} /api2/v1/{route} ({function}, {file})")
+    for file, api_type, route, method, function in changes['apis_removed']:
+        print(f"   ❌ API removed {api_type} {method} /api2/v1/{route} ({function}, {file})")
+
+def write_state_file(state, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state_snapshot(state), f, indent=2)
+    os.replace(tmp_path, path)
+
+def serve_state(state, lock, port):
+    """Serve the current state as JSON on localhost:port in a background thread"""
+    views = {
+        '/': lambda snapshot: snapshot,
+        '/status': lambda snapshot: {k: snapshot[k] for k in ('version', 'updated', 'total_files', 'used_files')},
+        '/orphans': lambda snapshot: snapshot['orphans'],
+        '/apis': lambda snapshot: snapshot['apis'],
+        '/routes': lambda snapshot: snapshot['routes'],
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            view = views.get(self.path.rstrip('/') or '/')
+            if view is None:
+                self.send_error(404, f"Unknown path; try one of {', '.join(sorted(views))}")
+                return
+            with lock:
+                body = json.dumps(view(state_snapshot(state)), indent=2).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def watch(root, interval=1.0, track_graph=True, track_apis=True, port=None, state_file=None,
+          scan_dirs=None, ignore_dirs=None, included_dirs=None):
+    """
+    Poll the tree every `interval` seconds until interrupted. The directory
+    settings are passed explicitly because a script run as __main__ does
+    not share module globals with the find_unused_files imported here.
+    """
+    print(f"👀 Watching {root} (polling every {interval}s, Ctrl+C to stop)...")
+    scan = {'scan_dirs': scan_dirs, 'ignore_dirs': ignore_dirs, 'included_dirs': included_dirs}
+    state = initial_state(root, track_graph, track_apis,
+                          {key: value for key, value in scan.items() if value is not None})
+    lock = threading.Lock()
+
+    if track_graph:
+        print(f"   {len(state['index']['js_files'])} files, {len(state['orphans'])} orphans")
+    if track_apis:
+        print(f"   {sum(len(apis) for apis in state['apis'].values())} API calls in {len(state['apis'])} files")
+    if state_file:
+        write_state_file(state, state_file)
+        print(f"📄 State file: {state_file}")
+    if port:
+        serve_state(state, lock, port)
+        print(f"🌐 Serving state on http://127.0.0.1:{port}/ (/status, /orphans, /apis, /routes)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            relisted, restated = project_snapshot.refresh_snapshot(state['snapshot'])
+            if not (relisted or restated):
+                continue
+            index = build_index(state)
+            added, modified, removed = detect_changes(state, index)
+            if not (added or modified or removed or index['files'] != state['index']['files']):
+                continue
+            with lock:
+                changes = apply_changes(state, index, added, modified, removed)
+            print_changes(changes)
+            sys.stdout.flush()
+            if state_file:
+                write_state_file(state, state_file)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+def add_arguments(parser):
+    """Watch-mode options shared by the analyzers"""
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running, polling the tree and reporting only what changed')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls in --watch mode')
+    parser.add_argument('--port', type=int, help='In --watch mode, serve the current state as JSON on this port')
+    parser.add_argument('--state-file', help='In --watch mode, keep the current state in this JSON file')
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch the project and keep unused files and API endpoints up to date.')
+    parser.add_argument('--root', default=find_unused_files.PROJECT_ROOT, help='Project root to watch')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls')
+    parser.add_argument('--port', type=int, help='Serve the current state as JSON on this port')
+    parser.add_argument('--state-file', help='Keep the current state in this JSON file')
+    args = parser.parse_args()
+    watch(os.path.abspath(args.root), args.interval, port=args.port, state_file=args.state_file)
+
+if __name__ == '__main__':
+    main()